@@ -0,0 +1,186 @@
+"""Generate missing answer files with a trusted reference solution.
+
+Answers written by the reference are recorded in a manifest
+(``data/.answers.yaml``) together with the hash of the reference build
+and of every input, so answers are only recomputed when the reference or
+the input changes. Answer files that were not generated (e.g., downloaded
+samples) are never overwritten unless forced.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+from pathlib import Path
+import yaml
+from rich.console import Console
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, cases, run_program
+
+MANIFEST = '.answers.yaml'
+
+
+def reference_hash(command: List[str], build_folder: Optional[str],
+                   reference: str) -> str:
+    """Hash the reference program as it is run.
+
+    Covers the run command and the built files (binary, class files, ...)
+    or, for interpreted languages, the source file.
+    """
+    digest = hashlib.sha256(' '.join(command).encode('utf-8'))
+    if build_folder:
+        for root, _, files in sorted(os.walk(build_folder)):
+            for file in sorted(files):
+                path = os.path.join(root, file)
+                digest.update(os.path.relpath(path, build_folder).encode())
+                digest.update(build_cache.hash_file(path).encode('utf-8'))
+    else:
+        digest.update(build_cache.hash_file(reference).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_manifest(folder: Path) -> Dict[str, Any]:
+    """Load the answers manifest of a data folder."""
+    manifest = folder.joinpath(MANIFEST)
+    if not manifest.is_file():
+        return {'reference': '', 'inputs': {}}
+    with open(manifest, 'r', encoding='utf-8') as f:
+        data: Dict[str, Any] = yaml.safe_load(f) or {}
+    data.setdefault('reference', '')
+    data.setdefault('inputs', {})
+    return data
+
+
+def save_manifest(folder: Path, manifest: Dict[str, Any]) -> None:
+    """Save the answers manifest of a data folder."""
+    with open(folder.joinpath(MANIFEST), 'w', encoding='utf-8') as f:
+        yaml.dump(manifest, f, default_flow_style=False)
+
+
+def answer_target(in_file: Path) -> Path:
+    """Return the answer file to write, keeping an existing compression."""
+    existing = cases.answer_file(in_file)
+    if existing is not None and cases.is_compressed(existing):
+        return existing
+    return cases.answer_path(in_file)
+
+
+class AnswerGenerator:
+    """Runs a reference solution over inputs lacking up-to-date answers."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def stale_inputs(self, in_files: List[Path],
+                     manifest: Dict[str, Any],
+                     ref_hash: str,
+                     force: bool = False) -> List[Tuple[Path, str]]:
+        """Select the inputs whose answer must be (re)computed.
+
+        Inputs are tracked by their uncompressed name and content, so
+        compressing the data folder does not make answers stale.
+
+        Returns:
+            List[Tuple[Path, str]]: input files with their hashes
+        """
+        stale = []
+        generated = manifest['inputs']
+        same_reference = manifest['reference'] == ref_hash
+        for in_file in in_files:
+            in_hash = cases.hash_case(in_file)
+            name = cases.case_file(in_file).name
+            if cases.answer_file(in_file) is None or force:
+                stale.append((in_file, in_hash))
+            elif name in generated and (
+                    not same_reference or generated[name] != in_hash):
+                stale.append((in_file, in_hash))
+        return stale
+
+    def generate(self,
+                 problem_root_folder: str,
+                 reference: str,
+                 jobs: int = 0,
+                 force: bool = False,
+                 timeout: Optional[float] = None) -> List[str]:
+        """Write .ans files for inputs lacking an up-to-date answer.
+
+        Returns:
+            List[str]: answer files written
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        try:
+            command, build_folder = build_cache.build_file(reference)
+        except build_cache.BuildError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+
+        folder = cases.data_folder(problem_root_folder)
+        in_files = cases.find_input_files(problem_root_folder)
+        manifest = load_manifest(folder)
+        ref_hash = reference_hash(command, build_folder, reference)
+        stale = self.stale_inputs(in_files, manifest, ref_hash, force)
+        if not stale:
+            console.print(f"All {len(in_files)} answers are up to date.",
+                          style='bold green')
+            return []
+
+        def _answer(item: Tuple[Path, str]) -> Tuple[Path, int, str]:
+            in_file, _ = item
+            code, ans, error = run_program.execute(
+                command, str(in_file), build_folder, timeout,
+                build_cache.run_env(command))
+            if code != 0:
+                return in_file, code, error
+            with cases.open_output(answer_target(in_file)) as f:
+                f.write(ans.encode('utf-8'))
+            return in_file, code, ''
+
+        written = []
+        failed = 0
+        if manifest['reference'] != ref_hash:
+            # answers of the old reference are no longer tracked as fresh
+            manifest['inputs'] = {}
+        manifest['reference'] = ref_hash
+        hashes = dict(stale)
+        with ThreadPoolExecutor(max_workers=jobs) as executor, \
+                console.status(f"Generating {len(stale)} answers..."):
+            for in_file, code, error in executor.map(_answer, stale):
+                if code != 0:
+                    failed += 1
+                    console.print(f"❌ {in_file.name}: reference exited "
+                                  f"with code {code}", style='bold red')
+                    console.print(escape(error))
+                    manifest['inputs'].pop(
+                        cases.case_file(in_file).name, None)
+                    continue
+                manifest['inputs'][cases.case_file(in_file).name] = \
+                    hashes[in_file]
+                written.append(str(answer_target(in_file)))
+        names = {cases.case_file(in_file).name for in_file in in_files}
+        manifest['inputs'] = {name: in_hash for name, in_hash
+                              in manifest['inputs'].items() if name in names}
+        save_manifest(folder, manifest)
+
+        console.print(f"✅ {len(written)} answer(s) written, "
+                      f"{len(in_files) - len(stale)} up to date.",
+                      style='bold green')
+        if failed:
+            console.print(f"{failed} input(s) failed.", style='bold red')
+        return written
+
+
+# Default answer generator for module-level compatibility
+_generator = AnswerGenerator()
+
+
+def generate_answers(problem_root_folder: str,
+                     reference: str,
+                     jobs: int = 0,
+                     force: bool = False,
+                     timeout: Optional[float] = None) -> List[str]:
+    """Module-level wrapper delegating to :class:`AnswerGenerator`."""
+
+    return _generator.generate(problem_root_folder, reference, jobs, force,
+                               timeout)
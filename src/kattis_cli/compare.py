@@ -0,0 +1,271 @@
+"""Compare several solutions of a problem head to head.
+
+Every solution is compiled through its own language config and run over
+all the test cases in parallel. The results are shown as a matrix of
+verdicts and timings with the speedup of every solution over the first
+one; cases on which the solutions' outputs disagree are highlighted.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from math import inf
+import os
+import shutil
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, cases, pyruntime, run_program
+from kattis_cli.utils import utility
+
+# Outcome of one solution on one case: verdict, exit code, seconds, output
+RunResult = Tuple[str, int, float, str]
+
+VERDICT_STYLES = {'AC': 'bold green', 'WA': 'bold red', 'RTE': 'bold red',
+                  'TLE': 'bold red', 'OK': 'bold blue'}
+
+
+def grade(code: int, output: str, ans_file: Optional[Path],
+          accuracy: float = inf) -> str:
+    """Return the verdict of a run.
+
+    Returns:
+        str: AC, WA, RTE, TLE, or OK when the case has no answer file
+    """
+    if code == run_program.TIMEOUT_CODE:
+        return 'TLE'
+    if code != 0:
+        return 'RTE'
+    if ans_file is None:
+        return 'OK'
+    if utility.check_answer_file(ans_file, output, accuracy):
+        return 'AC'
+    return 'WA'
+
+
+def disagree(results: List[RunResult], accuracy: float = inf) -> bool:
+    """Return True if solutions that exited normally differ in output."""
+    outputs = [output for _, code, _, output in results if code == 0]
+    return any(not utility.check_answer(outputs[0], output, accuracy)
+               for output in outputs[1:])
+
+
+def speedup(base: float, seconds: float) -> str:
+    """Format how many times faster a run is than the base run."""
+    if seconds <= 0:
+        return ''
+    return f'×{base / seconds:.1f}'
+
+
+class SolutionComparer:
+    """Runs several solutions over the same test cases."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def compare(self,
+                problem_root_folder: str,
+                solutions: List[str],
+                jobs: int = 0,
+                timeout: float = 10,
+                accuracy: float = inf,
+                cache: Optional[Path] = None
+                ) -> Dict[str, List[RunResult]]:
+        """Compare solutions on every test case.
+
+        Args:
+            problem_root_folder (str): root problem folder
+            solutions (List[str]): solution files; the first is the
+                baseline for speedups
+            jobs (int): parallel jobs (default: number of cores)
+            timeout (float): seconds after which a run is killed
+            accuracy (float): decimal places for float comparison
+            cache (Optional[Path]): build cache folder (default: the
+                build cache on disk)
+
+        Returns:
+            Dict[str, List[RunResult]]: results of every case, in the
+                order of the solutions
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        in_files = cases.find_input_files(problem_root_folder)
+        if not in_files:
+            console.print("No input files found!", style='bold red')
+            exit(1)
+        try:
+            with console.status(f"Compiling {len(solutions)} solutions..."):
+                with ThreadPoolExecutor(max_workers=jobs) as executor:
+                    programs = list(executor.map(
+                        lambda file: build_cache.build_file(file, cache),
+                        solutions))
+        except build_cache.BuildError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+        results = self.run_matrix(in_files, programs, jobs, timeout,
+                                  accuracy, cache)
+        self.print_matrix(solutions, results, accuracy)
+        return results
+
+    def run_matrix(self, in_files: List[Path],
+                   programs: List[Tuple[List[str], Optional[str]]],
+                   jobs: int, timeout: float,
+                   accuracy: float = inf,
+                   cache: Optional[Path] = None
+                   ) -> Dict[str, List[RunResult]]:
+        """Run every program on every case in parallel.
+
+        Args:
+            cache (Optional[Path]): cache folder the programs were built in
+
+        Returns:
+            Dict[str, List[RunResult]]: results of every case, in the
+                order of the programs
+        """
+
+        envs = [build_cache.run_env(command, cache)
+                for command, _ in programs]
+
+        def _run(item: Tuple[Path, int]) -> RunResult:
+            in_file, index = item
+            command, folder = programs[index]
+            code, output, error, seconds = run_program.measure(
+                command, str(in_file), folder, timeout, envs[index])
+            verdict = grade(code, output, cases.answer_file(in_file),
+                            accuracy)
+            return verdict, code, seconds, output if code == 0 else error
+
+        items = [(in_file, index) for in_file in in_files
+                 for index in range(len(programs))]
+        with ThreadPoolExecutor(max_workers=jobs) as executor, \
+                self.console.status(f"Running {len(items)} runs..."):
+            flat = list(executor.map(_run, items))
+        results = {}
+        for i, in_file in enumerate(in_files):
+            start = i * len(programs)
+            results[in_file.name] = flat[start:start + len(programs)]
+        return results
+
+    def compare_runtimes(self,
+                         problem_root_folder: str,
+                         files: List[str],
+                         mainclass: str,
+                         lang_config: Dict[Any, Any],
+                         runtimes: List[str],
+                         jobs: int = 0,
+                         timeout: float = 10,
+                         accuracy: float = inf
+                         ) -> Dict[str, List[RunResult]]:
+        """Compare a Python solution under several runtimes.
+
+        Args:
+            runtimes (List[str]): runtimes of :mod:`pyruntime`; the
+                first is the baseline for speedups
+
+        Returns:
+            Dict[str, List[RunResult]]: results of every case, in the
+                order of the runtimes
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        in_files = cases.find_input_files(problem_root_folder)
+        if not in_files:
+            console.print("No input files found!", style='bold red')
+            exit(1)
+
+        def _build(runtime: str) -> Tuple[List[str], Optional[str]]:
+            python = pyruntime.RUNTIMES[runtime]
+            if shutil.which(python) is None:
+                raise build_cache.BuildError(f'{python} not found.')
+            return build_cache.build_program(
+                pyruntime.with_runtime(lang_config, runtime), files,
+                mainclass)
+
+        try:
+            programs = [_build(runtime) for runtime in runtimes]
+        except (build_cache.BuildError, OSError) as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+        results = self.run_matrix(in_files, programs, jobs, timeout,
+                                  accuracy)
+        self.print_matrix([pyruntime.RUNTIMES[runtime]
+                           for runtime in runtimes], results, accuracy)
+        return results
+
+    def print_matrix(self, solutions: List[str],
+                     results: Dict[str, List[RunResult]],
+                     accuracy: float = inf) -> None:
+        """Print verdicts, timings and speedups of every solution."""
+        console = self.console
+        table = Table(title="[not italic bold blue]⚔ Head to head[/]",
+                      header_style="bold blue", show_footer=True)
+        table.box = box.SQUARE
+        table.add_column("Case", justify="left", style="cyan",
+                         footer="Total")
+        totals = [0.0] * len(solutions)
+        for runs in results.values():
+            for index, (_, _, seconds, _) in enumerate(runs):
+                totals[index] += seconds
+        for index, solution in enumerate(solutions):
+            footer = f'{totals[index]:.3f} s'
+            if index:
+                footer += f' {speedup(totals[0], totals[index])}'
+            table.add_column(escape(Path(solution).name), justify="right",
+                             footer=footer)
+        table.add_column("Outputs", justify="center")
+
+        disagreements = 0
+        for name, runs in results.items():
+            row = [escape(name)]
+            for index, (verdict, _, seconds, _) in enumerate(runs):
+                cell = f'[{VERDICT_STYLES[verdict]}]{verdict}[/] ' \
+                       f'{seconds:.3f} s'
+                if index:
+                    cell += f' {speedup(runs[0][2], seconds)}'
+                row.append(cell)
+            if disagree(runs, accuracy):
+                disagreements += 1
+                row.append('[bold red]differ[/]')
+                row[0] = f'[bold red]{row[0]}[/]'
+            else:
+                row.append('[green]agree[/]')
+            table.add_row(*row)
+        console.print(table)
+        if disagreements:
+            console.print(f"Outputs differ on {disagreements} case(s).",
+                          style='bold red')
+        else:
+            console.print("All solutions agree.", style='bold green')
+
+
+# Default comparer for module-level compatibility
+_comparer = SolutionComparer()
+
+
+def compare(problem_root_folder: str,
+            solutions: List[str],
+            jobs: int = 0,
+            timeout: float = 10,
+            accuracy: float = inf,
+            cache: Optional[Path] = None) -> Dict[str, List[RunResult]]:
+    """Module-level wrapper delegating to :class:`SolutionComparer`."""
+
+    return _comparer.compare(problem_root_folder, solutions, jobs, timeout,
+                             accuracy, cache)
+
+
+def compare_runtimes(problem_root_folder: str,
+                     files: List[str],
+                     mainclass: str,
+                     lang_config: Dict[Any, Any],
+                     runtimes: List[str],
+                     jobs: int = 0,
+                     timeout: float = 10,
+                     accuracy: float = inf) -> Dict[str, List[RunResult]]:
+    """Module-level wrapper delegating to :class:`SolutionComparer`."""
+
+    return _comparer.compare_runtimes(problem_root_folder, files, mainclass,
+                                      lang_config, runtimes, jobs, timeout,
+                                      accuracy)
@@ -0,0 +1,264 @@
+"""Estimate the time complexity of a solution empirically.
+
+An input generator is run for geometrically growing sizes, the solution
+is timed on every generated input, and the timings are fitted against
+common complexity models. The best model is extrapolated to the maximum
+input size and compared with the problem's CPU time limit.
+
+The generator is any program (compiled through .kattis-cli.toml like a
+solution) that takes the size ``n`` and a seed as command-line arguments
+and writes one input to stdout.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
+import tempfile
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, constraints, run_program, utility
+
+MODELS: Dict[str, Callable[[float], float]] = {
+    'O(n)': lambda n: n,
+    'O(n log n)': lambda n: n * math.log2(n),
+    'O(n²)': lambda n: n ** 2,
+    'O(n³)': lambda n: n ** 3,
+}
+
+
+def geometric_sizes(min_n: int, factor: float, steps: int) -> List[int]:
+    """Return geometrically growing input sizes.
+
+    Args:
+        min_n (int): smallest size
+        factor (float): growth factor between sizes
+        steps (int): number of sizes
+
+    Returns:
+        List[int]: distinct sizes in increasing order
+    """
+    sizes: List[int] = []
+    for step in range(steps):
+        size = int(round(min_n * factor ** step))
+        if not sizes or size > sizes[-1]:
+            sizes.append(size)
+    return sizes
+
+
+def fit_models(sizes: List[int],
+               times: List[float]) -> List[Tuple[str, float, float, float]]:
+    """Fit ``time = a + b * f(n)`` for every complexity model.
+
+    The constant ``a`` absorbs process startup; the fit error is the root
+    mean square of the relative residuals.
+
+    Args:
+        sizes (List[int]): input sizes
+        times (List[float]): measured seconds per size
+
+    Returns:
+        List[Tuple[str, float, float, float]]: model, a, b and error,
+            best fit first
+    """
+    fits = []
+    mean_t = sum(times) / len(times)
+    for name, model in MODELS.items():
+        xs = [model(n) for n in sizes]
+        mean_x = sum(xs) / len(xs)
+        var = sum((x - mean_x) ** 2 for x in xs)
+        cov = sum((x - mean_x) * (t - mean_t) for x, t in zip(xs, times))
+        b = max(cov / var, 0.0) if var else 0.0
+        a = max(mean_t - b * mean_x, 0.0)
+        error = math.sqrt(sum(((a + b * x - t) / t) ** 2
+                              for x, t in zip(xs, times)) / len(xs))
+        fits.append((name, a, b, error))
+    fits.sort(key=lambda fit: fit[3])
+    return fits
+
+
+def predict(model: str, a: float, b: float, n: int) -> float:
+    """Predict seconds for size n from a fitted model."""
+    return a + b * MODELS[model](n)
+
+
+class ComplexityEstimator:
+    """Times a solution on generated inputs of growing size."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def generate_inputs(self, gen_command: List[str],
+                        gen_folder: Optional[str],
+                        sizes: List[int],
+                        out_folder: str,
+                        jobs: int,
+                        seed: int = 1) -> List[str]:
+        """Generate one input file per size in parallel.
+
+        Returns:
+            List[str]: input files in the order of sizes
+        """
+
+        def _generate(size: int) -> str:
+            command = gen_command + [str(size), str(seed)]
+            code, output, error = run_program.execute(
+                command, os.devnull, gen_folder, None,
+                build_cache.run_env(gen_command))
+            if code != 0:
+                raise RuntimeError(f'Generator failed for n={size}:\n{error}')
+            in_file = os.path.join(out_folder, f'{size}.in')
+            with open(in_file, 'w', encoding='utf-8') as f:
+                f.write(output)
+            return in_file
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(_generate, sizes))
+
+    def time_runs(self, run_command: List[str],
+                  run_folder: Optional[str],
+                  in_files: List[str],
+                  repeat: int,
+                  jobs: int) -> List[float]:
+        """Time the solution on every input, keeping the fastest repeat.
+
+        Returns:
+            List[float]: seconds per input file
+        """
+
+        def _time(in_file: str) -> float:
+            code, _, error, elapsed = run_program.measure(
+                run_command, in_file, run_folder, None,
+                build_cache.run_env(run_command))
+            if code != 0:
+                raise RuntimeError(f'Solution failed on {in_file}:\n{error}')
+            return elapsed
+
+        runs = [f for f in in_files for _ in range(repeat)]
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            elapsed = list(executor.map(_time, runs))
+        return [min(elapsed[i * repeat:(i + 1) * repeat])
+                for i in range(len(in_files))]
+
+    def estimate(
+            self,
+            problemid: str,
+            mainclass: str,
+            problem_root_folder: str,
+            files: List[str],
+            lang_config: Dict[Any, Any],
+            generator: str,
+            sizes: List[int],
+            max_n: int = 0,
+            repeat: int = 3,
+            jobs: int = 0,
+            size_var: str = 'n') -> List[Tuple[str, float, float, float]]:
+        """Estimate the complexity of the solution.
+
+        Without max_n, the maximum of the size_var constraint recorded in
+        the problem metadata by ``kattis get`` is used.
+
+        Returns:
+            List[Tuple[str, float, float, float]]: fitted models, best first
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        try:
+            gen_command, gen_folder = build_cache.build_file(generator)
+            run_command, run_folder = build_cache.build_program(
+                lang_config, files, mainclass)
+        except build_cache.BuildError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            try:
+                in_files = self.generate_inputs(gen_command, gen_folder,
+                                                sizes, tmp_dir, jobs)
+                times = self.time_runs(run_command, run_folder, in_files,
+                                       repeat, jobs)
+            except RuntimeError as ex:
+                console.print(escape(str(ex)), style='bold red')
+                exit(1)
+
+        fits = fit_models(sizes, times)
+        metadata = utility.load_metadata(problem_root_folder, problemid)
+        cpu_limit = utility.parse_cpu_limit(metadata.get('cpu_limit'))
+        if not max_n:
+            max_n = constraints.max_size(metadata, size_var) or 0
+            if max_n:
+                console.print(f"Using the constraint {size_var} ≤ {max_n} "
+                              "from the problem statement.",
+                              style='bold blue')
+
+        timings = Table(title="[not italic bold blue]⏱ Timings[/]",
+                        header_style="bold blue")
+        timings.box = box.SQUARE
+        timings.add_column("n", justify="right", style="cyan")
+        timings.add_column("Time (s)", justify="right", style="cyan")
+        for size, seconds in zip(sizes, times):
+            timings.add_row(str(size), f'{seconds:.4f}')
+        console.print(timings)
+
+        models = Table(title="[not italic bold blue]📈 Model fits[/]",
+                       header_style="bold blue")
+        models.box = box.SQUARE
+        models.add_column("Model", justify="left", style="cyan")
+        models.add_column("Fit error", justify="right", style="cyan")
+        if max_n:
+            models.add_column(f"Predicted at n={max_n}", justify="right",
+                              style="cyan")
+        for name, a, b, error in fits:
+            row = [name, f'{error:.3f}']
+            if max_n:
+                row.append(f'{predict(name, a, b, max_n):.3f} s')
+            models.add_row(*row)
+        console.print(models)
+
+        best, a, b, _ = fits[0]
+        console.print(f"Best fit: {best}", style='bold blue')
+        if not max_n:
+            console.print("Use --max-n to extrapolate to the maximum "
+                          "input size; no constraint on "
+                          f"{size_var} was found.", style='bold yellow')
+        elif cpu_limit is None:
+            console.print("CPU limit not found in problem metadata.",
+                          style='bold yellow')
+        else:
+            predicted = predict(best, a, b, max_n)
+            if predicted <= cpu_limit:
+                console.print(
+                    f"Predicted {predicted:.3f} s at n={max_n} is within "
+                    f"the CPU limit of {cpu_limit:g} s.", style='bold green')
+            else:
+                console.print(
+                    f"Predicted {predicted:.3f} s at n={max_n} exceeds "
+                    f"the CPU limit of {cpu_limit:g} s. Likely TLE!",
+                    style='bold red')
+        return fits
+
+
+# Default estimator for module-level compatibility
+_estimator = ComplexityEstimator()
+
+
+def estimate(
+        problemid: str,
+        mainclass: str,
+        problem_root_folder: str,
+        files: List[str],
+        lang_config: Dict[Any, Any],
+        generator: str,
+        sizes: List[int],
+        max_n: int = 0,
+        repeat: int = 3,
+        jobs: int = 0,
+        size_var: str = 'n') -> List[Tuple[str, float, float, float]]:
+    """Module-level wrapper delegating to :class:`ComplexityEstimator`."""
+
+    return _estimator.estimate(problemid, mainclass, problem_root_folder,
+                               files, lang_config, generator, sizes, max_n,
+                               repeat, jobs, size_var)
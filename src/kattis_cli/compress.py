@@ -0,0 +1,126 @@
+"""Compress the test data of a problem in place.
+
+Large inputs and answers in ``data/`` are converted to ``.gz``, ``.xz``
+or ``.zst`` files. Compressed cases are found by ``kattis test`` and the
+other commands, decompressed into the program's stdin while it runs and
+compared with streamed answers, so they are never inflated on disk.
+"""
+
+from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+from pathlib import Path
+from rich.console import Console
+from rich.markup import escape
+
+from kattis_cli.utils import cases
+
+FORMATS = ('gz', 'xz', 'zst')
+
+
+class DataCompressor:
+    """Converts plain test data files to compressed ones."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def select_files(self, problem_root_folder: str,
+                     min_size: int) -> List[Path]:
+        """Select the plain inputs and answers of at least min_size bytes.
+
+        Returns:
+            List[Path]: files to compress
+        """
+        folder = cases.data_folder(problem_root_folder)
+        files = []
+        for pattern in ('*.in', '*.ans', '*.out'):
+            files += [file for file in folder.glob(pattern)
+                      if file.stat().st_size >= min_size]
+        return sorted(files)
+
+    def compress_file(self, file: Path, fmt: str, keep: bool) -> Path:
+        """Compress a file next to itself and remove the original.
+
+        The compressed file is written under a temporary name first, so
+        an interrupted run never leaves a truncated case behind.
+        """
+        target = Path(f'{file}.{fmt}')
+        partial = file.with_name(f'.{file.name}.partial.{fmt}')
+        try:
+            with open(file, 'rb') as source, \
+                    cases.open_output(partial) as sink:
+                shutil.copyfileobj(source, sink, 1 << 20)
+            os.replace(partial, target)
+        finally:
+            partial.unlink(missing_ok=True)
+        if not keep:
+            file.unlink()
+        return target
+
+    def compress(self,
+                 problem_root_folder: str,
+                 fmt: str = 'gz',
+                 min_size: int = 1 << 20,
+                 keep: bool = False,
+                 jobs: int = 0) -> List[str]:
+        """Compress the large test data files of a problem.
+
+        Args:
+            problem_root_folder (str): root problem folder
+            fmt (str): gz, xz or zst (requires zstandard)
+            min_size (int): smallest file size in bytes to compress;
+                small samples stay readable
+            keep (bool): keep the original files
+            jobs (int): parallel jobs (default: number of cores)
+
+        Returns:
+            List[str]: compressed files
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        if fmt not in FORMATS:
+            console.print(f"Unknown format {fmt}; use one of "
+                          f"{', '.join(FORMATS)}.", style='bold red')
+            exit(1)
+        if fmt == 'zst' and not cases.has_zstandard():
+            console.print("zst requires zstandard: pip install zstandard",
+                          style='bold red')
+            exit(1)
+
+        files = self.select_files(problem_root_folder, min_size)
+        if not files:
+            console.print(f"No data files of at least {min_size} bytes "
+                          "to compress.", style='bold blue')
+            return []
+        before = sum(file.stat().st_size for file in files)
+
+        def _compress(file: Path) -> Path:
+            return self.compress_file(file, fmt, keep)
+
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as executor, \
+                    console.status(f"Compressing {len(files)} files..."):
+                compressed = list(executor.map(_compress, files))
+        except OSError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+        after = sum(file.stat().st_size for file in compressed)
+        console.print(f"✅ Compressed {len(files)} files from {before} to "
+                      f"{after} bytes.", style='bold green')
+        return [str(file) for file in compressed]
+
+
+# Default compressor for module-level compatibility
+_compressor = DataCompressor()
+
+
+def compress_data(problem_root_folder: str,
+                  fmt: str = 'gz',
+                  min_size: int = 1 << 20,
+                  keep: bool = False,
+                  jobs: int = 0) -> List[str]:
+    """Module-level wrapper delegating to :class:`DataCompressor`."""
+
+    return _compressor.compress(problem_root_folder, fmt, min_size, keep,
+                                jobs)
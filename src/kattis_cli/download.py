@@ -12,7 +12,7 @@ from pathlib import Path
 import requests
 import yaml
 from bs4 import BeautifulSoup
-from .utils import config, utility
+from .utils import config, constraints, utility
 from . import settings
 
 
@@ -101,7 +101,8 @@ class DownloadManager:
         """Internal parser that extracts metadata from problem HTML.
 
         This method uses BeautifulSoup to extract title, limits,
-        difficulty and basic submission stats from the problem page.
+        difficulty, basic submission stats and input constraints such as
+        ``1 ≤ n ≤ 10^5`` from the problem page.
         """
 
         soup = BeautifulSoup(html, "html.parser")
@@ -137,6 +138,10 @@ class DownloadManager:
                 meta_data[key1] = value
             except AttributeError:
                 pass
+
+        input_constraints = constraints.extract_constraints(soup)
+        if input_constraints:
+            meta_data['constraints'] = input_constraints
         return meta_data
 
     def parse_metadata(self, problemid: str, html: str) -> Dict[str, Any]:
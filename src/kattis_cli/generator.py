@@ -0,0 +1,337 @@
+"""Generate test inputs from a declarative YAML spec using NumPy.
+
+A spec describes the input line by line::
+
+    name: max            # output file stem (default: spec file stem)
+    seed: 1
+    vars:
+      n: 10^5            # fixed value
+      q: {low: 1, high: n}  # random value
+    lines:
+      - values: [n, q]
+      - array: n
+        low: -10^9
+        high: 10^9
+        distinct: true   # optional; also sorted, rows
+      - permutation: n   # 1..n, see base
+      - tree: n          # n-1 edges "u v"; weight_low/weight_high add w
+      - graph: n
+        edges: q
+        connected: true
+      - string: n
+        alphabet: ab
+
+Counts and bounds are integers (``10^5`` and ``1e9`` are accepted) or
+names of variables. The constraints that ``kattis get`` extracts from the
+statement are predefined as ``max_<name>`` and ``min_<name>`` (e.g.
+``n: max_n``). Generation is vectorized and seeded, so the same spec
+and seed always produce the same file; generated files are recorded in
+``data/.generated.yaml`` and are only regenerated when the spec, the
+seed or the constraints change. NumPy is an optional dependency of this
+command.
+"""
+
+from typing import Any, Dict, IO, List, Optional, Tuple
+import hashlib
+import re
+from pathlib import Path
+import yaml
+from rich.console import Console
+
+from kattis_cli.utils import cases, utility
+
+MANIFEST = '.generated.yaml'
+DEFAULT_ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+
+class SpecError(Exception):
+    """Exception raised for invalid generator specs."""
+
+
+def _load_numpy() -> Any:
+    """Import NumPy, which is only needed by this command."""
+    try:
+        import numpy
+    except ImportError as ex:
+        raise SpecError(
+            'kattis gen requires NumPy: pip install numpy') from ex
+    return numpy
+
+
+def parse_value(value: Any, variables: Dict[str, int]) -> int:
+    """Evaluate a count or bound of a spec.
+
+    Args:
+        value (Any): integer, variable name, or a number such as
+            '10^5', '1e9' or '-10^9'
+        variables (Dict[str, int]): values of the spec variables
+
+    Returns:
+        int: the value
+    """
+    if isinstance(value, bool):
+        raise SpecError(f'Invalid value: {value}')
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().replace(' ', '')
+    if text in variables:
+        return variables[text]
+    match = re.fullmatch(r'(-?)(\d+)\^(\d+)', text)
+    if match:
+        sign = -1 if match.group(1) else 1
+        return sign * int(int(match.group(2)) ** int(match.group(3)))
+    try:
+        return int(float(text))
+    except ValueError as ex:
+        raise SpecError(f'Invalid value: {value}') from ex
+
+
+def constraint_variables(metadata: Dict[Any, Any]) -> Dict[str, int]:
+    """Return max_<name>/min_<name> variables of the problem constraints."""
+    variables = {}
+    for name, bounds in (metadata.get('constraints') or {}).items():
+        for bound in ('min', 'max'):
+            if bound in bounds:
+                variables[f'{bound}_{name}'] = int(bounds[bound])
+    return variables
+
+
+class InputGenerator:
+    """Writes inputs described by a spec with a seeded NumPy generator."""
+
+    def __init__(self, spec: Dict[str, Any], seed: int,
+                 constants: Optional[Dict[str, int]] = None) -> None:
+        np = _load_numpy()
+        self.np = np
+        self.spec = spec
+        self.rng = np.random.default_rng(seed)
+        self.variables: Dict[str, int] = dict(constants or {})
+        for name, value in (spec.get('vars') or {}).items():
+            if isinstance(value, dict):
+                low, high = self.bounds(value.get('low', 1), value['high'])
+                self.variables[name] = int(self.rng.integers(low, high + 1))
+            else:
+                self.variables[name] = self.value(value)
+
+    def value(self, value: Any) -> int:
+        """Evaluate a count or bound with the spec variables."""
+        return parse_value(value, self.variables)
+
+    def count(self, value: Any) -> int:
+        """Evaluate a count and check that it is not negative."""
+        count = self.value(value)
+        if count < 0:
+            raise SpecError(f'Negative count: {value} = {count}.')
+        return count
+
+    def bounds(self, low: Any, high: Any) -> Tuple[int, int]:
+        """Evaluate the bounds of a range of 64-bit integers.
+
+        Raises:
+            SpecError: if the range is empty or does not fit in 64 bits
+        """
+        low, high = self.value(low), self.value(high)
+        if low > high:
+            raise SpecError(f'Empty range: low {low} > high {high}.')
+        if low < -2 ** 63 or high >= 2 ** 63 - 1:
+            raise SpecError(f'Range [{low}, {high}] does not fit in 64-bit '
+                            'integers.')
+        return low, high
+
+    def distinct(self, count: int, low: int, high: int) -> Any:
+        """Return count distinct random integers in [low, high]."""
+        np = self.np
+        size = high - low + 1
+        if count > size:
+            raise SpecError(f'Cannot draw {count} distinct values from '
+                            f'[{low}, {high}].')
+        if size <= 4 * count:
+            return self.rng.permutation(size)[:count] + low
+        values = np.unique(self.rng.integers(low, high + 1, size=count))
+        while len(values) < count:
+            extra = self.rng.integers(low, high + 1,
+                                      size=count - len(values))
+            values = np.unique(np.concatenate([values, extra]))
+        return self.rng.permutation(values)
+
+    def edges(self, nodes: int, count: int, connected: bool) -> Any:
+        """Return count distinct undirected edges without self loops.
+
+        Connected graphs start from a random spanning tree.
+        """
+        np = self.np
+        if count > nodes * (nodes - 1) // 2:
+            raise SpecError(f'Too many edges for {nodes} nodes.')
+        keys = np.empty(0, dtype=np.int64)
+        if connected:
+            if count < nodes - 1:
+                raise SpecError('A connected graph needs at least n-1 edges.')
+            tree = self.tree(nodes)
+            keys = np.minimum(tree[:, 0], tree[:, 1]) * nodes + \
+                np.maximum(tree[:, 0], tree[:, 1])
+        while len(keys) < count:
+            need = count - len(keys)
+            u = self.rng.integers(0, nodes, size=need)
+            v = self.rng.integers(0, nodes, size=need)
+            keep = u != v
+            extra = np.minimum(u, v)[keep] * nodes + np.maximum(u, v)[keep]
+            extra = self.rng.permutation(np.setdiff1d(extra, keys))[:need]
+            keys = np.concatenate([keys, extra])
+        keys = self.rng.permutation(keys)
+        return np.stack([keys // nodes, keys % nodes], axis=1)
+
+    def tree(self, nodes: int) -> Any:
+        """Return the n-1 edges of a random labelled tree."""
+        np = self.np
+        children = np.arange(1, nodes)
+        parents = (self.rng.random(nodes - 1) * children).astype(np.int64)
+        labels = self.rng.permutation(nodes)
+        edges = np.stack([labels[parents], labels[children]], axis=1)
+        return self.rng.permutation(edges)
+
+    def write_rows(self, f: IO[str], rows: Any, item: Dict[str, Any]) -> None:
+        """Write edge rows, optionally with random weights."""
+        np = self.np
+        rows = rows + self.value(item.get('base', 1))
+        if 'weight_high' in item:
+            low, high = self.bounds(item.get('weight_low', 1),
+                                    item['weight_high'])
+            weights = self.rng.integers(low, high + 1, size=len(rows))
+            rows = np.column_stack([rows, weights])
+        if len(rows):
+            # one %-format over all rows is several times faster than
+            # np.savetxt or joining row by row
+            line = ' '.join(['%d'] * rows.shape[1]) + '\n'
+            f.write((line * len(rows)) % tuple(rows.ravel().tolist()))
+
+    def write_item(self, f: IO[str], item: Dict[str, Any]) -> None:
+        """Write one line item of the spec."""
+        np = self.np
+        if 'values' in item:
+            f.write(' '.join(str(self.value(v)) for v in item['values']))
+            f.write('\n')
+        elif 'array' in item:
+            count = self.count(item['array'])
+            low, high = self.bounds(item.get('low', 1),
+                                    item.get('high', 10 ** 9))
+            for _ in range(self.count(item.get('rows', 1))):
+                if item.get('distinct'):
+                    values = self.distinct(count, low, high)
+                else:
+                    values = self.rng.integers(low, high + 1, size=count)
+                if item.get('sorted'):
+                    values = np.sort(values)
+                sep = '\n' if item.get('per_line') else ' '
+                f.write(sep.join(map(str, values.tolist())))
+                f.write('\n')
+        elif 'permutation' in item:
+            count = self.count(item['permutation'])
+            values = self.rng.permutation(count) + \
+                self.value(item.get('base', 1))
+            f.write(' '.join(map(str, values.tolist())))
+            f.write('\n')
+        elif 'tree' in item:
+            self.write_rows(f, self.tree(self.count(item['tree'])), item)
+        elif 'graph' in item:
+            nodes = self.count(item['graph'])
+            rows = self.edges(nodes, self.count(item['edges']),
+                              bool(item.get('connected')))
+            self.write_rows(f, rows, item)
+        elif 'string' in item:
+            alphabet = str(item.get('alphabet', DEFAULT_ALPHABET))
+            if not alphabet or not alphabet.isascii():
+                raise SpecError(f'An alphabet must be non-empty ASCII: '
+                                f'{alphabet!r}')
+            letters = np.frombuffer(alphabet.encode('ascii'), dtype='S1')
+            index = self.rng.integers(0, len(letters),
+                                      size=self.count(item['string']))
+            f.write(letters[index].tobytes().decode('ascii'))
+            f.write('\n')
+        else:
+            raise SpecError(f'Unknown line item: {item}')
+
+    def write(self, output: Path) -> None:
+        """Write the whole input through a large buffered writer."""
+        with open(output, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for item in self.spec.get('lines') or []:
+                if not isinstance(item, dict):
+                    raise SpecError(f'Invalid line item: {item}')
+                self.write_item(f, item)
+
+
+def generate(problem_root_folder: str,
+             spec_file: str,
+             seed: Optional[int] = None,
+             count: int = 1,
+             force: bool = False,
+             problemid: str = '') -> List[str]:
+    """Generate inputs from a spec into the problem's data folder.
+
+    Args:
+        problem_root_folder (str): root problem folder
+        spec_file (str): YAML spec
+        seed (Optional[int]): first seed (default: the spec's seed or 1)
+        count (int): number of inputs, one per consecutive seed
+        force (bool): regenerate cached files
+        problemid (str): problem id (default: name of the root folder)
+
+    Returns:
+        List[str]: generated (or cached) input files
+    """
+    console = Console()
+    spec_text = Path(spec_file).read_text(encoding='utf-8')
+    try:
+        spec = yaml.safe_load(spec_text) or {}
+        if not isinstance(spec, dict):
+            raise SpecError('A spec must be a mapping.')
+        _load_numpy()
+    except (yaml.YAMLError, SpecError) as ex:
+        console.print(str(ex), style='bold red')
+        exit(1)
+    if seed is None:
+        seed = int(spec.get('seed', 1))
+    name = spec.get('name') or Path(spec_file).stem
+    problemid = problemid or Path(problem_root_folder).name
+    constants = constraint_variables(
+        utility.load_metadata(problem_root_folder, problemid))
+
+    folder = cases.data_folder(problem_root_folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    manifest_file = folder.joinpath(MANIFEST)
+    manifest: Dict[str, str] = {}
+    if manifest_file.is_file():
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = yaml.safe_load(f) or {}
+
+    outputs = []
+    for current in range(seed, seed + count):
+        output = folder.joinpath(f'{name}-{current}.in')
+        key = hashlib.sha256(
+            f'{spec_text}\n{current}\n{sorted(constants.items())}'.encode(
+                'utf-8')).hexdigest()
+        # inputs compressed by kattis compress-data are still up to date
+        existing = [Path(f'{output}{suffix}')
+                    for suffix in ('',) + cases.COMPRESSIONS
+                    if Path(f'{output}{suffix}').is_file()]
+        if not force and existing and manifest.get(output.name) == key:
+            outputs.append(str(existing[0]))
+            console.print(f"{existing[0].name} is up to date.",
+                          style='bold blue')
+            continue
+        outputs.append(str(output))
+        try:
+            with console.status(f"Generating {output.name}..."):
+                InputGenerator(spec, current, constants).write(output)
+        except (SpecError, KeyError) as ex:
+            output.unlink(missing_ok=True)
+            console.print(f"Invalid spec {spec_file}: {ex}",
+                          style='bold red')
+            exit(1)
+        manifest[output.name] = key
+        size = output.stat().st_size
+        console.print(f"✅ Generated {output} ({size} bytes).",
+                      style='bold green')
+
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        yaml.dump(manifest, f, default_flow_style=False)
+    return outputs
@@ -0,0 +1,348 @@
+"""Keep a local history of test runs to catch performance regressions.
+
+Every ``kattis test`` run appends the verdict and time of every case to a
+SQLite database under ``~/.local/state/kattis-cli``, along with the hash
+of the solution's sources and the git commit they were tested at.
+``kattis history`` shows the trends, and ``kattis test --budget`` fails
+when a case got slower than the best previous passing run of the same
+solution by more than the problem's budget, which is read from the
+``budget`` section of ``<problemid>.yaml``::
+
+    budget:
+      regression: 0.2   # allowed slowdown over the best run (20%)
+      seconds: 1.0      # limit of every case
+      cases:
+        big: 0.5        # limit of one case
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+import os
+import sqlite3
+import subprocess
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, toolchains, utility
+
+HISTORY_FILE = 'history.sqlite3'
+# slowdown over the best run allowed when the budget sets none
+REGRESSION = 0.2
+# slowdowns below this many seconds are timer noise, not regressions
+NOISE = 0.01
+SPARKS = '▁▂▃▄▅▆▇█'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    problem TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    language TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    git_commit TEXT NOT NULL,
+    started TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    case_name TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    memory INTEGER,
+    PRIMARY KEY (run_id, case_name)
+);
+CREATE INDEX IF NOT EXISTS runs_solution ON runs(problem, solution);
+'''
+
+# result of one case: case name, verdict, seconds, peak memory in KiB
+CaseResult = Tuple[str, str, float, Optional[int]]
+
+
+def history_file() -> Path:
+    """Return the history database of the user."""
+    return toolchains.state_folder().joinpath(HISTORY_FILE)
+
+
+def source_hash(files: List[str]) -> str:
+    """Return a digest of the names and contents of the source files."""
+    digest = hashlib.sha256()
+    for file in sorted(files):
+        if os.path.isfile(file):
+            digest.update(os.path.basename(file).encode('utf-8'))
+            digest.update(build_cache.hash_file(file).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def git_commit(files: List[str]) -> str:
+    """Return the commit the files are at, '+dirty' if they changed.
+
+    Returns an empty string outside of a git repository.
+    """
+    folder = os.path.dirname(os.path.abspath(files[0])) if files \
+        else os.getcwd()
+    try:
+        head = subprocess.run(
+            ['git', 'rev-parse', '--short=12', 'HEAD'], cwd=folder,
+            capture_output=True, text=True, check=True).stdout.strip()
+        paths = [os.path.abspath(file) for file in files]
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '--', *paths],
+            cwd=folder, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+    return f'{head}+dirty' if status.strip() else head
+
+
+def sparkline(values: List[float]) -> str:
+    """Draw values as a line of block characters, oldest first."""
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    return ''.join(SPARKS[int((value - low) / span * (len(SPARKS) - 1))]
+                   for value in values)
+
+
+def short_date(started: str) -> str:
+    """Format a run's ISO start time to the minute."""
+    return started[:16].replace('T', ' ')
+
+
+def load_budget(problem_root_folder: str, problemid: str) -> Dict[str, Any]:
+    """Load the budget section of the problem's metadata."""
+    budget = utility.load_metadata(problem_root_folder,
+                                   problemid).get('budget')
+    return budget if isinstance(budget, dict) else {}
+
+
+def over_budget(results: List[CaseResult], best: Dict[str, float],
+                budget: Dict[str, Any]) -> Dict[str, str]:
+    """Return why the cases that broke the budget did.
+
+    Args:
+        results (List[CaseResult]): results of the current run
+        best (Dict[str, float]): best previous passing time of every case
+        budget (Dict[str, Any]): budget section of the problem's metadata
+
+    Returns:
+        Dict[str, str]: case name -> reason
+    """
+    regression = float(budget.get('regression', REGRESSION))
+    # YAML reads case names like 1 as numbers
+    limits = {str(name): limit
+              for name, limit in (budget.get('cases') or {}).items()}
+    failed = {}
+    for name, _, seconds, _ in results:
+        limit = limits.get(name, budget.get('seconds'))
+        previous = best.get(name)
+        if limit is not None and seconds > float(limit):
+            failed[name] = f'{seconds:.3f} s > budget of {float(limit):g} s'
+        elif previous is not None and \
+                seconds > previous * (1 + regression) and \
+                seconds - previous > NOISE:
+            failed[name] = (f'{seconds:.3f} s is '
+                            f'{100 * (seconds / previous - 1):.0f}% slower '
+                            f'than the best {previous:.3f} s')
+    return failed
+
+
+class RunHistory:
+    """Stores test runs in SQLite and reports their trends."""
+
+    def __init__(self, path: Optional[Path] = None,
+                 console: Optional[Console] = None) -> None:
+        self.path = path
+        self.console = console or Console()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the database, creating it on first use."""
+        path = self.path or history_file()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def record(self, problemid: str, solution: str, loc_language: str,
+               files: List[str], results: List[CaseResult]) -> int:
+        """Append a run and the results of its cases.
+
+        Returns:
+            int: id of the run
+        """
+        connection = self.connect()
+        try:
+            with connection:
+                cursor = connection.execute(
+                    'INSERT INTO runs (problem, solution, language, '
+                    'source_hash, git_commit, started) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (problemid, os.path.basename(solution), loc_language,
+                     source_hash(files), git_commit(files),
+                     datetime.now().isoformat(timespec='seconds')))
+                run_id = cursor.lastrowid
+                assert run_id is not None
+                connection.executemany(
+                    'INSERT INTO results VALUES (?, ?, ?, ?, ?)',
+                    [(run_id,) + result for result in results])
+        finally:
+            connection.close()
+        return run_id
+
+    def best_times(self, problemid: str, solution: str,
+                   before: Optional[int] = None) -> Dict[str, float]:
+        """Return the best passing time of every case of a solution.
+
+        Args:
+            before (Optional[int]): only consider runs older than this
+                run id
+
+        Returns:
+            Dict[str, float]: case name -> seconds
+        """
+        query = ('SELECT case_name, MIN(seconds) FROM results '
+                 'JOIN runs ON runs.id = results.run_id '
+                 "WHERE problem = ? AND solution = ? AND verdict = 'AC'")
+        params: List[Any] = [problemid, os.path.basename(solution)]
+        if before is not None:
+            query += ' AND runs.id < ?'
+            params.append(before)
+        connection = self.connect()
+        try:
+            rows = connection.execute(query + ' GROUP BY case_name',
+                                      params).fetchall()
+        finally:
+            connection.close()
+        return dict(rows)
+
+    def check_budget(self, problem_root_folder: str, problemid: str,
+                     solution: str, results: List[CaseResult],
+                     run_id: int) -> Dict[str, str]:
+        """Compare a run with the best previous runs and the budget.
+
+        Returns:
+            Dict[str, str]: why the cases that broke the budget did
+        """
+        console = self.console
+        best = self.best_times(problemid, solution, run_id)
+        failed = over_budget(results, best,
+                             load_budget(problem_root_folder, problemid))
+        if not failed:
+            console.print("All cases are within the performance budget.",
+                          style='bold green')
+            return failed
+        table = Table(title="[not italic bold blue]⏱ Over budget[/]",
+                      header_style="bold blue")
+        table.box = box.SQUARE
+        table.add_column("Case", justify="left", style="cyan")
+        table.add_column("Reason", justify="left", style="bold red")
+        for name, reason in failed.items():
+            table.add_row(escape(name), reason)
+        console.print(table)
+        return failed
+
+    def runs(self, problemid: str, limit: int = 20) -> List[Tuple[Any, ...]]:
+        """Return the latest runs of a problem with their totals."""
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                'SELECT runs.id, started, solution, git_commit, '
+                "source_hash, SUM(verdict = 'AC'), COUNT(*), SUM(seconds) "
+                'FROM runs JOIN results ON runs.id = results.run_id '
+                'WHERE problem = ? GROUP BY runs.id '
+                'ORDER BY runs.id DESC LIMIT ?',
+                (problemid, limit)).fetchall()
+        finally:
+            connection.close()
+        return rows[::-1]
+
+    def case_runs(self, problemid: str, case: str,
+                  limit: int = 20) -> List[Tuple[Any, ...]]:
+        """Return the latest results of one case of a problem."""
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                'SELECT runs.id, started, solution, git_commit, verdict, '
+                'seconds, memory FROM runs '
+                'JOIN results ON runs.id = results.run_id '
+                'WHERE problem = ? AND case_name = ? '
+                'ORDER BY runs.id DESC LIMIT ?',
+                (problemid, case, limit)).fetchall()
+        finally:
+            connection.close()
+        return rows[::-1]
+
+    def show(self, problemid: str, case: str = '', limit: int = 20) -> None:
+        """Print the trend of the runs of a problem, or of one case."""
+        console = self.console
+        if case:
+            rows = self.case_runs(problemid, case, limit)
+        else:
+            rows = self.runs(problemid, limit)
+        if not rows:
+            console.print(f"No runs of {problemid}"
+                          f"{' case ' + case if case else ''} recorded yet.",
+                          style='bold yellow')
+            return
+        title = f"📈 {problemid}" + (f" case {case}" if case else '')
+        table = Table(title=f"[not italic bold blue]{escape(title)}[/]",
+                      header_style="bold blue")
+        table.box = box.SQUARE
+        for column in ('Run', 'Date', 'Solution', 'Commit'):
+            table.add_column(column, justify="left", style="cyan")
+        if case:
+            # memory is not measured without os.wait4
+            measured = any(row[6] is not None for row in rows)
+            for column in ('Verdict', 'Time') + (('Memory',) if measured
+                                                 else ()):
+                table.add_column(column, justify="right")
+            for run_id, started, solution, commit, verdict, seconds, \
+                    memory in rows:
+                style = 'bold green' if verdict == 'AC' else 'bold red'
+                row = [str(run_id), short_date(started), escape(solution),
+                       commit, f'[{style}]{verdict}[/]', f'{seconds:.3f} s']
+                if measured:
+                    row.append(f'{memory / 1024:.1f} MiB' if memory else '')
+                table.add_row(*row)
+            times = [row[5] for row in rows]
+        else:
+            for column in ('Source', 'Passed', 'Total time'):
+                table.add_column(column, justify="right")
+            for run_id, started, solution, commit, digest, passed, total, \
+                    seconds in rows:
+                style = 'bold green' if passed == total else 'bold red'
+                table.add_row(str(run_id), short_date(started),
+                              escape(solution), commit, digest[:8],
+                              f'[{style}]{passed}/{total}[/]',
+                              f'{seconds:.3f} s')
+            times = [row[7] for row in rows]
+        console.print(table)
+        console.print(f"Trend: {sparkline(times)}  best {min(times):.3f} s, "
+                      f"latest {times[-1]:.3f} s", style='bold blue')
+
+
+# Default history for module-level compatibility
+_history = RunHistory()
+
+
+def record(problemid: str, solution: str, loc_language: str,
+           files: List[str], results: List[CaseResult]) -> int:
+    """Module-level wrapper delegating to :class:`RunHistory`."""
+
+    return _history.record(problemid, solution, loc_language, files, results)
+
+
+def check_budget(problem_root_folder: str, problemid: str, solution: str,
+                 results: List[CaseResult], run_id: int) -> Dict[str, str]:
+    """Module-level wrapper delegating to :class:`RunHistory`."""
+
+    return _history.check_budget(problem_root_folder, problemid, solution,
+                                 results, run_id)
+
+
+def show(problemid: str, case: str = '', limit: int = 20) -> None:
+    """Module-level wrapper delegating to :class:`RunHistory`."""
+
+    return _history.show(problemid, case, limit)
@@ -0,0 +1,266 @@
+"""Flag slow coding patterns in solutions before running them.
+
+Most time limits exceeded by otherwise correct solutions come from a few
+known patterns: unbuffered or synchronized I/O, flushing output on every
+line and building strings by repeated concatenation. Every language has
+a set of line-based rules, some of which only apply inside loops; a loop
+is tracked by indentation for Python and by braces for the C family.
+"""
+
+from typing import Dict, List, Optional, Pattern, Tuple
+import os
+import re
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+from kattis_cli.utils import languages
+
+# rule: id, pattern, only inside loops, impact, advice
+Rule = Tuple[str, Pattern[str], bool, str, str]
+# finding: file, line number, rule id, impact, advice
+Finding = Tuple[str, int, str, str, str]
+
+HIGH = 'high: up to ~10× on I/O-heavy cases'
+MEDIUM = 'medium: quadratic on long inputs'
+
+PYTHON_RULES: List[Rule] = [
+    ('input-in-loop', re.compile(r'\binput\s*\('), True, HIGH,
+     'read everything at once: sys.stdin.buffer.read().split()'),
+    ('print-in-loop', re.compile(r'\bprint\s*\('), True, HIGH,
+     "collect the lines and print('\\n'.join(lines)) once"),
+    ('str-concat-in-loop',
+     re.compile(r'\b\w+\s*\+=\s*(str\(|f?["\'])'), True, MEDIUM,
+     "append to a list and ''.join() it"),
+    ('pop-front', re.compile(r'\.pop\(\s*0\s*\)'), False, MEDIUM,
+     'use collections.deque and popleft()'),
+    ('insert-front', re.compile(r'\.insert\(\s*0\s*,'), False, MEDIUM,
+     'use collections.deque and appendleft()'),
+]
+
+C_RULES: List[Rule] = [
+    ('strlen-in-condition',
+     re.compile(r'\bfor\s*\([^;]*;[^;]*\bstrlen\s*\('), False, MEDIUM,
+     'compute strlen() once before the loop'),
+]
+
+CPP_RULES: List[Rule] = C_RULES + [
+    ('endl-in-loop', re.compile(r'\bendl\b'), True, HIGH,
+     "use '\\n'; endl flushes the output every time"),
+    ('string-concat-in-loop', re.compile(r'\b(\w+)\s*=\s*\1\s*\+'), True,
+     MEDIUM, 'use += or append(), which do not copy the string'),
+    ('container-by-value',
+     re.compile(r'[(,]\s*(?:std::)?(?:vector|string|map|set)\b[^(),]*?'
+                r'[\s>]\w+\s*(?=[,)]\s*(?:const\s*)?\{?\s*$)'),
+     False, MEDIUM, 'pass containers by (const) reference'),
+]
+
+JAVA_RULES: List[Rule] = [
+    ('scanner', re.compile(r'\bnew\s+Scanner\s*\('), False, HIGH,
+     'read with BufferedReader or DataInputStream'),
+    ('println-in-loop', re.compile(r'\bSystem\.out\.print(ln|f)?\s*\('),
+     True, HIGH, 'append to a StringBuilder or use a buffered PrintWriter'),
+    ('string-concat-in-loop', re.compile(r'\b\w+\s*\+=\s*"'), True, MEDIUM,
+     'use a StringBuilder'),
+]
+
+KOTLIN_RULES: List[Rule] = [
+    ('scanner', re.compile(r'\bScanner\s*\('), False, HIGH,
+     'read with System.`in`.bufferedReader()'),
+    ('readline-in-loop', re.compile(r'\breadl(ine|n)\s*\(', re.IGNORECASE),
+     True, MEDIUM, 'read everything with System.`in`.bufferedReader()'),
+    ('println-in-loop', re.compile(r'\bprintln\s*\('), True, HIGH,
+     'append to a StringBuilder and print it once'),
+]
+
+NODE_RULES: List[Rule] = [
+    ('console-log-in-loop', re.compile(r'\bconsole\.log\s*\('), True, HIGH,
+     "collect the lines and write lines.join('\\n') once"),
+    ('readline-module', re.compile(r'''require\(\s*['"]readline['"]'''),
+     False, MEDIUM, "read stdin at once: fs.readFileSync(0, 'utf8')"),
+]
+
+RULES: Dict[str, List[Rule]] = {
+    'python3': PYTHON_RULES,
+    'c': C_RULES,
+    'cpp': CPP_RULES,
+    'java': JAVA_RULES,
+    'kotlin': KOTLIN_RULES,
+    'nodejs': NODE_RULES,
+}
+
+_PYTHON_LOOP = re.compile(r'^\s*(async\s+)?(for|while)\b.*:\s*(#.*)?$')
+_BRACE_LOOP = re.compile(r'\b(for|while)\s*\(|\bdo\s*(\{|$)')
+_CIN = re.compile(r'\bcin\s*>>|\bcout\s*<<')
+_SYNC = re.compile(r'sync_with_stdio\s*\(\s*(false|0)\s*\)')
+
+
+def python_loop_lines(lines: List[str]) -> List[bool]:
+    """Return whether every line is inside a loop, by indentation."""
+    in_loop = []
+    loops: List[int] = []
+    for line in lines:
+        if line.strip() and not line.lstrip().startswith('#'):
+            indent = len(line) - len(line.lstrip())
+            while loops and indent <= loops[-1]:
+                loops.pop()
+            in_loop.append(bool(loops))
+            if _PYTHON_LOOP.match(line):
+                loops.append(indent)
+        else:
+            in_loop.append(False)
+    return in_loop
+
+
+def _after_header(code: str, start: int) -> str:
+    """Return the code after the parenthesized loop condition."""
+    depth = 0
+    for index in range(start, len(code)):
+        if code[index] == '(':
+            depth += 1
+        elif code[index] == ')':
+            depth -= 1
+            if depth == 0:
+                return code[index + 1:]
+    return ''
+
+
+def brace_loop_lines(lines: List[str]) -> List[bool]:
+    """Return whether every line is inside a loop, by braces.
+
+    A loop header's own line counts as inside the loop, which covers
+    single-statement bodies on the same line; a body without braces on
+    a later line ends at its first semicolon.
+    """
+    in_loop = []
+    depth = 0
+    loops: List[int] = []
+    awaiting = False
+    for line in lines:
+        code = line.split('//', 1)[0]
+        header = _BRACE_LOOP.search(code)
+        in_loop.append(bool(loops) or bool(header) or awaiting)
+        rest = code
+        if header:
+            awaiting = True
+            if header.group(1):
+                rest = _after_header(code, header.start())
+        for char in code:
+            if char == '{':
+                depth += 1
+                if awaiting:
+                    loops.append(depth)
+                    awaiting = False
+            elif char == '}':
+                if loops and loops[-1] == depth:
+                    loops.pop()
+                depth -= 1
+        if awaiting and ';' in rest:
+            # a single statement was the body
+            awaiting = False
+    return in_loop
+
+
+class Linter:
+    """Scans solution files for slow patterns of their language."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def lint_file(self, file: str, loc_language: str) -> List[Finding]:
+        """Return the findings of one file, in line order."""
+        rules = RULES.get(loc_language, [])
+        if not rules:
+            return []
+        with open(file, 'r', encoding='utf-8', errors='ignore') as f:
+            lines = f.read().splitlines()
+        if loc_language == 'python3':
+            in_loop = python_loop_lines(lines)
+        else:
+            in_loop = brace_loop_lines(lines)
+        findings = []
+        for number, line in enumerate(lines, 1):
+            stripped = line.strip()
+            if stripped.startswith(('#', '//', '/*', '*')):
+                continue
+            for rule_id, pattern, loop_only, impact, advice in rules:
+                if (in_loop[number - 1] or not loop_only) and \
+                        pattern.search(line):
+                    findings.append((file, number, rule_id, impact, advice))
+        if loc_language == 'cpp':
+            findings += self.sync_findings(file, lines)
+        return sorted(findings, key=lambda finding: finding[1])
+
+    def sync_findings(self, file: str, lines: List[str]) -> List[Finding]:
+        """Flag iostreams used without sync_with_stdio(false)."""
+        text = '\n'.join(lines)
+        if _SYNC.search(text):
+            return []
+        for number, line in enumerate(lines, 1):
+            if _CIN.search(line):
+                return [(file, number, 'iostream-sync', HIGH,
+                         'call ios::sync_with_stdio(false); cin.tie(nullptr);'
+                         ' at the start of main')]
+        return []
+
+    def lint(self, files: List[str], loc_language: str,
+             mainfile: str = '') -> List[Finding]:
+        """Lint the files of a solution and print the findings.
+
+        Args:
+            files (List[str]): solution files
+            loc_language (str): language of the files
+            mainfile (str): main file, reported first
+
+        Returns:
+            List[Finding]: findings of every file
+        """
+        console = self.console
+        if loc_language not in RULES:
+            console.print(f"No lint rules for {loc_language}.",
+                          style='bold yellow')
+            return []
+        main = os.path.basename(mainfile)
+        ordered = sorted(files, key=lambda f: os.path.basename(f) != main)
+        findings = []
+        for file in ordered:
+            findings += self.lint_file(file, loc_language)
+        self.print_findings(findings)
+        return findings
+
+    def print_findings(self, findings: List[Finding]) -> None:
+        """Print the findings with their location and advice."""
+        console = self.console
+        if not findings:
+            console.print("No slow patterns found.", style='bold green')
+            return
+        table = Table(title="[not italic bold blue]🐢 Slow patterns[/]",
+                      header_style="bold blue")
+        table.box = box.SQUARE
+        table.add_column("Location", justify="left", style="cyan")
+        table.add_column("Rule", justify="left")
+        table.add_column("Impact", justify="left")
+        table.add_column("Advice", justify="left")
+        for file, number, rule_id, impact, advice in findings:
+            style = 'bold red' if impact == HIGH else 'yellow'
+            table.add_row(f'{escape(os.path.basename(file))}:{number}',
+                          rule_id, f'[{style}]{impact}[/]', escape(advice))
+        console.print(table)
+
+
+# Default linter for module-level compatibility
+_linter = Linter()
+
+
+def lint(files: List[str], loc_language: str,
+         mainfile: str = '') -> List[Finding]:
+    """Module-level wrapper delegating to :class:`Linter`."""
+
+    return _linter.lint(files, loc_language, mainfile)
+
+
+def language_files(files: List[str], loc_language: str) -> List[str]:
+    """Return the files written in the language."""
+    return [file for file in files if languages.guess_language(
+        os.path.splitext(file)[1], files) == loc_language]
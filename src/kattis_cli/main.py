@@ -4,10 +4,12 @@ Change the __version__ to match in pyproject.toml
 """
 __version__ = '1.2.7'
 
+from contextlib import nullcontext
 from math import inf
 import os
+from pathlib import Path
 from urllib.parse import urlparse
-from typing import Tuple
+from typing import Optional, Tuple
 from rich.console import Console
 import click
 import requests
@@ -17,8 +19,26 @@ import kattis_cli.ui as ui
 import kattis_cli.solution_tester as solution_tester
 import kattis_cli.kattis as kattis
 import kattis_cli.utils.languages as languages
+import kattis_cli.utils.pyruntime as pyruntime
+import kattis_cli.utils.workspace as workspace
 import kattis_cli.kattis_setup as kattis_setup
 import kattis_cli.template as template
+import kattis_cli.profiler as profiler
+import kattis_cli.complexity as complexity
+import kattis_cli.stress as stress
+import kattis_cli.shrink as shrink
+import kattis_cli.answers as answers
+import kattis_cli.generator as generator
+import kattis_cli.compress as compress
+import kattis_cli.compare as compare
+import kattis_cli.tune as tune
+import kattis_cli.spawn_bench as spawn_bench
+import kattis_cli.lint as linter
+import kattis_cli.runner as runner
+import kattis_cli.snapshot as snapshots
+import kattis_cli.history as history
+import kattis_cli.repo_tester as repo_tester
+from kattis_cli.utils import cases, utility
 
 
 @tui()
@@ -85,12 +105,30 @@ def info(problemid: str) -> None:
 @click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
 @click.option('-a', '--accuracy', default=inf,
               help='Decimal places for float comparison')
+@click.option('--sanitize', 'variant', flag_value='sanitize',
+              help='Run a cached AddressSanitizer/UBSan build (C/C++)')
+@click.option('--debug', 'variant', flag_value='debug',
+              help='Run a cached debug-mode STL build (C/C++)')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs for --sanitize/--debug/--runtime')
+@click.option('--runtime', default=None,
+              type=click.Choice(list(pyruntime.RUNTIMES)),
+              help='Python runtime; pypy also compares it with CPython')
+@click.option('--tmpfs', is_flag=True, default=False,
+              help='Build and read the data in a workspace in memory')
+@click.option('--budget', is_flag=True, default=False,
+              help='Fail when a case regressed beyond the budget')
 @click.argument('files', nargs=-1, required=False)
 def test(
         problemid: str,
         language: str,
         mainclass: str,
         accuracy: float,
+        variant: Optional[str],
+        jobs: int,
+        runtime: Optional[str],
+        tmpfs: bool,
+        budget: bool,
         files: Tuple[str]) -> None:
     """Test solution with sample files.
     """
@@ -102,15 +140,598 @@ def test(
     if not mainclass:
         mainclass = languages.guess_mainfile(
             language, _files, problemid, lang_config)
+    if runtime:
+        console = Console()
+        if pyruntime.interpreter(lang_config) is None:
+            console.print("--runtime needs a Python solution.",
+                          style='bold red')
+            exit(1)
+        if not pyruntime.find_runtime(runtime):
+            console.print(f"{pyruntime.RUNTIMES[runtime]} not found on "
+                          "PATH.", style='bold red')
+            exit(1)
+        if runtime != 'cpython':
+            compare.compare_runtimes(root_folder, _files, mainclass,
+                                     lang_config, ['cpython', runtime],
+                                     jobs, accuracy=accuracy)
+        lang_config = pyruntime.with_runtime(lang_config, runtime)
 
-    solution_tester.test_samples(
-        problemid,
+    with workspace.workspace(str(root_folder)) if tmpfs \
+            else nullcontext((str(root_folder), None)) as (problem_folder,
+                                                           cache):
+        solution_tester.test_samples(
+            problemid,
+            loc_language,
+            mainclass,
+            problem_folder,
+            _files,
+            lang_config,
+            accuracy,
+            variant or 'release',
+            jobs,
+            budget,
+            cache)
+
+
+@main.command(help='Run solution once on a custom input.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.option('-i', '--input', 'case', default='-',
+              help='Input file or test case; - reads the terminal')
+@click.argument('files', nargs=-1, required=False)
+def run(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        case: str,
+        files: Tuple[str]) -> None:
+    """Run solution once on a custom input.
+    """
+    problemid, _, mainclass, _files, root_folder, lang_config = \
+        languages.update_args(problemid, language, mainclass, list(files))
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            language, _files, problemid, lang_config)
+    code = runner.run(mainclass, str(root_folder), _files, lang_config, case)
+    # programs killed by a signal exit like they would in a shell
+    exit(code if code >= 0 else 128 - code)
+
+
+@main.command('test-all', help='Test every problem below a folder.')
+@click.option('-t', '--timeout', default=10.0,
+              help='Seconds after which a run is killed')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+@click.option('-a', '--accuracy', default=inf,
+              help='Decimal places for float comparison')
+@click.option('--cache/--no-cache', default=True,
+              help='Skip problems that passed and did not change')
+@click.option('--changed-since', default='', metavar='REF',
+              help='Only test problems with files changed since a git ref')
+@click.argument('path', default='.')
+def test_all_cmd(
+        timeout: float,
+        jobs: int,
+        accuracy: float,
+        cache: bool,
+        changed_since: str,
+        path: str) -> None:
+    """Test every problem below a folder.
+    """
+    results = repo_tester.test_all(path, jobs, timeout, accuracy, cache,
+                                   changed_since=changed_since)
+    if any(result['status'] in ('fail', 'error')
+           for result in results.values()):
+        exit(1)
+
+
+@main.command('history', help='Show the trend of recorded test runs.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-n', '--limit', default=20, help='Number of latest runs')
+@click.argument('case', default='')
+def history_cmd(problemid: str, limit: int, case: str) -> None:
+    """Show the trend of recorded test runs.
+    """
+    console = Console()
+    filename = f'{problemid}.yaml' if problemid else '*.yaml'
+    try:
+        root_folder = utility.find_problem_root_folder(Path.cwd(), filename)
+    except FileNotFoundError as ex:
+        console.print(str(ex), style='bold red')
+        exit(1)
+    history.show(problemid or root_folder.name,
+                 cases.case_name(case) if case else '', limit)
+
+
+@main.command('lint', help='Flag slow coding patterns in a solution.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.argument('files', nargs=-1, required=False)
+def lint_cmd(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        files: Tuple[str]) -> None:
+    """Flag slow coding patterns in a solution.
+    """
+    given = bool(mainclass)
+    problemid, loc_language, mainclass, _files, _, lang_config = \
+        languages.update_args(problemid, language, mainclass, list(files))
+    if given:
+        mainfile = languages.find_main_source(_files, mainclass)
+    else:
+        mainfile = languages.guess_mainfile(
+            languages.LOCAL_TO_KATTIS[loc_language], _files, problemid,
+            lang_config)
+    findings = linter.lint(linter.language_files(_files, loc_language),
+                           loc_language, mainfile)
+    if findings:
+        exit(1)
+
+
+@main.command(help='Profile solution on a single test case.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.option('-n', '--top', default=15, help='Number of hot functions')
+@click.option('-o', '--output', default='',
+              help='Collapsed-stack output file')
+@click.option('-s', '--sampling', is_flag=True, default=False,
+              help='Use py-spy sampling profiler for Python')
+@click.argument('case')
+@click.argument('files', nargs=-1, required=False)
+def profile(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        top: int,
+        output: str,
+        sampling: bool,
+        case: str,
+        files: Tuple[str]) -> None:
+    """Profile solution on a single test case.
+    """
+    problemid, loc_language, mainclass, _files, root_folder, lang_config =\
+        languages.update_args(
+            problemid, language, mainclass, list(files))
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            language, _files, problemid, lang_config)
+
+    profiler.profile(
         loc_language,
         mainclass,
-        root_folder,
+        str(root_folder),
+        _files,
+        lang_config,
+        case,
+        top,
+        output,
+        sampling)
+
+
+@main.command('complexity',
+              help='Estimate time complexity from generated inputs.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.option('-g', '--gen', 'generator', required=True,
+              help='Input generator taking arguments: n seed')
+@click.option('--min-n', default=1000, type=click.IntRange(min=1),
+              help='Smallest input size')
+@click.option('--factor', default=2.0, help='Growth factor between sizes')
+@click.option('--steps', default=6, help='Number of input sizes')
+@click.option('--max-n', default=0,
+              help='Maximum input size to predict '
+              '(default: from the problem constraints)')
+@click.option('--size-var', default='n',
+              help='Constraint variable of the input size')
+@click.option('-r', '--repeat', default=3, help='Runs per input size')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+@click.argument('files', nargs=-1, required=False)
+def complexity_cmd(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        generator: str,
+        min_n: int,
+        factor: float,
+        steps: int,
+        max_n: int,
+        size_var: str,
+        repeat: int,
+        jobs: int,
+        files: Tuple[str]) -> None:
+    """Estimate time complexity from generated inputs.
+    """
+    problemid, _, mainclass, _files, root_folder, lang_config =\
+        languages.update_args(
+            problemid, language, mainclass, list(files))
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            language, _files, problemid, lang_config)
+
+    complexity.estimate(
+        problemid,
+        mainclass,
+        str(root_folder),
         _files,
         lang_config,
+        generator,
+        complexity.geometric_sizes(min_n, factor, steps),
+        max_n,
+        repeat,
+        jobs,
+        size_var)
+
+
+@main.command('stress',
+              help='Stress test solution against a reference solution.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.option('-g', '--gen', 'generator', required=True,
+              help='Input generator taking argument: seed')
+@click.option('-r', '--ref', 'reference', required=True,
+              help='Trusted (brute-force) reference solution')
+@click.option('-t', '--time', 'seconds', default=60.0,
+              help='Time budget in seconds (0: no limit)')
+@click.option('-n', '--iterations', default=0,
+              help='Number of seeds to try (0: no limit)')
+@click.option('-s', '--seed', default=1, help='First seed')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+@click.option('-a', '--accuracy', default=inf,
+              help='Decimal places for float comparison')
+@click.argument('files', nargs=-1, required=False)
+def stress_cmd(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        generator: str,
+        reference: str,
+        seconds: float,
+        iterations: int,
+        seed: int,
+        jobs: int,
+        accuracy: float,
+        files: Tuple[str]) -> None:
+    """Stress test solution against a reference solution.
+    """
+    problemid, _, mainclass, _files, root_folder, lang_config =\
+        languages.update_args(
+            problemid, language, mainclass, list(files))
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            language, _files, problemid, lang_config)
+
+    failure = stress.stress(
+        mainclass,
+        str(root_folder),
+        _files,
+        lang_config,
+        generator,
+        reference,
+        seconds,
+        iterations,
+        seed,
+        jobs,
         accuracy)
+    if failure:
+        exit(1)
+
+
+@main.command('shrink', help='Shrink a failing test case input.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.option('-r', '--ref', 'reference', default='',
+              help='Reference solution (default: shrink crashes only)')
+@click.option('-o', '--output', default='', help='Shrunk input file')
+@click.option('-t', '--timeout', default=10.0,
+              help='Seconds before a run counts as failing')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+@click.option('-a', '--accuracy', default=inf,
+              help='Decimal places for float comparison')
+@click.argument('case')
+@click.argument('files', nargs=-1, required=False)
+def shrink_cmd(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        reference: str,
+        output: str,
+        timeout: float,
+        jobs: int,
+        accuracy: float,
+        case: str,
+        files: Tuple[str]) -> None:
+    """Shrink a failing test case input.
+    """
+    problemid, _, mainclass, _files, root_folder, lang_config =\
+        languages.update_args(
+            problemid, language, mainclass, list(files))
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            language, _files, problemid, lang_config)
+
+    shrink.shrink(
+        mainclass,
+        str(root_folder),
+        _files,
+        lang_config,
+        case,
+        reference,
+        output,
+        timeout,
+        jobs,
+        accuracy)
+
+
+@main.command('gen-answers',
+              help='Generate missing answers with a reference solution.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-r', '--ref', 'reference', required=True,
+              help='Trusted reference solution')
+@click.option('-f', '--force', is_flag=True, default=False,
+              help='Regenerate all answers')
+@click.option('-t', '--timeout', default=0.0,
+              help='Seconds per input (0: no limit)')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+def gen_answers_cmd(
+        problemid: str,
+        reference: str,
+        force: bool,
+        timeout: float,
+        jobs: int) -> None:
+    """Generate missing answers with a reference solution.
+    """
+    filename = f'{problemid}.yaml' if problemid else '*.yaml'
+    try:
+        root_folder = utility.find_problem_root_folder(Path.cwd(), filename)
+    except FileNotFoundError as ex:
+        Console().print(str(ex), style='bold red')
+        exit(1)
+
+    answers.generate_answers(
+        str(root_folder),
+        reference,
+        jobs,
+        force,
+        timeout or None)
+
+
+@main.command('gen', help='Generate test inputs from a YAML spec.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('--spec', required=True, help='Declarative input spec (YAML)')
+@click.option('-s', '--seed', type=int, default=None,
+              help='First seed (default: seed in the spec)')
+@click.option('-n', '--count', default=1, help='Number of inputs')
+@click.option('-f', '--force', is_flag=True, default=False,
+              help='Regenerate cached inputs')
+def gen_cmd(
+        problemid: str,
+        spec: str,
+        seed: Optional[int],
+        count: int,
+        force: bool) -> None:
+    """Generate test inputs from a YAML spec.
+    """
+    filename = f'{problemid}.yaml' if problemid else '*.yaml'
+    try:
+        root_folder = utility.find_problem_root_folder(Path.cwd(), filename)
+    except FileNotFoundError as ex:
+        Console().print(str(ex), style='bold red')
+        exit(1)
+
+    generator.generate(str(root_folder), spec, seed, count, force,
+                       problemid)
+
+
+@main.command('compare', help='Compare solutions head to head.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-t', '--timeout', default=10.0,
+              help='Seconds after which a run is killed')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+@click.option('-a', '--accuracy', default=inf,
+              help='Decimal places for float comparison')
+@click.option('--tmpfs', is_flag=True, default=False,
+              help='Build and read the data in a workspace in memory')
+@click.argument('solutions', nargs=-1, required=True)
+def compare_cmd(
+        problemid: str,
+        timeout: float,
+        jobs: int,
+        accuracy: float,
+        tmpfs: bool,
+        solutions: Tuple[str]) -> None:
+    """Compare solutions head to head.
+    """
+    console = Console()
+    if len(solutions) < 2:
+        console.print("Give at least two solutions to compare.",
+                      style='bold red')
+        exit(1)
+    filename = f'{problemid}.yaml' if problemid else '*.yaml'
+    try:
+        root_folder = utility.find_problem_root_folder(Path.cwd(), filename)
+    except FileNotFoundError as ex:
+        console.print(str(ex), style='bold red')
+        exit(1)
+
+    with workspace.workspace(str(root_folder)) if tmpfs \
+            else nullcontext((str(root_folder), None)) as (problem_folder,
+                                                           cache):
+        compare.compare(problem_folder, list(solutions), jobs, timeout,
+                        accuracy, cache)
+
+
+@main.group(help='Record output digests and check optimized versions.')
+def snapshot() -> None:
+    """Record output digests and check optimized versions.
+    """
+
+
+@snapshot.command('record', help='Record the output digest of every input.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.option('-s', '--snapshot', 'snapshot_file', default='',
+              help='Snapshot file (default: snapshot.json)')
+@click.option('-t', '--timeout', default=60.0,
+              help='Seconds after which a run is killed')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+@click.argument('files', nargs=-1, required=False)
+def snapshot_record(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        snapshot_file: str,
+        timeout: float,
+        jobs: int,
+        files: Tuple[str]) -> None:
+    """Record the output digest of every input.
+    """
+    problemid, _, mainclass, _files, root_folder, lang_config = \
+        languages.update_args(problemid, language, mainclass, list(files))
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            language, _files, problemid, lang_config)
+    snapshots.record(str(root_folder), _files, mainclass, lang_config,
+                     snapshot_file, jobs, timeout)
+
+
+@snapshot.command('check', help='Rerun and report outputs that changed.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.option('-s', '--snapshot', 'snapshot_file', default='',
+              help='Snapshot file (default: snapshot.json)')
+@click.option('-t', '--timeout', default=60.0,
+              help='Seconds after which a run is killed')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+@click.argument('files', nargs=-1, required=False)
+def snapshot_check(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        snapshot_file: str,
+        timeout: float,
+        jobs: int,
+        files: Tuple[str]) -> None:
+    """Rerun and report outputs that changed.
+    """
+    problemid, _, mainclass, _files, root_folder, lang_config = \
+        languages.update_args(problemid, language, mainclass, list(files))
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            language, _files, problemid, lang_config)
+    if snapshots.check(str(root_folder), _files, mainclass, lang_config,
+                       snapshot_file, jobs, timeout):
+        exit(1)
+
+
+@main.command('spawn-bench',
+              help='Measure the per-case overhead of spawning programs '
+              '(e.g., kattis spawn-bench -- python3 -c pass).')
+@click.option('-n', '--runs', default=500, help='Runs of each runner')
+@click.argument('command', nargs=-1, required=False)
+def spawn_bench_cmd(runs: int, command: Tuple[str]) -> None:
+    """Measure the per-case overhead of spawning programs.
+    """
+    spawn_bench.spawn_bench(list(command) or ['true'], runs)
+
+
+@main.command('tune-flags',
+              help='Benchmark C/C++ compiler flag variants.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('-l', '--language', default='', help='Sets language')
+@click.option('-m', '--mainclass', default='', help='Sets mainclass/mainfile')
+@click.option('-f', '--flags', 'matrix', multiple=True,
+              help='Flag variant to build, e.g. "-O3 -march=native" '
+              '(repeatable; default: a built-in matrix)')
+@click.option('--pgo/--no-pgo', default=True,
+              help='Also build with profile guided optimization')
+@click.option('-c', '--cases', 'count', default=3,
+              help='Number of heaviest cases to benchmark')
+@click.option('-r', '--repeat', default=3, help='Runs per case')
+@click.option('-t', '--timeout', default=10.0,
+              help='Seconds after which a run is killed')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel builds (default: number of cores)')
+@click.option('-a', '--accuracy', default=inf,
+              help='Decimal places for float comparison')
+@click.argument('files', nargs=-1, required=False)
+def tune_flags_cmd(
+        problemid: str,
+        language: str,
+        mainclass: str,
+        matrix: Tuple[str],
+        pgo: bool,
+        count: int,
+        repeat: int,
+        timeout: float,
+        jobs: int,
+        accuracy: float,
+        files: Tuple[str]) -> None:
+    """Benchmark C/C++ compiler flag variants.
+    """
+    problemid, _, mainclass, _files, root_folder, lang_config =\
+        languages.update_args(
+            problemid, language, mainclass, list(files))
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            language, _files, problemid, lang_config)
+
+    tune.tune(
+        mainclass,
+        str(root_folder),
+        _files,
+        lang_config,
+        list(matrix) or None,
+        pgo,
+        count,
+        repeat,
+        jobs,
+        timeout,
+        accuracy)
+
+
+@main.command('compress-data', help='Compress large test data files.')
+@click.option('-p', '--problemid', default='', help='Problem ID')
+@click.option('--format', 'fmt', default='gz',
+              type=click.Choice(list(compress.FORMATS)),
+              help='Compression format')
+@click.option('--min-size', default=1 << 20,
+              help='Compress files of at least this many bytes')
+@click.option('-k', '--keep', is_flag=True, default=False,
+              help='Keep the uncompressed files')
+@click.option('-j', '--jobs', default=0,
+              help='Parallel jobs (default: number of cores)')
+def compress_data_cmd(
+        problemid: str,
+        fmt: str,
+        min_size: int,
+        keep: bool,
+        jobs: int) -> None:
+    """Compress large test data files.
+    """
+    filename = f'{problemid}.yaml' if problemid else '*.yaml'
+    try:
+        root_folder = utility.find_problem_root_folder(Path.cwd(), filename)
+    except FileNotFoundError as ex:
+        Console().print(str(ex), style='bold red')
+        exit(1)
+
+    compress.compress_data(str(root_folder), fmt, min_size, keep, jobs)
 
 
 @main.command(help='Submit a solution to Kattis.')
@@ -0,0 +1,359 @@
+"""Profile a solution on a single test case.
+
+Python solutions are profiled with cProfile (or the py-spy sampling
+profiler), C/C++ solutions with ``perf record`` and Java solutions with a
+Java Flight Recorder (JFR) recording. The samples of every profiler are
+folded into collapsed stacks (``frame;frame;frame count``) which can be
+fed to flamegraph tools, and the hottest functions are printed. The
+solution is built through the build cache and profiled from its build
+folder.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import pstats
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, cases, languages, run_program
+
+PYTHON_LANGUAGES = {'python3'}
+NATIVE_LANGUAGES = {'c', 'cpp', 'c++'}
+JVM_LANGUAGES = {'java', 'kotlin', 'scala'}
+
+
+def collapse_perf_script(text: str) -> Dict[str, int]:
+    """Fold the output of ``perf script`` into collapsed stacks.
+
+    Args:
+        text (str): output of perf script for a recording made with -g
+
+    Returns:
+        Dict[str, int]: collapsed stack -> number of samples
+    """
+    stacks: Dict[str, int] = {}
+    frames: List[str] = []
+    for line in text.splitlines() + ['']:
+        if not line.strip():
+            if frames:
+                stack = ';'.join(reversed(frames))
+                stacks[stack] = stacks.get(stack, 0) + 1
+            frames = []
+        elif line[0].isspace():
+            # frame lines look like: "  401136 main+0x26 (/path/a.out)"
+            parts = line.split(maxsplit=1)
+            symbol = parts[-1].rsplit(' (', 1)[0]
+            frames.append(re.sub(r'\+0x[0-9a-fA-F]+$', '', symbol))
+    return stacks
+
+
+def collapse_jfr_samples(text: str) -> Dict[str, int]:
+    """Fold ``jfr print --events jdk.ExecutionSample`` output.
+
+    Args:
+        text (str): printed JFR execution samples
+
+    Returns:
+        Dict[str, int]: collapsed stack -> number of samples
+    """
+    stacks: Dict[str, int] = {}
+    frames: Optional[List[str]] = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('stackTrace = ['):
+            frames = []
+        elif frames is not None:
+            if stripped == ']':
+                if frames:
+                    stack = ';'.join(reversed(frames))
+                    stacks[stack] = stacks.get(stack, 0) + 1
+                frames = None
+            elif stripped and stripped != '...':
+                frames.append(re.sub(r'\s+line:.*$', '', stripped))
+    return stacks
+
+
+def collapse_pstats(stats: pstats.Stats) -> Dict[str, int]:
+    """Fold cProfile statistics into two-level collapsed stacks.
+
+    cProfile only records caller/callee pairs, so every stack is a
+    ``caller;callee`` edge weighted by the callee's own time (in
+    microseconds) spent on behalf of that caller.
+
+    Args:
+        stats (pstats.Stats): loaded profile statistics
+
+    Returns:
+        Dict[str, int]: collapsed stack -> microseconds
+    """
+
+    def _name(func: Tuple[str, int, str]) -> str:
+        filename, line, funcname = func
+        if filename == '~':
+            return funcname
+        return f'{funcname} ({os.path.basename(filename)}:{line})'
+
+    stacks: Dict[str, int] = {}
+    raw_stats: Dict[Any, Any] = getattr(stats, 'stats')
+    for func, (_, _, tottime, _, callers) in raw_stats.items():
+        edges = [(f'{_name(caller)};{_name(func)}', edge[2])
+                 for caller, edge in callers.items()]
+        if not edges:
+            edges = [(_name(func), tottime)]
+        for stack, seconds in edges:
+            weight = int(seconds * 1_000_000)
+            if weight > 0:
+                stacks[stack] = stacks.get(stack, 0) + weight
+    return stacks
+
+
+def parse_collapsed(text: str) -> Dict[str, int]:
+    """Parse collapsed stacks in the ``stack count`` line format.
+
+    Args:
+        text (str): collapsed stacks, one per line
+
+    Returns:
+        Dict[str, int]: collapsed stack -> count
+    """
+    stacks: Dict[str, int] = {}
+    for line in text.splitlines():
+        stack, _, count = line.rstrip().rpartition(' ')
+        if stack and count.isdigit():
+            stacks[stack] = stacks.get(stack, 0) + int(count)
+    return stacks
+
+
+def write_collapsed(stacks: Dict[str, int], output: Path) -> None:
+    """Write collapsed stacks to a file for flamegraph tools.
+
+    Args:
+        stacks (Dict[str, int]): collapsed stack -> count
+        output (Path): destination file
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f'{stack} {count}\n')
+
+
+def top_functions(stacks: Dict[str, int],
+                  top: int = 15) -> List[Tuple[str, float, float]]:
+    """Rank functions by their self time.
+
+    Args:
+        stacks (Dict[str, int]): collapsed stack -> count
+        top (int): number of functions to return
+
+    Returns:
+        List[Tuple[str, float, float]]: function, self %, total %
+    """
+    total = sum(stacks.values())
+    if not total:
+        return []
+    self_count: Dict[str, int] = {}
+    total_count: Dict[str, int] = {}
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        self_count[frames[-1]] = self_count.get(frames[-1], 0) + count
+        for frame in set(frames):
+            total_count[frame] = total_count.get(frame, 0) + count
+    ranked = sorted(self_count.items(), key=lambda item: -item[1])[:top]
+    return [(name, 100 * count / total, 100 * total_count[name] / total)
+            for name, count in ranked]
+
+
+class SolutionProfiler:
+    """Reruns one test case of a solution under a language's profiler."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def select_profiler(self, loc_language: str,
+                        run_command: List[str],
+                        sampling: bool = False) -> str:
+        """Select the profiler for the language of the solution.
+
+        Args:
+            loc_language (str): local language name
+            run_command (List[str]): command that runs the solution
+            sampling (bool): prefer a sampling profiler for Python
+
+        Returns:
+            str: one of cprofile, py-spy, perf or jfr
+        """
+        if loc_language in PYTHON_LANGUAGES:
+            if sampling:
+                if not shutil.which('py-spy'):
+                    raise ValueError('py-spy is not installed.')
+                return 'py-spy'
+            return 'cprofile'
+        if loc_language in NATIVE_LANGUAGES:
+            if not shutil.which('perf'):
+                raise ValueError('perf is not installed.')
+            return 'perf'
+        if loc_language in JVM_LANGUAGES and \
+                os.path.basename(run_command[0]) == 'java':
+            if not shutil.which('jfr'):
+                raise ValueError('jfr is not installed.')
+            return 'jfr'
+        raise ValueError(f'Profiling {loc_language} is not supported.')
+
+    def build_profile_command(self, profiler: str,
+                              run_command: List[str],
+                              raw_file: str) -> List[str]:
+        """Wrap the run command with the given profiler.
+
+        Args:
+            profiler (str): profiler selected by select_profiler
+            run_command (List[str]): command that runs the solution
+            raw_file (str): file where the profiler writes its data
+
+        Returns:
+            List[str]: the profiling command
+        """
+        if profiler == 'cprofile':
+            return [run_command[0], '-m', 'cProfile', '-o', raw_file] + \
+                run_command[1:]
+        if profiler == 'py-spy':
+            return ['py-spy', 'record', '--format', 'raw', '--rate', '1000',
+                    '-o', raw_file, '--'] + run_command
+        if profiler == 'perf':
+            return ['perf', 'record', '-g', '-o', raw_file, '--'] + \
+                run_command
+        if profiler == 'jfr':
+            recording = f'-XX:StartFlightRecording=filename={raw_file},' \
+                'settings=profile'
+            return [run_command[0], recording] + run_command[1:]
+        raise ValueError(f'Unknown profiler: {profiler}')
+
+    def collect(self, profiler: str, raw_file: str) -> Dict[str, int]:
+        """Read the data recorded by the profiler as collapsed stacks.
+
+        Args:
+            profiler (str): profiler selected by select_profiler
+            raw_file (str): file where the profiler wrote its data
+
+        Returns:
+            Dict[str, int]: collapsed stack -> count
+        """
+        if profiler == 'cprofile':
+            return collapse_pstats(pstats.Stats(raw_file))
+        if profiler == 'py-spy':
+            with open(raw_file, 'r', encoding='utf-8') as f:
+                return parse_collapsed(f.read())
+        if profiler == 'perf':
+            command = ['perf', 'script', '-i', raw_file]
+        else:
+            command = ['jfr', 'print', '--events', 'jdk.ExecutionSample',
+                       raw_file]
+        process = subprocess.run(command, capture_output=True, check=False)
+        text = process.stdout.decode('utf-8', errors='replace')
+        if profiler == 'perf':
+            return collapse_perf_script(text)
+        return collapse_jfr_samples(text)
+
+    def profile(
+            self,
+            loc_language: str,
+            mainclass: str,
+            problem_root_folder: str,
+            files: List[str],
+            lang_config: Dict[Any, Any],
+            case: str,
+            top: int = 15,
+            output: str = '',
+            sampling: bool = False) -> Dict[str, int]:
+        """Profile the solution on one test case.
+
+        Prints the hottest functions and writes the collapsed stacks to
+        ``output`` (default: ``profile/<case>.folded`` in the problem
+        root folder).
+
+        Returns:
+            Dict[str, int]: collapsed stack -> count
+        """
+        console = self.console
+        try:
+            in_file = cases.resolve_case(problem_root_folder, case)
+            run_command, folder = build_cache.build_program(
+                lang_config, files, mainclass)
+        except (FileNotFoundError, build_cache.BuildError) as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+        if loc_language in PYTHON_LANGUAGES:
+            # cProfile compiles the script it runs, so it needs the source
+            main_src_file = languages.find_main_source(files, mainclass)
+            run_command = run_program.build_run_command(
+                lang_config, os.path.abspath(main_src_file))
+        try:
+            profiler = self.select_profiler(loc_language, run_command,
+                                            sampling)
+        except ValueError as ex:
+            console.print(str(ex), style='bold red')
+            exit(1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, f'profile.{profiler}')
+            command = self.build_profile_command(profiler, run_command,
+                                                 raw_file)
+            console.print(f"Profile command: {shlex.join(command)}",
+                          style='bold blue')
+            code, _, error = run_program.execute(command, str(in_file),
+                                                 folder)
+            if code != 0:
+                console.print(escape(error), style='bold red')
+                exit(1)
+            stacks = self.collect(profiler, raw_file)
+
+        if output:
+            output_file = Path(output)
+        else:
+            output_file = Path(problem_root_folder).joinpath(
+                'profile', f'{cases.case_name(in_file)}.folded')
+        write_collapsed(stacks, output_file)
+
+        unit = 'µs' if profiler == 'cprofile' else 'samples'
+        table = Table(
+            title=f"[not italic bold blue]🔥 Hot functions: {in_file.name} "
+                  f"({profiler}, {sum(stacks.values())} {unit})[/]",
+            header_style="bold blue")
+        table.box = box.SQUARE
+        table.add_column("Function", justify="left", style="cyan")
+        table.add_column("Self %", justify="right", style="cyan")
+        table.add_column("Total %", justify="right", style="cyan")
+        for name, self_pct, total_pct in top_functions(stacks, top):
+            table.add_row(escape(name), f'{self_pct:.1f}',
+                          f'{total_pct:.1f}')
+        console.print(table)
+        console.print(f"Collapsed stacks written to {output_file}",
+                      style='bold green')
+        return stacks
+
+
+# Default profiler for module-level compatibility
+_profiler = SolutionProfiler()
+
+
+def profile(
+        loc_language: str,
+        mainclass: str,
+        problem_root_folder: str,
+        files: List[str],
+        lang_config: Dict[Any, Any],
+        case: str,
+        top: int = 15,
+        output: str = '',
+        sampling: bool = False) -> Dict[str, int]:
+    """Module-level wrapper delegating to :class:`SolutionProfiler`."""
+
+    return _profiler.profile(loc_language, mainclass, problem_root_folder,
+                             files, lang_config, case, top, output, sampling)
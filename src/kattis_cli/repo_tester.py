@@ -0,0 +1,403 @@
+"""Test every problem of a repository on a shared worker pool.
+
+Problem root folders are discovered below a path with the same rule as
+:func:`utility.find_problem_root_folder`, and the language and main file
+of each are resolved like ``kattis test`` does. Compiles and test runs
+of all problems share one pool: the cases of a problem are queued as
+soon as it is built. Builds come from the build cache, and problems
+that passed are not run again until their build, data or options
+change, so an unchanged repository is checked in seconds. With a git
+ref, only the problems with files changed since the ref are tested.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from math import inf
+import hashlib
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+from kattis_cli.compare import VERDICT_STYLES, grade
+from kattis_cli.solution_tester import NEAR_LIMIT
+from kattis_cli.utils import build_cache, cases, languages, run_program
+from kattis_cli.utils import utility
+
+# folders that never contain problems
+SKIP_FOLDERS = {'data', 'node_modules', '__pycache__'}
+
+# summary of one problem: problem, language, status (pass, slow, fail or
+# error), passed and total cases, slow cases, seconds, failed cases and
+# error detail
+ProblemResult = Dict[str, Any]
+
+# a problem ready to run: name, language, run command, folder to run
+# it from, input files, seconds from which a case is slow and the key of
+# its cached result
+Prepared = Tuple[str, str, List[str], Optional[str], List[Path],
+                 Optional[float], str]
+
+STATUS_STYLES = {'pass': 'bold green', 'slow': 'bold yellow',
+                 'fail': 'bold red', 'error': 'bold red'}
+
+
+def find_problem_roots(path: Path) -> List[Path]:
+    """Find the problem root folders at or below path.
+
+    Problems do not nest, so the folders of a problem are not searched.
+    When there is none below path, the problem path is in is returned.
+
+    Returns:
+        List[Path]: sorted problem root folders
+    """
+    roots = []
+    for folder, subfolders, _ in os.walk(path):
+        if utility.is_problem_root(Path(folder)):
+            roots.append(Path(folder))
+            subfolders.clear()
+            continue
+        subfolders[:] = [
+            name for name in subfolders
+            if not name.startswith('.') and name not in SKIP_FOLDERS]
+    if not roots:
+        try:
+            roots.append(utility.find_problem_root_folder(path, '*.yaml'))
+        except FileNotFoundError:
+            pass
+    return sorted(roots)
+
+
+def changed_files(path: Path, ref: str) -> List[Path]:
+    """Return the files changed since a git ref, untracked ones included.
+
+    Deleted files are returned too: their problem still needs a test.
+
+    Raises:
+        ValueError: if path is not in a git repository or ref is unknown
+    """
+    def _git(*args: str) -> str:
+        try:
+            return subprocess.run(['git', *args], cwd=path,
+                                  capture_output=True, text=True,
+                                  check=True).stdout
+        except OSError as ex:
+            raise ValueError(str(ex)) from ex
+        except subprocess.CalledProcessError as ex:
+            raise ValueError(ex.stderr.strip() or str(ex)) from ex
+
+    top = Path(_git('rev-parse', '--show-toplevel').strip())
+    # -z keeps unusual file names unquoted
+    names = _git('diff', '-z', '--name-only', ref, '--').split('\0')
+    names += _git('ls-files', '-z', '--others', '--exclude-standard',
+                  '--full-name').split('\0')
+    return sorted({top.joinpath(name) for name in names if name})
+
+
+def changed_problem_roots(path: Path, ref: str) -> List[Path]:
+    """Find the roots of the problems below path changed since a git ref.
+
+    Every changed file is mapped to its problem with
+    :func:`utility.find_problem_root_folder`; files outside of any
+    problem are ignored.
+
+    Returns:
+        List[Path]: sorted problem root folders
+
+    Raises:
+        ValueError: if path is not in a git repository or ref is unknown
+    """
+    path = path.resolve()
+    roots = set()
+    folders: Dict[Path, Optional[Path]] = {}
+    for file in changed_files(path, ref):
+        folder = file.parent
+        if folder not in folders:
+            try:
+                folders[folder] = utility.find_problem_root_folder(
+                    folder, '*.yaml')
+            except FileNotFoundError:
+                folders[folder] = None
+        root = folders[folder]
+        if root is not None and (root == path or path in root.parents):
+            roots.add(root)
+    return sorted(roots)
+
+
+def result_key(lang_config: Dict[Any, Any], files: List[str],
+               root: Path, timeout: float, accuracy: float) -> str:
+    """Return the key of a problem's result.
+
+    It changes with the build, the run command, the data files and the
+    options of the run.
+    """
+    digest = hashlib.sha256(build_cache.build_key(lang_config, files)
+                            .encode('utf-8'))
+    digest.update(f"{lang_config['execute']}|{timeout}|{accuracy}"
+                  .encode('utf-8'))
+    data = cases.data_folder(root)
+    if data.is_dir():
+        for file in sorted(data.iterdir()):
+            if file.is_file():
+                digest.update(file.name.encode('utf-8'))
+                digest.update(build_cache.hash_file(str(file))
+                              .encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def results_folder() -> Path:
+    """Return the folder of the cached results of passing problems."""
+    return build_cache.cache_folder().joinpath('results')
+
+
+def summarize(name: str, language: str,
+              runs: List[Tuple[str, str, float]],
+              slow_seconds: Optional[float]) -> ProblemResult:
+    """Summarize the verdicts and times of a problem's cases.
+
+    Args:
+        runs (List[Tuple[str, str, float]]): case, verdict and seconds
+
+    Returns:
+        ProblemResult: summary of the problem
+    """
+    failed = [f'{verdict} {case}' for case, verdict, _ in runs
+              if verdict not in ('AC', 'OK')]
+    slow = [case for case, _, seconds in runs
+            if slow_seconds is not None and seconds >= slow_seconds]
+    status = 'fail' if failed else 'slow' if slow else 'pass'
+    return {'problem': name, 'language': language, 'status': status,
+            'passed': len(runs) - len(failed), 'total': len(runs),
+            'slow': slow, 'seconds': sum(seconds for _, _, seconds in runs),
+            'failed': failed, 'error': ''}
+
+
+def error_result(name: str, language: str, error: str) -> ProblemResult:
+    """Return the summary of a problem that could not be tested."""
+    return {'problem': name, 'language': language, 'status': 'error',
+            'passed': 0, 'total': 0, 'slow': [], 'seconds': 0.0,
+            'failed': [], 'error': error.strip().splitlines()[0]
+            if error.strip() else 'failed'}
+
+
+class RepoTester:
+    """Tests all the problems below a folder on one worker pool."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def prepare(self, root: Path, name: str, timeout: float,
+                accuracy: float, cached: bool
+                ) -> Tuple[Optional[Prepared], Optional[ProblemResult]]:
+        """Resolve and build a problem's solution.
+
+        Returns:
+            Tuple[Optional[Prepared], Optional[ProblemResult]]: the
+                problem ready to run, or its result when it could not be
+                built or a cached result is current
+        """
+        try:
+            problemid, loc_language, mainclass, files, _, lang_config = \
+                languages.resolve_args('', '', '', [], root)
+            if not mainclass:
+                mainclass = languages.guess_mainfile(
+                    languages.LOCAL_TO_KATTIS[loc_language], files,
+                    problemid, lang_config)
+            in_files = cases.find_input_files(root)
+            if not in_files:
+                raise ValueError('No input files found!')
+            key = result_key(lang_config, files, root, timeout, accuracy)
+            result_file = results_folder().joinpath(f'{key}.json')
+            if cached and result_file.is_file():
+                result = json.loads(result_file.read_text(encoding='utf-8'))
+                result['problem'] = name
+                result['cached'] = True
+                return None, result
+            command, folder = build_cache.build_program(
+                lang_config, files, mainclass)
+        except (ValueError, OSError, build_cache.BuildError) as ex:
+            return None, error_result(name, '', str(ex))
+        metadata = utility.load_metadata(root, problemid)
+        cpu_limit = utility.parse_cpu_limit(metadata.get('cpu_limit'))
+        slow_seconds = NEAR_LIMIT * cpu_limit if cpu_limit else None
+        return (name, loc_language, command, folder, in_files,
+                slow_seconds, key), None
+
+    def run_case(self, command: List[str], folder: Optional[str],
+                 in_file: Path, timeout: float,
+                 accuracy: float) -> Tuple[str, str, float]:
+        """Run and grade one case.
+
+        Returns:
+            Tuple[str, str, float]: case, verdict and seconds
+        """
+        try:
+            code, output, _, seconds = run_program.measure(
+                command, str(in_file), folder, timeout,
+                build_cache.run_env(command))
+        except OSError:
+            return in_file.name, 'RTE', 0.0
+        return (in_file.name,
+                grade(code, output, cases.answer_file(in_file), accuracy),
+                seconds)
+
+    def test_all(self,
+                 path: str,
+                 jobs: int = 0,
+                 timeout: float = 10,
+                 accuracy: float = inf,
+                 cached: bool = True,
+                 roots: Optional[List[Path]] = None,
+                 changed_since: str = ''
+                 ) -> Dict[str, ProblemResult]:
+        """Test every problem found below path.
+
+        Args:
+            path (str): folder to search for problems
+            jobs (int): parallel jobs (default: number of cores)
+            timeout (float): seconds after which a run is killed
+            accuracy (float): decimal places for float comparison
+            cached (bool): reuse the results of problems that passed
+                and did not change
+            roots (Optional[List[Path]]): problem root folders to test
+                instead of all the problems below path
+            changed_since (str): only test the problems below path with
+                files changed since this git ref
+
+        Returns:
+            Dict[str, ProblemResult]: summary of every problem, by its
+                folder relative to path
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        start = time.perf_counter()
+        # resolved like changed_problem_roots, so names don't depend on
+        # symlinks in path
+        path = os.path.realpath(path)
+        if changed_since:
+            try:
+                roots = changed_problem_roots(Path(path), changed_since)
+            except ValueError as ex:
+                console.print(escape(str(ex)), style='bold red')
+                exit(1)
+            if not roots:
+                console.print(f"No problems changed since {changed_since}.",
+                              style='bold green')
+                return {}
+        if roots is None:
+            roots = find_problem_roots(Path(path))
+        if not roots:
+            console.print(f"No problems found in {path}.", style='bold red')
+            exit(1)
+        roots = [root.resolve() for root in roots]
+        names = {root: os.path.relpath(root, path) for root in roots}
+        results: Dict[str, ProblemResult] = {}
+        runs: Dict[str, List[Tuple[str, str, float]]] = {}
+        problems: Dict[str, Prepared] = {}
+        with ThreadPoolExecutor(max_workers=jobs) as executor, \
+                console.status(f"Testing {len(roots)} problems..."):
+            builds = [executor.submit(self.prepare, root, names[root],
+                                      timeout, accuracy, cached)
+                      for root in roots]
+            case_runs: List[Future[Tuple[str, str, float]]] = []
+            owners: Dict[Future[Tuple[str, str, float]], str] = {}
+            # the cases of a problem run while others still compile
+            for build in as_completed(builds):
+                problem, result = build.result()
+                if problem is None:
+                    assert result is not None
+                    results[result['problem']] = result
+                    continue
+                name, _, command, folder, in_files, _, _ = problem
+                problems[name] = problem
+                runs[name] = []
+                for in_file in in_files:
+                    future = executor.submit(self.run_case, command, folder,
+                                             in_file, timeout, accuracy)
+                    case_runs.append(future)
+                    owners[future] = name
+            for future in as_completed(case_runs):
+                runs[owners[future]].append(future.result())
+        for name, problem in problems.items():
+            _, language, _, _, _, slow_seconds, key = problem
+            result = summarize(name, language, sorted(runs[name]),
+                               slow_seconds)
+            results[name] = result
+            if result['status'] != 'fail':
+                self.save_result(key, result)
+        results = dict(sorted(results.items()))
+        self.print_summary(results, time.perf_counter() - start)
+        return results
+
+    def save_result(self, key: str, result: ProblemResult) -> None:
+        """Cache the result of a problem that passed."""
+        folder = results_folder()
+        folder.mkdir(parents=True, exist_ok=True)
+        partial = folder.joinpath(f'.{key}.partial')
+        partial.write_text(json.dumps(result), encoding='utf-8')
+        os.replace(partial, folder.joinpath(f'{key}.json'))
+
+    def print_summary(self, results: Dict[str, ProblemResult],
+                      seconds: float) -> None:
+        """Print the problems that did not pass and the totals."""
+        console = self.console
+        counts = {status: 0 for status in STATUS_STYLES}
+        for result in results.values():
+            counts[result['status']] += 1
+        cached = sum(1 for result in results.values()
+                     if result.get('cached'))
+        table = Table(title="[not italic bold blue]🧪 Problems needing "
+                            "attention[/]", header_style="bold blue")
+        table.box = box.SQUARE
+        table.add_column("Problem", justify="left", style="cyan")
+        table.add_column("Language", justify="left")
+        table.add_column("Status", justify="center")
+        table.add_column("Passed", justify="right")
+        table.add_column("Time", justify="right")
+        table.add_column("Details", justify="left")
+        for name, result in results.items():
+            status = result['status']
+            if status == 'pass':
+                continue
+            if status == 'error':
+                detail = escape(result['error'])
+            elif status == 'fail':
+                detail = ', '.join(
+                    f"[{VERDICT_STYLES.get(failed.split()[0], 'bold red')}]"
+                    f"{escape(failed)}[/]" for failed in result['failed'][:5])
+            else:
+                detail = 'slow: ' + escape(', '.join(result['slow'][:5]))
+            table.add_row(escape(name), result['language'],
+                          f"[{STATUS_STYLES[status]}]{status}[/]",
+                          f"{result['passed']}/{result['total']}",
+                          f"{result['seconds']:.3f} s", detail)
+        if table.row_count:
+            console.print(table)
+        style = 'bold red' if counts['fail'] or counts['error'] \
+            else 'bold green'
+        console.print(f"{len(results)} problems: {counts['pass']} passed, "
+                      f"{counts['slow']} slow, {counts['fail']} failed, "
+                      f"{counts['error']} errors ({cached} cached) in "
+                      f"{seconds:.1f} s", style=style)
+
+
+# Default repository tester for module-level compatibility
+_tester = RepoTester()
+
+
+def test_all(path: str,
+             jobs: int = 0,
+             timeout: float = 10,
+             accuracy: float = inf,
+             cached: bool = True,
+             roots: Optional[List[Path]] = None,
+             changed_since: str = '') -> Dict[str, ProblemResult]:
+    """Module-level wrapper delegating to :class:`RepoTester`."""
+
+    return _tester.test_all(path, jobs, timeout, accuracy, cached, roots,
+                            changed_since)
@@ -0,0 +1,109 @@
+"""Run a solution on a custom input.
+
+The solution is compiled through the build cache and run once with its
+stdin read from a file (or a test case name) or from the terminal. The
+program's output is streamed as it is written instead of being captured,
+and the time and peak memory are printed when it exits.
+"""
+
+from typing import Any, Dict, List, Optional
+import os
+import shlex
+from rich.console import Console
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, cases, cds, languages, run_program
+
+
+def format_usage(code: int, elapsed: float, cpu: Optional[float],
+                 memory: Optional[int]) -> str:
+    """Format the exit code, time and memory of a run on one line."""
+    parts = [f'exit code {code}', f'{elapsed:.3f} s wall']
+    if cpu is not None:
+        parts.append(f'{cpu:.3f} s cpu')
+    if memory is not None:
+        parts.append(f'{memory / 1024:.1f} MiB peak memory')
+    return ', '.join(parts)
+
+
+class SolutionRunner:
+    """Runs a solution once with custom input and streamed output."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        # reports go to stderr so that the program's output can be
+        # redirected on its own
+        self.console = console or Console(stderr=True)
+
+    def run(self,
+            mainclass: str,
+            problem_root_folder: str,
+            files: List[str],
+            lang_config: Dict[Any, Any],
+            case: str = '-') -> int:
+        """Run the solution with the case's input, or the terminal's.
+
+        Args:
+            mainclass (str): main file or main class
+            problem_root_folder (str): root problem folder
+            files (List[str]): solution files
+            lang_config (Dict[Any, Any]): language config
+            case (str): input file or test case name; ``-`` reads the
+                terminal
+
+        Returns:
+            int: exit code of the program
+        """
+        console = self.console
+        in_file: Optional[str] = None
+        if case and case != '-':
+            try:
+                in_file = str(cases.resolve_case(problem_root_folder, case))
+            except FileNotFoundError as ex:
+                console.print(str(ex), style='bold red')
+                exit(1)
+
+        try:
+            code, _, error, build_folder = build_cache.compile_cached(
+                lang_config, files)
+        except build_cache.BuildError as ex:
+            code, error = 1, str(ex)
+        if code != 0:
+            console.print(escape(error), style='bold red')
+            exit(1)
+        main_src_file = build_cache.main_file(
+            lang_config, languages.find_main_source(files, mainclass),
+            build_folder, files)
+        lang_config = cds.inject(lang_config, main_src_file, build_folder,
+                                 in_file or os.devnull)
+        command = run_program.build_run_command(lang_config, main_src_file)
+        console.print(f"Run command: {shlex.join(command)}",
+                      style='bold blue')
+        if in_file is None:
+            console.print("Reading input from the terminal; end it with "
+                          "Ctrl-D (Ctrl-Z Enter on Windows).",
+                          style='bold blue')
+        try:
+            code, elapsed, cpu, memory = run_program.stream(
+                command, in_file, build_folder,
+                build_cache.run_env(command))
+        except OSError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+        style = 'bold green' if code == 0 else 'bold red'
+        console.print(format_usage(code, elapsed, cpu, memory), style=style)
+        return code
+
+
+# Default runner for module-level compatibility
+_runner = SolutionRunner()
+
+
+def run(mainclass: str,
+        problem_root_folder: str,
+        files: List[str],
+        lang_config: Dict[Any, Any],
+        case: str = '-') -> int:
+    """Module-level wrapper delegating to :class:`SolutionRunner`."""
+
+    return _runner.run(mainclass, problem_root_folder, files, lang_config,
+                       case)
@@ -0,0 +1,197 @@
+"""Shrink a failing input with delta debugging.
+
+The input is reduced by removing chunks of lines and then chunks of
+tokens for as long as the solution keeps failing on it. With a reference
+solution an input fails when the outputs differ; without one it fails
+when the solution crashes or times out. Candidate reductions are run in
+parallel and their verdicts are cached by input hash.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from math import inf
+import hashlib
+import math
+import os
+import re
+import tempfile
+from pathlib import Path
+from rich.console import Console
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, cases, run_program, utility
+
+
+def split_lines(text: str) -> List[str]:
+    """Split text into lines keeping their line endings."""
+    return text.splitlines(keepends=True)
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into tokens keeping their trailing whitespace."""
+    stripped = text.lstrip()
+    leading = text[:len(text) - len(stripped)]
+    tokens = re.findall(r'\S+\s*', stripped)
+    return [leading] + tokens if leading else tokens
+
+
+def ddmin(units: List[str],
+          evaluate: Callable[[List[str]], List[bool]]) -> List[str]:
+    """Minimize units while the joined text keeps failing.
+
+    Implements the complement-removal variant of delta debugging: the
+    units are split into n chunks, and the first complement (all units
+    but one chunk) that still fails is kept. The granularity doubles
+    when no complement fails.
+
+    Args:
+        units (List[str]): pieces of the failing input
+        evaluate (Callable[[List[str]], List[bool]]): returns for every
+            candidate text whether it still fails
+
+    Returns:
+        List[str]: the reduced units
+    """
+    n = 2
+    while len(units) >= 2:
+        size = math.ceil(len(units) / n)
+        complements = [units[:start] + units[start + size:]
+                       for start in range(0, len(units), size)]
+        verdicts = evaluate([''.join(c) for c in complements])
+        failing = next((c for c, v in zip(complements, verdicts) if v),
+                       None)
+        if failing is not None:
+            units = failing
+            n = max(n - 1, 2)
+        elif n >= len(units):
+            break
+        else:
+            n = min(2 * n, len(units))
+    return units
+
+
+class InputShrinker:
+    """Reduces a failing test input to a small one that still fails."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+        self.cache: Dict[str, bool] = {}
+
+    def shrink(
+            self,
+            mainclass: str,
+            problem_root_folder: str,
+            files: List[str],
+            lang_config: Dict[Any, Any],
+            case: str,
+            reference: str = '',
+            output: str = '',
+            timeout: float = 10,
+            jobs: int = 0,
+            accuracy: float = inf) -> str:
+        """Shrink a failing test case.
+
+        The reduced input is written next to the case as
+        ``<case>-shrunk.in`` (with the reference answer as .ans).
+
+        Returns:
+            str: the reduced input
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        try:
+            in_file = cases.resolve_case(problem_root_folder, case)
+            solution = build_cache.build_program(lang_config, files,
+                                                 mainclass)
+            ref: Optional[Tuple[List[str], Optional[str]]] = None
+            if reference:
+                ref = build_cache.build_file(reference)
+        except (FileNotFoundError, build_cache.BuildError) as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+
+        with tempfile.TemporaryDirectory() as work_folder:
+
+            def _run(command: Tuple[List[str], Optional[str]],
+                     input_file: str) -> Tuple[int, str]:
+                code, ans, _ = run_program.execute(
+                    command[0], input_file, command[1], timeout,
+                    build_cache.run_env(command[0]))
+                return code, ans
+
+            def _is_failing(text: str) -> bool:
+                key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+                if key not in self.cache:
+                    candidate = os.path.join(work_folder, f'{key}.in')
+                    with open(candidate, 'w', encoding='utf-8') as f:
+                        f.write(text)
+                    code, ans = _run(solution, candidate)
+                    if ref is None:
+                        self.cache[key] = code != 0
+                    else:
+                        ref_code, expected = _run(ref, candidate)
+                        self.cache[key] = ref_code == 0 and (
+                            code != 0 or not utility.check_answer(
+                                expected, ans, accuracy))
+                    os.remove(candidate)
+                return self.cache[key]
+
+            executor = ThreadPoolExecutor(max_workers=jobs)
+
+            def _evaluate(texts: List[str]) -> List[bool]:
+                # equal candidates share a work file, so each is run once
+                unique = list(dict.fromkeys(texts))
+                verdicts = dict(zip(unique,
+                                    executor.map(_is_failing, unique)))
+                return [verdicts[text] for text in texts]
+
+            text = cases.read_text(in_file)
+            original = len(text.encode('utf-8'))
+            if not _is_failing(text):
+                executor.shutdown()
+                console.print(f"{in_file.name} does not fail; nothing to "
+                              "shrink.", style='bold red')
+                exit(1)
+            with executor, console.status("Shrinking..."):
+                while True:
+                    size = len(text)
+                    for split in (split_lines, split_tokens):
+                        text = ''.join(ddmin(split(text), _evaluate))
+                    if len(text) == size:
+                        break
+
+            if output:
+                shrunk = Path(output)
+            else:
+                shrunk = in_file.with_name(
+                    f'{cases.case_name(in_file)}-shrunk.in')
+            shrunk.write_text(text, encoding='utf-8')
+            if ref is not None:
+                _, expected = _run(ref, str(shrunk))
+                shrunk.with_suffix('.ans').write_text(expected,
+                                                      encoding='utf-8')
+
+        console.print(f"Shrunk {in_file.name} from {original} to "
+                      f"{len(text.encode('utf-8'))} bytes "
+                      f"({len(self.cache)} candidates tried).",
+                      style='bold green')
+        console.print(f"Saved as {shrunk}", style='bold blue')
+        return text
+
+
+def shrink(
+        mainclass: str,
+        problem_root_folder: str,
+        files: List[str],
+        lang_config: Dict[Any, Any],
+        case: str,
+        reference: str = '',
+        output: str = '',
+        timeout: float = 10,
+        jobs: int = 0,
+        accuracy: float = inf) -> str:
+    """Module-level wrapper delegating to :class:`InputShrinker`."""
+
+    return InputShrinker().shrink(mainclass, problem_root_folder, files,
+                                  lang_config, case, reference, output,
+                                  timeout, jobs, accuracy)
@@ -0,0 +1,246 @@
+"""Record the outputs of a solution and check later versions against them.
+
+Before optimizing an accepted solution, ``record`` runs it over every
+input of the problem, including large generated inputs without answer
+files, and stores the digest of every output with its exit code and
+time. ``check`` reruns the (changed) solution in parallel and reports
+the cases whose output changed along with the timing deltas. Outputs
+are hashed while the program writes them and are never kept in memory.
+"""
+
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, cases, run_program
+
+SNAPSHOT_FILE = 'snapshot.json'
+
+# snapshot of one case: digests of the input and the output, output
+# size in bytes, exit code and seconds
+CaseSnapshot = Dict[str, Any]
+
+
+def snapshot_path(problem_root_folder: str, snapshot: str = '') -> Path:
+    """Return the snapshot file; default snapshot.json in the problem."""
+    if snapshot:
+        return Path(snapshot)
+    return Path(problem_root_folder).joinpath(SNAPSHOT_FILE)
+
+
+def delta(before: float, after: float) -> str:
+    """Format the change from one time to another."""
+    change = f'{after - before:+.3f} s'
+    if before > 0:
+        change += f' ({100 * (after - before) / before:+.0f}%)'
+    return change
+
+
+def changes(recorded: Dict[str, CaseSnapshot],
+            current: Dict[str, CaseSnapshot]) -> Dict[str, str]:
+    """Return what changed on every case that differs.
+
+    Returns:
+        Dict[str, str]: case name -> input changed, output changed, exit
+            code changed, new case or missing case
+    """
+    changed = {}
+    for name in sorted(set(recorded) | set(current)):
+        before, after = recorded.get(name), current.get(name)
+        if before is None:
+            changed[name] = 'new case'
+        elif after is None:
+            changed[name] = 'missing case'
+        elif before['input'] != after['input']:
+            changed[name] = 'input changed'
+        elif before['code'] != after['code']:
+            changed[name] = f"exit code {before['code']} → {after['code']}"
+        elif before['output'] != after['output']:
+            changed[name] = 'output changed'
+    return changed
+
+
+class SnapshotTester:
+    """Records and checks output digests of a solution on every input."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def run_cases(self,
+                  problem_root_folder: str,
+                  files: List[str],
+                  mainclass: str,
+                  lang_config: Dict[Any, Any],
+                  jobs: int = 0,
+                  timeout: float = 60) -> Dict[str, CaseSnapshot]:
+        """Build the solution and snapshot it on every input in parallel.
+
+        Returns:
+            Dict[str, CaseSnapshot]: snapshot of every case, by input
+                file name
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        in_files = cases.find_input_files(problem_root_folder)
+        if not in_files:
+            console.print("No input files found!", style='bold red')
+            exit(1)
+        try:
+            command, folder = build_cache.build_program(
+                lang_config, files, mainclass)
+        except build_cache.BuildError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+        env = build_cache.run_env(command)
+
+        def _run(in_file: Path) -> CaseSnapshot:
+            code, digest, size, _, seconds = run_program.hash_output(
+                command, str(in_file), folder, timeout, env)
+            return {'input': cases.hash_case(in_file), 'code': code,
+                    'output': digest, 'bytes': size,
+                    'seconds': round(seconds, 4)}
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor, \
+                console.status(f"Running {len(in_files)} cases..."):
+            snapshots = list(executor.map(_run, in_files))
+        return {cases.case_file(in_file).name: snapshot
+                for in_file, snapshot in zip(in_files, snapshots)}
+
+    def record(self,
+               problem_root_folder: str,
+               files: List[str],
+               mainclass: str,
+               lang_config: Dict[Any, Any],
+               snapshot: str = '',
+               jobs: int = 0,
+               timeout: float = 60) -> Dict[str, CaseSnapshot]:
+        """Record the output digest of the solution on every input.
+
+        Args:
+            problem_root_folder (str): root problem folder
+            files (List[str]): solution files
+            mainclass (str): main file or main class
+            lang_config (Dict[Any, Any]): language config
+            snapshot (str): snapshot file; default snapshot.json in the
+                problem root folder
+            jobs (int): parallel jobs (default: number of cores)
+            timeout (float): seconds after which a run is killed
+
+        Returns:
+            Dict[str, CaseSnapshot]: recorded snapshot of every case
+        """
+        console = self.console
+        current = self.run_cases(problem_root_folder, files, mainclass,
+                                 lang_config, jobs, timeout)
+        failed = [name for name, case in current.items() if case['code']]
+        path = snapshot_path(problem_root_folder, snapshot)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'solution': os.path.basename(mainclass),
+                                    'cases': current}, indent=2) + '\n',
+                        encoding='utf-8')
+        total = sum(case['seconds'] for case in current.values())
+        console.print(f"Recorded {len(current)} cases ({total:.3f} s) to "
+                      f"{path}", style='bold green')
+        if failed:
+            console.print(f"Nonzero exit code recorded on: "
+                          f"{', '.join(failed)}", style='bold yellow')
+        return current
+
+    def check(self,
+              problem_root_folder: str,
+              files: List[str],
+              mainclass: str,
+              lang_config: Dict[Any, Any],
+              snapshot: str = '',
+              jobs: int = 0,
+              timeout: float = 60) -> Dict[str, str]:
+        """Rerun the solution and compare it with the recorded snapshot.
+
+        Only the cases that differ are listed; the total time of the
+        cases that match is compared with the recorded one.
+
+        Returns:
+            Dict[str, str]: what changed on every case that differs
+        """
+        console = self.console
+        path = snapshot_path(problem_root_folder, snapshot)
+        if not path.is_file():
+            console.print(f"No snapshot at {path}; run kattis snapshot "
+                          "record first.", style='bold red')
+            exit(1)
+        recorded = json.loads(path.read_text(encoding='utf-8'))['cases']
+        current = self.run_cases(problem_root_folder, files, mainclass,
+                                 lang_config, jobs, timeout)
+        changed = changes(recorded, current)
+        if changed:
+            self.print_changes(recorded, current, changed)
+        same = [name for name in current
+                if name in recorded and name not in changed]
+        before = sum(recorded[name]['seconds'] for name in same)
+        after = sum(current[name]['seconds'] for name in same)
+        style = 'bold green' if after <= before else 'bold yellow'
+        console.print(f"{len(same)} of {len(current)} cases unchanged: "
+                      f"{before:.3f} s → {after:.3f} s "
+                      f"{delta(before, after)}", style=style)
+        if changed:
+            console.print(f"Outputs differ on {len(changed)} case(s).",
+                          style='bold red')
+        return changed
+
+    def print_changes(self, recorded: Dict[str, CaseSnapshot],
+                      current: Dict[str, CaseSnapshot],
+                      changed: Dict[str, str]) -> None:
+        """Print the cases that differ with their timings."""
+        table = Table(title="[not italic bold blue]📸 Snapshot changes[/]",
+                      header_style="bold blue")
+        table.box = box.SQUARE
+        table.add_column("Case", justify="left", style="cyan")
+        table.add_column("Change", justify="left", style="bold red")
+        table.add_column("Recorded", justify="right")
+        table.add_column("Now", justify="right")
+        table.add_column("Delta", justify="right")
+        for name, change in changed.items():
+            before, after = recorded.get(name), current.get(name)
+            row = [escape(name), change,
+                   f"{before['seconds']:.3f} s" if before else '',
+                   f"{after['seconds']:.3f} s" if after else '']
+            row.append(delta(before['seconds'], after['seconds'])
+                       if before and after else '')
+            table.add_row(*row)
+        self.console.print(table)
+
+
+# Default snapshot tester for module-level compatibility
+_tester = SnapshotTester()
+
+
+def record(problem_root_folder: str,
+           files: List[str],
+           mainclass: str,
+           lang_config: Dict[Any, Any],
+           snapshot: str = '',
+           jobs: int = 0,
+           timeout: float = 60) -> Dict[str, CaseSnapshot]:
+    """Module-level wrapper delegating to :class:`SnapshotTester`."""
+
+    return _tester.record(problem_root_folder, files, mainclass,
+                          lang_config, snapshot, jobs, timeout)
+
+
+def check(problem_root_folder: str,
+          files: List[str],
+          mainclass: str,
+          lang_config: Dict[Any, Any],
+          snapshot: str = '',
+          jobs: int = 0,
+          timeout: float = 60) -> Dict[str, str]:
+    """Module-level wrapper delegating to :class:`SnapshotTester`."""
+
+    return _tester.check(problem_root_folder, files, mainclass,
+                         lang_config, snapshot, jobs, timeout)
@@ -4,10 +4,12 @@ Provides a SolutionTester class and a module-level `test_samples`
 delegator for backward compatibility with the previous procedural API.
 """
 
-from typing import Any, List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from math import inf
-import glob
+import re
 import shlex
+import sqlite3
 import time
 import os
 from pathlib import Path
@@ -19,8 +21,13 @@ from rich import box
 from rich.prompt import Confirm
 from rich.markup import escape
 
-from kattis_cli import kattis
-from kattis_cli.utils import languages, run_program, utility
+from kattis_cli import history, kattis, lint
+from kattis_cli.compare import grade
+from kattis_cli.utils import build_cache, cases, cds, languages, run_program
+from kattis_cli.utils import utility
+
+# fraction of the CPU limit from which a case is near the time limit
+NEAR_LIMIT = 0.5
 
 
 class SolutionTester:
@@ -53,14 +60,32 @@ class SolutionTester:
             problem_root_folder: str,
             files: List[str],
             lang_config: Dict[Any, Any],
-            accuracy: float = inf
+            accuracy: float = inf,
+            variant: str = 'release',
+            jobs: int = 0,
+            budget: bool = False,
+            cache: Optional[Path] = None
     ) -> None:
         """Run the sample tests for a solution.
 
         This mirrors the previous procedural `test_samples` function but
         is encapsulated on a class to allow dependency injection for
-        easier testing.
+        easier testing. Debug and sanitize variants are delegated to
+        :meth:`test_variant`. Release runs are appended to the run
+        history; with ``budget``, the run fails when a case regressed
+        beyond the problem's performance budget. Builds go to ``cache``
+        (default: the build cache on disk).
         """
+        if variant != 'release' and budget:
+            # debug and sanitizer builds are not timed against the budget
+            Console().print(f"--budget can't be combined with the {variant} "
+                            "variant; the budget applies to release "
+                            "builds.", style='bold red')
+            exit(1)
+        if variant != 'release':
+            self.test_variant(mainclass, problem_root_folder, files,
+                              lang_config, variant, accuracy, jobs, cache)
+            return
         console = Console()
 
         table = Table(show_header=True,
@@ -71,38 +96,48 @@ class SolutionTester:
         table_centered = Align.center(table)
 
         sep = os.path.sep
-        in_files = glob.glob(f"{problem_root_folder}{sep}data{sep}*.in")
+        in_files = cases.find_input_files(problem_root_folder)
         if not in_files:
             data_path = f"{problem_root_folder}{sep}data"
             console.print(data_path, style="bold blue")
             console.print("No sample input files found!", style="bold red")
             exit(1)
-        in_files.sort()
         compile_command = None
         if lang_config['compile']:
             compile_command = run_program.build_compile_command(
                 lang_config,
                 files,
             )
-            ex_code, ans, error = run_program.compile_program(
+        # Python sources are byte-compiled without a compile command
+        try:
+            ex_code, ans, error, build_folder = build_cache.compile_cached(
                 lang_config,
                 files,
+                cache,
             )
-            if ex_code != 0:  # compilation error; exit code
+        except build_cache.BuildError as ex:
+            ex_code, error = 1, str(ex)
+        if ex_code != 0:  # compilation error; exit code
+            if compile_command:
                 console.print(
                     f"Compile command: {shlex.join(compile_command)}",
                     style='bold blue')
-                console.print(escape(error), style='bold red')
-                exit(1)
+            console.print(escape(error), style='bold red')
+            exit(1)
 
         count = 0
         total = len(in_files)
         console.clear()
         title = f"[not italic bold blue]👷‍ Testing {mainclass} "
-        main_src_file = next((f for f in files if f.endswith(mainclass)), None)
-        if not main_src_file:
-            main_src_file = mainclass
+        main_src_file = languages.find_main_source(files, mainclass)
+        # the cached build runs from its folder
+        main_src_file = build_cache.main_file(lang_config, main_src_file,
+                                              build_folder, files)
+        # JVM programs run with a class-data archive of their build
+        lang_config = cds.inject(lang_config, main_src_file, build_folder,
+                                 str(in_files[0]))
         run_command = run_program.build_run_command(lang_config, main_src_file)
+        env = build_cache.run_env(run_command, cache)
 
         if compile_command:
             console.print(
@@ -148,48 +183,51 @@ class SolutionTester:
                 style="cyan",
                 no_wrap=True)
 
+            slowest = 0.0
+            results: List[history.CaseResult] = []
             for in_file in in_files:
-                with open(in_file, 'rb') as f:
-                    input_content = f.read()
-                    input_content.replace(b'\r\n', b'\n')  # Windows fix
-                out_file = in_file.replace('.in', '.ans')
-                try:
-                    with open(out_file, 'rb') as f:
-                        expected = f.read()
-                        expected.replace(b'\r\n', b'\n')
-                except FileNotFoundError:
-                    try:
-                        out_file = in_file.replace('.in', '.out')
-                        with open(out_file, 'rb') as f:
-                            expected = f.read()
-                            expected.replace(b'\r\n', b'\n')
-                    except FileNotFoundError:
-                        expected = b"No .ans or .out file found!"
-                code, ans, error = run_program.run(
+                # compressed cases are streamed, only a preview is read
+                input_content = cases.preview(in_file)
+                out_file = cases.answer_file(in_file)
+                if out_file is None:
+                    expected = "No .ans or .out file found!"
+                else:
+                    expected = cases.preview(out_file)
+                code, ans, error, seconds, memory = run_program.run_usage(
                     lang_config,
                     main_src_file,
-                    in_file,
+                    str(in_file),
+                    build_folder,
+                    env,
                 )
+                slowest = max(slowest, seconds)
                 if code != 0:
                     ans = error
 
-                if utility.check_answer(expected.decode('utf-8'),
-                                        ans, accuracy):
+                if out_file is None:
+                    passed = utility.check_answer(expected, ans, accuracy)
+                else:
+                    passed = utility.check_answer_file(out_file, ans,
+                                                       accuracy)
+                verdict = 'RTE' if code != 0 else 'AC' if passed else 'WA'
+                results.append((cases.case_name(in_file), verdict, seconds,
+                                memory))
+                if passed:
                     result = "[bold green]✅[/bold green]"
                     count += 1
                 else:
                     result = "[bold red]❌[/bold red]"
 
-                in_filename = Path(in_file).parts[-1]
-                if b"No .ans or .out file found!" == expected:
+                in_filename = in_file.name
+                if out_file is None:
                     out_filename = "N/A"
                 else:
-                    out_filename = Path(out_file).parts[-1]
+                    out_filename = out_file.name
                 time.sleep(0.1)
                 table.add_row(in_filename,
-                              input_content.decode('utf-8'),
+                              escape(input_content),
                               out_filename,
-                              escape(expected.decode('utf-8')),
+                              escape(expected),
                               escape(ans),
                               result)
                 if code != 0 and 'SyntaxError: ' in error:
@@ -200,6 +238,15 @@ class SolutionTester:
         console.print(data_path, style="bold blue")
         console.print(f'Total {total} input/output sample(s) found.')
         console.print(f"{count}/{total} tests passed.")
+        self.lint_if_slow(problemid, loc_language, problem_root_folder,
+                          files, mainclass, slowest)
+        run_id = self.record_history(problemid, loc_language, mainclass,
+                                     files, results)
+        if budget:
+            if run_id is None or history.check_budget(
+                    problem_root_folder, problemid, mainclass, results,
+                    run_id):
+                exit(1)
         if count < total:
             console.print("Check the output columns for differences.")
             console.print("Keep trying!")
@@ -221,6 +268,121 @@ class SolutionTester:
                     force=True,
                 )
 
+    def record_history(self, problemid: str, loc_language: str,
+                       mainclass: str, files: List[str],
+                       results: List[history.CaseResult]) -> Optional[int]:
+        """Append the run to the history; None if it can't be written."""
+        try:
+            return history.record(problemid, mainclass, loc_language, files,
+                                  results)
+        except (OSError, sqlite3.Error) as ex:
+            Console().print(f"Run history not saved: {ex}",
+                            style='bold yellow')
+            return None
+
+    def lint_if_slow(self, problemid: str, loc_language: str,
+                     problem_root_folder: str, files: List[str],
+                     mainclass: str, seconds: float) -> None:
+        """Lint the solution when its slowest case is near the limit."""
+        metadata = utility.load_metadata(problem_root_folder, problemid)
+        cpu_limit = utility.parse_cpu_limit(metadata.get('cpu_limit'))
+        if cpu_limit is None or seconds < NEAR_LIMIT * cpu_limit:
+            return
+        Console().print(f"The slowest case took {seconds:.2f} s of the "
+                        f"{cpu_limit:g} s CPU limit; checking for slow "
+                        "patterns...", style='bold yellow')
+        lint.lint(lint.language_files(files, loc_language), loc_language,
+                  mainclass)
+
+    def test_variant(
+            self,
+            mainclass: str,
+            problem_root_folder: str,
+            files: List[str],
+            lang_config: Dict[Any, Any],
+            variant: str,
+            accuracy: float = inf,
+            jobs: int = 0,
+            cache: Optional[Path] = None
+    ) -> int:
+        """Run all cases against a debug or sanitize build in parallel.
+
+        The variant is cached next to the release build, so switching
+        between them never recompiles either. Sanitizer and debug-mode
+        reports are shown per case.
+
+        Returns:
+            int: number of passed cases
+        """
+        console = Console()
+        jobs = jobs or os.cpu_count() or 1
+        in_files = cases.find_input_files(problem_root_folder)
+        if not in_files:
+            console.print("No sample input files found!", style="bold red")
+            exit(1)
+        try:
+            variant_config = build_cache.variant_config(lang_config, variant)
+            with console.status(f"Building the {variant} variant..."):
+                command, folder = build_cache.build_program(
+                    variant_config, files, mainclass, cache)
+        except build_cache.BuildError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+        console.print(f"Compile command: {variant_config['compile']}",
+                      style='bold blue')
+        env = build_cache.SANITIZER_ENV if variant == 'sanitize' else None
+
+        def _run(in_file: Path) -> Tuple[str, float, str]:
+            code, ans, error, seconds = run_program.measure(
+                command, str(in_file), folder, None, env)
+            verdict = grade(code, ans, cases.answer_file(in_file), accuracy)
+            return verdict, seconds, error
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor, \
+                console.status(f"Running {len(in_files)} cases..."):
+            results = list(executor.map(_run, in_files))
+
+        table = Table(title=f"[not italic bold blue]👷‍ Testing {mainclass} "
+                      f"({variant} build)[/]",
+                      header_style="bold blue", show_lines=True)
+        table.box = box.SQUARE
+        table.add_column("Input File", justify="center", style="cyan")
+        table.add_column("Result", justify="center")
+        table.add_column("Time (s)", justify="right", style="cyan")
+        table.add_column("Report", justify="left", no_wrap=False)
+        passed = 0
+        for in_file, (verdict, seconds, error) in zip(in_files, results):
+            if verdict in ('AC', 'OK'):
+                passed += 1
+            style = 'bold green' if verdict in ('AC', 'OK') else 'bold red'
+            table.add_row(in_file.name, f'[{style}]{verdict}[/]',
+                          f'{seconds:.3f}', escape(runtime_report(error)))
+        console.print(table)
+        console.print(f"{passed}/{len(in_files)} tests passed.")
+        return passed
+
+
+def runtime_report(error: str, lines: int = 8) -> str:
+    """Extract the sanitizer or debug-mode report from a program's stderr.
+
+    Returns:
+        str: the first lines of the report, or '' when there is none
+    """
+    markers = ('ERROR: AddressSanitizer', 'runtime error:',
+               'ERROR: LeakSanitizer', 'Error: ', 'Assertion',
+               'SUMMARY: ')
+    error_lines = error.splitlines()
+    for i, line in enumerate(error_lines):
+        if any(marker in line for marker in markers):
+            report = [re.sub(r'^=*\d*=+', '', line.strip())]
+            # keep the frames of the program, skip the runtime's own
+            frames = [frame.strip() for frame in error_lines[i + 1:]
+                      if frame.lstrip().startswith('#')]
+            report += [frame for frame in frames
+                       if 'libsanitizer' not in frame][:lines - 1]
+            return '\n'.join(report)
+    return ''
+
 
 # Default manager for module-level compatibility
 _tester = SolutionTester()
@@ -233,7 +395,11 @@ def test_samples(
         problem_root_folder: str,
         files: List[str],
         lang_config: Dict[Any, Any],
-        accuracy: float = inf
+        accuracy: float = inf,
+        variant: str = 'release',
+        jobs: int = 0,
+        budget: bool = False,
+        cache: Optional[Path] = None
 ) -> None:
     """Module-level wrapper delegating to the :class:`SolutionTester`.
 
@@ -243,4 +409,4 @@ def test_samples(
 
     return _tester.test_samples(problemid, loc_language, mainclass,
                                 problem_root_folder, files, lang_config,
-                                accuracy)
+                                accuracy, variant, jobs, budget, cache)
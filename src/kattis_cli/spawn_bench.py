@@ -0,0 +1,95 @@
+"""Measure the per-case overhead of spawning programs.
+
+Runs a trivial command many times through the default ``Popen`` setup
+the runner used before (text-mode input, ``close_fds``, PATH lookup by
+exec) and through :func:`run_program.measure`, and reports the latency
+per case of both. The difference is what thousands of short cases pay
+for process creation alone.
+"""
+
+from typing import Dict, List, Optional
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from kattis_cli.utils import run_program
+
+BEFORE = 'Popen defaults'
+AFTER = 'run_program'
+
+
+def legacy_run(command: List[str], in_file: str,
+               cwd: Optional[str] = None) -> float:
+    """Run the command the way the runner used to and time it."""
+    start = time.perf_counter()
+    with open(in_file, 'r', encoding='utf-8') as filein:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, stdin=filein,
+                                   cwd=cwd)
+        process.communicate()
+    return time.perf_counter() - start
+
+
+class SpawnBenchmark:
+    """Compares the spawn latency of the old and the current runner."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def bench(self, command: List[str], runs: int = 500,
+              cwd: Optional[str] = None) -> Dict[str, List[float]]:
+        """Time runs of the command through both runners, interleaved.
+
+        Returns:
+            Dict[str, List[float]]: seconds of every run of each runner
+        """
+        timings: Dict[str, List[float]] = {BEFORE: [], AFTER: []}
+        fd, in_file = tempfile.mkstemp(suffix='.in')
+        os.write(fd, b'1\n')
+        os.close(fd)
+        try:
+            for _ in range(runs):
+                timings[BEFORE].append(legacy_run(command, in_file, cwd))
+                timings[AFTER].append(
+                    run_program.measure(command, in_file, cwd)[3])
+        finally:
+            os.remove(in_file)
+        return timings
+
+    def print_report(self, timings: Dict[str, List[float]]) -> None:
+        """Print the median and mean latency per case of each runner."""
+        table = Table(title="[not italic bold blue]⏱ Spawn latency[/]",
+                      header_style="bold blue")
+        table.box = box.SQUARE
+        table.add_column("Runner", justify="left", style="cyan")
+        table.add_column("Median (µs)", justify="right")
+        table.add_column("Mean (µs)", justify="right")
+        table.add_column("Runs", justify="right")
+        for runner, seconds in timings.items():
+            table.add_row(runner, f'{statistics.median(seconds) * 1e6:.0f}',
+                          f'{statistics.mean(seconds) * 1e6:.0f}',
+                          str(len(seconds)))
+        self.console.print(table)
+        before = statistics.median(timings[BEFORE])
+        after = statistics.median(timings[AFTER])
+        if after:
+            self.console.print(f"Per-case speedup: ×{before / after:.2f}",
+                               style='bold green')
+
+
+# Default benchmark for module-level compatibility
+_benchmark = SpawnBenchmark()
+
+
+def spawn_bench(command: List[str], runs: int = 500,
+                cwd: Optional[str] = None) -> Dict[str, List[float]]:
+    """Benchmark and report the spawn latency of the command."""
+
+    timings = _benchmark.bench(command, runs, cwd)
+    _benchmark.print_report(timings)
+    return timings
@@ -0,0 +1,209 @@
+"""Stress test a solution against a brute-force reference solution.
+
+Random inputs are produced by a generator program called with an
+incrementing seed (``gen <seed>``) and fed to both the solution and the
+reference, fanned out over all cores. The first mismatching seed is saved
+into the problem's data folder as a new test case.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait
+from math import inf
+import os
+import shutil
+import tempfile
+import time
+from rich.console import Console
+from rich.markup import escape
+
+from kattis_cli.utils import build_cache, cases, run_program, utility
+
+# Outcome of one seed: seed, verdict, input file, solution output,
+# reference output
+StressResult = Tuple[int, str, str, str, str]
+
+
+class StressTester:
+    """Compares a solution with a reference on generated random inputs."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def run_seed(self,
+                 seed: int,
+                 gen: Tuple[List[str], Optional[str]],
+                 solution: Tuple[List[str], Optional[str]],
+                 reference: Tuple[List[str], Optional[str]],
+                 work_folder: str,
+                 accuracy: float = inf) -> StressResult:
+        """Generate the input for a seed and compare both programs.
+
+        Args:
+            seed (int): generator seed
+            gen: run command and folder of the generator
+            solution: run command and folder of the solution
+            reference: run command and folder of the reference
+            work_folder (str): folder for the generated input
+            accuracy (float): decimal places for float comparison
+
+        Returns:
+            StressResult: verdict is one of OK, WA, RTE, GEN or REF
+        """
+        code, text, error = run_program.execute(
+            gen[0] + [str(seed)], os.devnull, gen[1], None,
+            build_cache.run_env(gen[0]))
+        in_file = os.path.join(work_folder, f'{seed}.in')
+        if code != 0:
+            return seed, 'GEN', in_file, error, ''
+        with open(in_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        code, expected, error = run_program.execute(
+            reference[0], in_file, reference[1], None,
+            build_cache.run_env(reference[0]))
+        if code != 0:
+            return seed, 'REF', in_file, error, ''
+        code, ans, error = run_program.execute(
+            solution[0], in_file, solution[1], None,
+            build_cache.run_env(solution[0]))
+        if code != 0:
+            return seed, 'RTE', in_file, error, expected
+        if not utility.check_answer(expected, ans, accuracy):
+            return seed, 'WA', in_file, ans, expected
+        os.remove(in_file)
+        return seed, 'OK', in_file, ans, expected
+
+    def save_case(self, problem_root_folder: str,
+                  result: StressResult) -> str:
+        """Save the input and reference answer of a failing seed.
+
+        Returns:
+            str: the saved input file
+        """
+        seed, _, in_file, _, expected = result
+        folder = cases.data_folder(problem_root_folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        saved = folder.joinpath(f'stress-{seed}.in')
+        shutil.copyfile(in_file, saved)
+        saved.with_suffix('.ans').write_text(expected, encoding='utf-8')
+        return str(saved)
+
+    def stress(
+            self,
+            mainclass: str,
+            problem_root_folder: str,
+            files: List[str],
+            lang_config: Dict[Any, Any],
+            generator: str,
+            reference: str,
+            seconds: float = 60,
+            iterations: int = 0,
+            seed: int = 1,
+            jobs: int = 0,
+            accuracy: float = inf) -> Optional[StressResult]:
+        """Run the stress test until a mismatch or the budget runs out.
+
+        Args:
+            seconds (float): time budget; 0 for no time limit
+            iterations (int): number of seeds to try; 0 for no limit
+            seed (int): first seed
+
+        Returns:
+            Optional[StressResult]: the failing seed or None
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        try:
+            gen = build_cache.build_file(generator)
+            ref = build_cache.build_file(reference)
+            sol = build_cache.build_program(lang_config, files, mainclass)
+        except build_cache.BuildError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+
+        failures: List[StressResult] = []
+        saved = ''
+        done = 0
+        next_seed = seed
+        start = time.perf_counter()
+
+        def _budget_left() -> bool:
+            if iterations and next_seed >= seed + iterations:
+                return False
+            elapsed = time.perf_counter() - start
+            return not seconds or elapsed < seconds
+
+        with tempfile.TemporaryDirectory() as work_folder, \
+                ThreadPoolExecutor(max_workers=jobs) as executor, \
+                console.status("Stress testing...") as status:
+            pending: Set[Future[StressResult]] = set()
+            while True:
+                while not failures and _budget_left() and \
+                        len(pending) < 2 * jobs:
+                    pending.add(executor.submit(
+                        self.run_seed, next_seed, gen, sol, ref,
+                        work_folder, accuracy))
+                    next_seed += 1
+                if not pending:
+                    break
+                finished, pending = wait(pending,
+                                         return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    done += 1
+                    if result[1] != 'OK':
+                        failures.append(result)
+                rate = done / (time.perf_counter() - start)
+                status.update(f"Stress testing... {done} cases, "
+                              f"{rate:.1f} cases/s")
+            failure = min(failures) if failures else None
+            if failure and failure[1] in ('WA', 'RTE'):
+                saved = self.save_case(problem_root_folder, failure)
+
+        elapsed = time.perf_counter() - start
+        console.print(f"{done} cases in {elapsed:.1f} s "
+                      f"({done / elapsed:.1f} cases/s) "
+                      f"using {jobs} jobs.", style='bold blue')
+        if not failure:
+            console.print("✅ No mismatch found.", style='bold green')
+            return None
+        failed_seed, verdict, _, output, expected = failure
+        if verdict == 'GEN':
+            console.print(f"❌ Generator failed for seed {failed_seed}:",
+                          style='bold red')
+            console.print(escape(output))
+        elif verdict == 'REF':
+            console.print(f"❌ Reference failed for seed {failed_seed}:",
+                          style='bold red')
+            console.print(escape(output))
+        else:
+            console.print(f"❌ {verdict} for seed {failed_seed}, saved as "
+                          f"{saved}", style='bold red')
+            console.print("Expected:", style='bold blue')
+            console.print(escape(expected))
+            console.print("Got:", style='bold blue')
+            console.print(escape(output))
+        return failure
+
+
+# Default stress tester for module-level compatibility
+_stress_tester = StressTester()
+
+
+def stress(
+        mainclass: str,
+        problem_root_folder: str,
+        files: List[str],
+        lang_config: Dict[Any, Any],
+        generator: str,
+        reference: str,
+        seconds: float = 60,
+        iterations: int = 0,
+        seed: int = 1,
+        jobs: int = 0,
+        accuracy: float = inf) -> Optional[StressResult]:
+    """Module-level wrapper delegating to :class:`StressTester`."""
+
+    return _stress_tester.stress(mainclass, problem_root_folder, files,
+                                 lang_config, generator, reference, seconds,
+                                 iterations, seed, jobs, accuracy)
@@ -0,0 +1,259 @@
+"""Benchmark a C/C++ solution under a matrix of compiler flags.
+
+Every variant of the configured compile command is built in parallel
+through the build cache and timed on the heaviest test cases. Profile
+guided optimization (PGO) is built by training an instrumented build on
+the same cases. The report tells which flags are actually faster and how
+(or whether) each of them can be used on Kattis, which compiles with its
+own fixed flags.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from math import inf
+import hashlib
+import os
+import shlex
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+from kattis_cli.compare import grade
+from kattis_cli.utils import build_cache, cases, run_program
+
+# variants built by default besides the configured flags and PGO
+DEFAULT_MATRIX = [
+    '-O3',
+    '-O2 -march=native',
+    '-O2 -funroll-loops',
+    '-O3 -march=native -funroll-loops',
+]
+BASELINE = 'configured'
+PGO = 'pgo'
+
+
+def kattis_note(flags: str) -> str:
+    """Explain whether the flags of a variant are available on Kattis."""
+    if flags == BASELINE:
+        return 'judge flags'
+    if flags == PGO:
+        return 'not available'
+    notes = []
+    tokens = shlex.split(flags)
+    if any(t.startswith('-O') and t != '-O2' or t.startswith('-f')
+           for t in tokens):
+        notes.append('#pragma GCC optimize')
+    if any(t.startswith('-m') for t in tokens):
+        notes.append('#pragma GCC target; judge CPU may differ')
+    return ', '.join(notes) or 'judge flags'
+
+
+def heaviest_cases(problem_root_folder: str, count: int) -> List[Path]:
+    """Return the count largest input files."""
+    in_files = cases.find_input_files(problem_root_folder)
+    in_files.sort(key=lambda f: f.stat().st_size, reverse=True)
+    return in_files[:count]
+
+
+class FlagTuner:
+    """Builds and benchmarks compile flag variants of a solution."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
+
+    def build_variant(self, lang_config: Dict[Any, Any], files: List[str],
+                      mainclass: str,
+                      flags: str) -> Tuple[List[str], Optional[str]]:
+        """Build one flag variant through the build cache."""
+        variant = dict(lang_config)
+        if flags != BASELINE:
+            variant['compile'] = build_cache.with_flags(
+                lang_config['compile'], flags)
+        return build_cache.build_program(variant, files, mainclass)
+
+    def build_pgo(self, lang_config: Dict[Any, Any], files: List[str],
+                  mainclass: str, in_files: List[Path],
+                  timeout: float) -> Tuple[List[str], Optional[str]]:
+        """Build with GCC profile guided optimization.
+
+        The instrumented build is trained on the given cases; profiles
+        live in the cache next to the builds, keyed by the instrumented
+        build and the training inputs, so they are reused. An absolute
+        -dumpdir makes the profile names independent of the folder the
+        program is built in.
+        """
+        digest = hashlib.sha256(
+            build_cache.build_key(lang_config, files).encode('utf-8'))
+        for in_file in in_files:
+            digest.update(cases.hash_case(in_file).encode('utf-8'))
+        profile = build_cache.cache_folder().joinpath(
+            'pgo', digest.hexdigest()[:32])
+        done = profile.joinpath('.trained')
+        dump = f'-dumpdir {shlex.quote(str(profile))}/'
+        if not done.is_file():
+            profile.mkdir(parents=True, exist_ok=True)
+            command, folder = self.build_variant(
+                lang_config, files, mainclass,
+                f'-fprofile-generate={shlex.quote(str(profile))} {dump}')
+            for in_file in in_files:
+                # sequential runs: concurrent runs would race on the
+                # profile files
+                code, _, error = run_program.execute(
+                    command, str(in_file), folder, timeout)
+                if code != 0:
+                    raise build_cache.BuildError(
+                        f'PGO training failed on {in_file.name}: {error}')
+            done.touch()
+        return self.build_variant(
+            lang_config, files, mainclass,
+            f'-fprofile-use={shlex.quote(str(profile))} {dump} '
+            '-fprofile-correction -Wno-missing-profile')
+
+    def benchmark(self, program: Tuple[List[str], Optional[str]],
+                  in_files: List[Path], repeat: int, timeout: float,
+                  accuracy: float = inf) -> Tuple[float, str]:
+        """Time a build on the cases, keeping the best of repeat runs.
+
+        Returns:
+            Tuple[float, str]: total seconds and the worst verdict
+        """
+        total = 0.0
+        verdict = 'AC'
+        for in_file in in_files:
+            best = inf
+            for _ in range(repeat):
+                code, output, _, seconds = run_program.measure(
+                    program[0], str(in_file), program[1], timeout)
+                best = min(best, seconds)
+                result = grade(code, output, cases.answer_file(in_file),
+                               accuracy)
+                if result not in ('AC', 'OK'):
+                    return inf, result
+                if result == 'OK':
+                    verdict = 'OK'
+            total += best
+        return total, verdict
+
+    def tune(self,
+             mainclass: str,
+             problem_root_folder: str,
+             files: List[str],
+             lang_config: Dict[Any, Any],
+             matrix: Optional[List[str]] = None,
+             pgo: bool = True,
+             count: int = 3,
+             repeat: int = 3,
+             jobs: int = 0,
+             timeout: float = 10,
+             accuracy: float = inf) -> List[Tuple[str, float, str]]:
+        """Benchmark flag variants of a C/C++ solution.
+
+        Builds run in parallel; benchmarks run one at a time so that the
+        variants do not compete for the CPU.
+
+        Args:
+            matrix (Optional[List[str]]): flag variants; DEFAULT_MATRIX
+                when None
+            pgo (bool): also build with profile guided optimization
+            count (int): number of heaviest cases to run
+            repeat (int): runs per case; the fastest counts
+
+        Returns:
+            List[Tuple[str, float, str]]: flags, seconds and verdict of
+                every variant, fastest first
+        """
+        console = self.console
+        jobs = jobs or os.cpu_count() or 1
+        if not build_cache.is_c_family(lang_config):
+            console.print("Flag tuning needs a C or C++ solution.",
+                          style='bold red')
+            exit(1)
+        in_files = heaviest_cases(problem_root_folder, count)
+        if not in_files:
+            console.print("No input files found!", style='bold red')
+            exit(1)
+        variants = [BASELINE] + list(DEFAULT_MATRIX if matrix is None
+                                     else matrix)
+        compiler = os.path.basename(shlex.split(lang_config['compile'])[0])
+        if pgo and compiler.startswith(('gcc', 'g++')):
+            variants.append(PGO)
+        elif pgo:
+            console.print(f"PGO is only supported with GCC, not {compiler}.",
+                          style='bold yellow')
+
+        def _build(flags: str) -> Tuple[List[str], Optional[str]]:
+            if flags == PGO:
+                return self.build_pgo(lang_config, files, mainclass,
+                                      in_files, timeout)
+            return self.build_variant(lang_config, files, mainclass, flags)
+
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as executor, \
+                    console.status(f"Building {len(variants)} variants..."):
+                programs = list(executor.map(_build, variants))
+        except build_cache.BuildError as ex:
+            console.print(escape(str(ex)), style='bold red')
+            exit(1)
+
+        results = []
+        names = ', '.join(f.name for f in in_files)
+        with console.status(f"Benchmarking on {names}...") as status:
+            for flags, program in zip(variants, programs):
+                status.update(f"Benchmarking {flags} on {names}...")
+                seconds, verdict = self.benchmark(program, in_files, repeat,
+                                                  timeout, accuracy)
+                results.append((flags, seconds, verdict))
+        self.print_report(results)
+        return sorted(results, key=lambda r: r[1])
+
+    def print_report(self, results: List[Tuple[str, float, str]]) -> None:
+        """Print the timings of the variants against the baseline."""
+        console = self.console
+        base = results[0][1]
+        table = Table(title="[not italic bold blue]⚙ Compiler flags[/]",
+                      header_style="bold blue")
+        table.box = box.SQUARE
+        table.add_column("Flags", justify="left", style="cyan")
+        table.add_column("Verdict", justify="center")
+        table.add_column("Time (s)", justify="right", style="cyan")
+        table.add_column("Speedup", justify="right")
+        table.add_column("On Kattis", justify="left")
+        for flags, seconds, verdict in sorted(results, key=lambda r: r[1]):
+            if seconds == inf:
+                table.add_row(escape(flags), f'[bold red]{verdict}[/]', '-',
+                              '-', kattis_note(flags))
+                continue
+            ratio = base / seconds if seconds else 1.0
+            style = 'green' if ratio >= 1.05 else \
+                'red' if ratio <= 0.95 else 'white'
+            table.add_row(escape(flags), verdict, f'{seconds:.3f}',
+                          f'[{style}]×{ratio:.2f}[/]', kattis_note(flags))
+        console.print(table)
+        console.print("Kattis compiles with its own flags: only the "
+                      "configured build reflects the judge. Optimization "
+                      "and target flags can be requested in the source "
+                      "with #pragma GCC; differences below ~5% are noise.",
+                      style='bold yellow')
+
+
+# Default tuner for module-level compatibility
+_tuner = FlagTuner()
+
+
+def tune(mainclass: str,
+         problem_root_folder: str,
+         files: List[str],
+         lang_config: Dict[Any, Any],
+         matrix: Optional[List[str]] = None,
+         pgo: bool = True,
+         count: int = 3,
+         repeat: int = 3,
+         jobs: int = 0,
+         timeout: float = 10,
+         accuracy: float = inf) -> List[Tuple[str, float, str]]:
+    """Module-level wrapper delegating to :class:`FlagTuner`."""
+
+    return _tuner.tune(mainclass, problem_root_folder, files, lang_config,
+                       matrix, pgo, count, repeat, jobs, timeout, accuracy)
@@ -0,0 +1,353 @@
+"""Compile programs into cached build folders.
+
+Each build lives in its own folder under the kattis-cli cache folder,
+keyed by a hash of the compile command and the source files. Programs
+are compiled and run inside their build folder, so several programs
+(e.g., a solution and an input generator) can be built side by side
+without overwriting each other's ``./a.out``, and unchanged sources are
+never compiled twice.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import os
+import shlex
+import shutil
+import tempfile
+from pathlib import Path
+
+from kattis_cli.utils import languages, config, objects, pch, run_program
+from kattis_cli.utils import nodejs, pyruntime, toolchains
+
+
+# extra compile flags of the build variants of C/C++ programs
+BUILD_VARIANTS = {
+    'release': '',
+    'debug': '-O0 -g -D_GLIBCXX_DEBUG -D_GLIBCXX_DEBUG_PEDANTIC',
+    'sanitize': '-O1 -g -fno-omit-frame-pointer '
+                '-fsanitize=address,undefined',
+}
+
+# runtime options of sanitized programs: report every error with a stack
+# trace and fail the run; leak checks need ptrace and don't matter here
+SANITIZER_ENV = {
+    'ASAN_OPTIONS': 'detect_leaks=0',
+    'UBSAN_OPTIONS': 'print_stacktrace=1:halt_on_error=1',
+}
+
+COMPILERS = ('gcc', 'g++', 'clang', 'clang++', 'cc', 'c++')
+
+
+class BuildError(Exception):
+    """Exception raised when a program fails to compile."""
+
+
+def is_c_family(lang_config: Dict[Any, Any]) -> bool:
+    """Return True if the language compiles with a C/C++ compiler."""
+    command = shlex.split(lang_config.get('compile', ''))
+    return bool(command) and os.path.basename(command[0]).startswith(
+        COMPILERS)
+
+
+def with_flags(compile_command: str, flags: str) -> str:
+    """Return the compile command with extra flags.
+
+    An optimization level in flags replaces the configured one, and
+    sanitizers, which need dynamic linking, drop -static.
+    """
+    extra = shlex.split(flags)
+    command = shlex.split(compile_command)
+    if any(flag.startswith('-O') for flag in extra):
+        command = [flag for flag in command if not flag.startswith('-O')]
+    if any(flag.startswith('-fsanitize') for flag in extra):
+        command = [flag for flag in command if flag != '-static']
+    return shlex.join(command[:1] + extra + command[1:])
+
+
+def variant_config(lang_config: Dict[Any, Any],
+                   variant: str) -> Dict[Any, Any]:
+    """Return the language config of a build variant.
+
+    Variants differ in their compile command, hence in their cache key,
+    so they are cached side by side.
+
+    Raises:
+        BuildError: when the language has no such variant
+    """
+    if variant == 'release':
+        return lang_config
+    if variant not in BUILD_VARIANTS or not is_c_family(lang_config):
+        raise BuildError(f'No {variant} build for this language; '
+                         'variants are available for C and C++.')
+    config_variant = dict(lang_config)
+    config_variant['compile'] = with_flags(lang_config['compile'],
+                                           BUILD_VARIANTS[variant])
+    return config_variant
+
+
+def cache_folder() -> Path:
+    """Return the kattis-cli cache folder.
+
+    Honors $XDG_CACHE_HOME and defaults to ~/.cache/kattis-cli.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or \
+        str(Path.home().joinpath('.cache'))
+    return Path(base).joinpath('kattis-cli')
+
+
+def link_or_copy(source: str, target: str) -> None:
+    """Hard link a file, or copy it to another file system."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def seed_build(cache: Path, key: str) -> bool:
+    """Link a finished build of the cache on disk into another cache.
+
+    A cache in memory (see :mod:`workspace`) starts empty; only the
+    builds a run asks for are taken from the cache on disk.
+
+    Returns:
+        bool: True when the build is now in the cache
+    """
+    source = cache_folder().joinpath('builds', key)
+    builds = cache.joinpath('builds')
+    if builds == source.parent or not source.is_dir():
+        return False
+    builds.mkdir(parents=True, exist_ok=True)
+    tmp_folder = tempfile.mkdtemp(prefix=f'{key}.', dir=builds)
+    try:
+        shutil.copytree(source, tmp_folder, symlinks=True,
+                        copy_function=link_or_copy, dirs_exist_ok=True)
+        os.rename(tmp_folder, builds.joinpath(key))
+    except OSError:
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+    return builds.joinpath(key).is_dir()
+
+
+def hash_file(file: str) -> str:
+    """Return the sha256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_key(lang_config: Dict[Any, Any], files: List[str]) -> str:
+    """Return the cache key of a build.
+
+    Args:
+        lang_config (Dict[Any, Any]): language config
+        files (List[str]): source files
+
+    Returns:
+        str: hex digest of the compile command and the sources
+    """
+    digest = hashlib.sha256(lang_config['compile'].encode('utf-8'))
+    for file in sorted(files):
+        digest.update(os.path.basename(file).encode('utf-8'))
+        digest.update(hash_file(file).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def compile_cached(
+        lang_config: Dict[Any, Any],
+        files: List[str],
+        cache: Optional[Path] = None) -> Tuple[int, str, str, Optional[str]]:
+    """Compile the files into their cached build folder.
+
+    Programs without a compile command are not built and run from the
+    current folder. C++ sources including <bits/stdc++.h> are compiled
+    with a cached precompiled header (see :mod:`pch`), and C/C++ programs
+    of several translation units are compiled file by file in parallel
+    through the object cache (see :mod:`objects`) before being linked.
+    Languages with a toolchain profile compile with their persistent
+    caches and daemons (see :mod:`toolchains`). Python sources are
+    byte-compiled by the interpreter that runs them (see
+    :mod:`pyruntime`); when that fails they run from source, which
+    reports the error. ``node -c`` checks every file (see
+    :mod:`nodejs`).
+
+    Args:
+        lang_config (Dict[Any, Any]): language config
+        files (List[str]): source files
+        cache (Optional[Path]): cache folder (default: cache_folder());
+            another cache takes the builds and objects it is missing
+            from the cache on disk
+
+    Returns:
+        Tuple[int, str, str, Optional[str]]: exit code, output, error
+            and the build folder (None when nothing was built)
+
+    Raises:
+        BuildError: when the compiler can't be run
+    """
+    disk_cache = cache_folder()
+    cache = cache or disk_cache
+    python = None if lang_config['compile'] else \
+        pyruntime.interpreter(lang_config)
+    if python is not None and not all(os.path.isfile(f) for f in files):
+        python = None
+    if not lang_config['compile'] and python is None:
+        return 0, '', '', None
+    builds = cache.joinpath('builds')
+    # bytecode depends on the interpreter's version, not on a command
+    key_config = {'compile': pyruntime.version(python)} if python \
+        else lang_config
+    build_folder = builds.joinpath(build_key(key_config, files))
+    if build_folder.is_dir() or seed_build(cache, build_folder.name):
+        return 0, '', '', str(build_folder)
+    builds.mkdir(parents=True, exist_ok=True)
+    # compile into a private folder and publish it atomically so
+    # concurrent builds of the same sources never see a partial build
+    tmp_folder = tempfile.mkdtemp(prefix=f'{build_folder.name}.',
+                                  dir=builds)
+    sources = [os.path.abspath(f) for f in files]
+    try:
+        # the precompiled header, the object cache and the toolchain
+        # profile change how, not what, is compiled, so they are not part
+        # of the key
+        if python is not None:
+            code, output, error = pyruntime.byte_compile(python, sources,
+                                                         tmp_folder)
+        elif nodejs.is_syntax_check(lang_config):
+            code, output, error = nodejs.check_syntax(lang_config, sources,
+                                                      tmp_folder)
+        elif is_c_family(lang_config) and \
+                len(objects.translation_units(sources)) > 1:
+            code, output, error = objects.compile_and_link(
+                lang_config, sources, tmp_folder, cache,
+                seed=disk_cache if cache != disk_cache else None)
+        else:
+            config_profile, env = toolchains.prepare(lang_config)
+            code, output, error = run_program.compile_program(
+                pch.inject(config_profile, files, cache), sources,
+                cwd=tmp_folder, env=env)
+        if code == 0:
+            os.rename(tmp_folder, build_folder)
+    except OSError as ex:
+        if python is not None:
+            return 0, '', '', None
+        if not build_folder.is_dir():
+            # a missing compiler, not a concurrent build of the sources
+            raise BuildError(f'Failed to compile: {ex}') from ex
+        code, output, error = 0, '', ''
+    finally:
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+    if code != 0:
+        if python is not None:
+            return 0, '', '', None
+        return code, output, error, None
+    return code, output, error, str(build_folder)
+
+
+def run_command(lang_config: Dict[Any, Any],
+                main_src_file: str,
+                build_folder: Optional[str],
+                files: List[str]) -> List[str]:
+    """Build the run command of a program compiled by compile_cached."""
+    return run_program.build_run_command(
+        lang_config,
+        main_file(lang_config, main_src_file, build_folder, files))
+
+
+def main_file(lang_config: Dict[Any, Any],
+              main_src_file: str,
+              build_folder: Optional[str],
+              files: List[str]) -> str:
+    """Return the main file of a program compiled by compile_cached.
+
+    The main file is made absolute when the program runs from its build
+    folder; byte-compiled Python programs run their main bytecode file.
+    """
+    if build_folder and not lang_config['compile'] and \
+            pyruntime.interpreter(lang_config):
+        return os.path.join(build_folder,
+                            pyruntime.pyc_name(main_src_file, files))
+    if build_folder and os.path.isfile(main_src_file):
+        return os.path.abspath(main_src_file)
+    return main_src_file
+
+
+def build_program(lang_config: Dict[Any, Any],
+                  files: List[str],
+                  mainclass: str,
+                  cache: Optional[Path] = None
+                  ) -> Tuple[List[str], Optional[str]]:
+    """Compile a program through the cache and return how to run it.
+
+    Args:
+        lang_config (Dict[Any, Any]): language config
+        files (List[str]): source files
+        mainclass (str): main file or main class
+        cache (Optional[Path]): cache folder (default: cache_folder())
+
+    Returns:
+        Tuple[List[str], Optional[str]]: run command and the folder to
+            run it from
+
+    Raises:
+        BuildError: when compilation fails
+    """
+    code, _, error, build_folder = compile_cached(lang_config, files, cache)
+    if code != 0:
+        raise BuildError(error)
+    main_src_file = languages.find_main_source(files, mainclass)
+    return run_command(lang_config, main_src_file, build_folder, files), \
+        build_folder
+
+
+def run_env(command: List[str],
+            cache: Optional[Path] = None) -> Optional[Dict[str, str]]:
+    """Return the extra environment to run a built program with.
+
+    Node.js programs get the on-disk compile cache of the cache folder
+    (see :mod:`nodejs`); other programs need nothing.
+
+    Args:
+        command (List[str]): run command
+        cache (Optional[Path]): cache folder (default: cache_folder())
+
+    Returns:
+        Optional[Dict[str, str]]: extra environment variables, or None
+    """
+    if not command or os.path.basename(command[0]) != 'node':
+        return None
+    return nodejs.compile_cache_env(cache or cache_folder()) or None
+
+
+def build_file(file: str,
+               cache: Optional[Path] = None
+               ) -> Tuple[List[str], Optional[str]]:
+    """Compile a single-file helper program (generator, reference, ...).
+
+    The language is guessed from the file extension and configured from
+    .kattis-cli.toml.
+
+    Args:
+        file (str): source file
+        cache (Optional[Path]): cache folder (default: cache_folder())
+
+    Returns:
+        Tuple[List[str], Optional[str]]: run command and the folder to
+            run it from
+
+    Raises:
+        BuildError: when the language is unknown or compilation fails
+    """
+    _, ext = os.path.splitext(file)
+    loc_language = languages.guess_language(ext, [file])
+    if not loc_language:
+        raise BuildError(f'Failed to guess language of {file}.')
+    lang_config = config.parse_config(loc_language)
+    kat_language = languages.LOCAL_TO_KATTIS[loc_language]
+    problemid = os.path.splitext(os.path.basename(file))[0]
+    mainclass = languages.guess_mainclass(
+        problemid, kat_language, [file], lang_config)
+    if not mainclass:
+        mainclass = languages.guess_mainfile(
+            kat_language, [file], problemid, lang_config)
+    return build_program(lang_config, [file], mainclass, cache)
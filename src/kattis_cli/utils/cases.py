@@ -0,0 +1,215 @@
+"""Locate test cases (input/answer pairs) in a problem's data folder.
+
+Inputs and answers may be stored compressed (``1.in.gz``, ``1.ans.xz``,
+``1.in.zst`` when the zstandard module is installed); they are read
+through streaming decompressors and never inflated on disk.
+"""
+
+from pathlib import Path
+from typing import Any, IO, Iterator, List, Optional, Union, cast
+import gzip
+import hashlib
+import io
+import lzma
+
+# suffixes of the supported compression formats
+COMPRESSIONS = ('.gz', '.xz', '.zst')
+
+
+def _load_zstandard() -> Any:
+    """Import the optional zstandard module."""
+    try:
+        import zstandard
+    except ImportError as ex:
+        raise ValueError(
+            'Reading .zst files requires zstandard: '
+            'pip install zstandard') from ex
+    return zstandard
+
+
+def has_zstandard() -> bool:
+    """Return True if the optional zstandard module is installed."""
+    try:
+        _load_zstandard()
+    except ValueError:
+        return False
+    return True
+
+
+def is_compressed(file: Union[str, Path]) -> bool:
+    """Return True if the file is stored in a compressed format."""
+    return Path(file).suffix in COMPRESSIONS
+
+
+def case_file(file: Union[str, Path]) -> Path:
+    """Return the file without its compression suffix (1.in.gz -> 1.in)."""
+    path = Path(file)
+    return path.with_suffix('') if is_compressed(path) else path
+
+
+def case_name(in_file: Union[str, Path]) -> str:
+    """Return the name of a test case (data/1.in.gz -> 1)."""
+    return case_file(in_file).stem
+
+
+def open_binary(file: Union[str, Path]) -> IO[bytes]:
+    """Open a (possibly compressed) file as a decompressed binary stream.
+
+    Args:
+        file (Union[str, Path]): plain or .gz/.xz/.zst file
+
+    Returns:
+        IO[bytes]: stream of the decompressed content
+    """
+    suffix = Path(file).suffix
+    if suffix == '.gz':
+        return cast(IO[bytes], gzip.open(file, 'rb'))
+    if suffix == '.xz':
+        return cast(IO[bytes], lzma.open(file, 'rb'))
+    if suffix == '.zst':
+        zstandard = _load_zstandard()
+        reader: IO[bytes] = zstandard.ZstdDecompressor().stream_reader(
+            open(file, 'rb'), closefd=True)
+        return reader
+    return open(file, 'rb')
+
+
+def open_output(file: Union[str, Path]) -> IO[bytes]:
+    """Open a file for writing, compressing by its suffix.
+
+    Args:
+        file (Union[str, Path]): plain or .gz/.xz/.zst file
+
+    Returns:
+        IO[bytes]: binary stream compressing into the file
+    """
+    suffix = Path(file).suffix
+    if suffix == '.gz':
+        return cast(IO[bytes], gzip.open(file, 'wb', compresslevel=6))
+    if suffix == '.xz':
+        return cast(IO[bytes], lzma.open(file, 'wb'))
+    if suffix == '.zst':
+        zstandard = _load_zstandard()
+        writer: IO[bytes] = zstandard.ZstdCompressor().stream_writer(
+            open(file, 'wb'), closefd=True)
+        return writer
+    return open(file, 'wb')
+
+
+def open_text(file: Union[str, Path]) -> IO[str]:
+    """Open a (possibly compressed) file as a decompressed text stream."""
+    return io.TextIOWrapper(open_binary(file), encoding='utf-8')
+
+
+def read_text(file: Union[str, Path]) -> str:
+    """Read the whole decompressed content of a file."""
+    with open_text(file) as f:
+        return f.read()
+
+
+def preview(file: Union[str, Path], limit: int = 10000) -> str:
+    """Return up to limit characters of a file for display."""
+    with open_text(file) as f:
+        text = f.read(limit)
+        if f.read(1):
+            text += '\n...'
+    return text
+
+
+def iter_lines(file: Union[str, Path]) -> Iterator[str]:
+    """Stream the decompressed lines of a file."""
+    with open_text(file) as f:
+        yield from f
+
+
+def hash_case(file: Union[str, Path]) -> str:
+    """Return the sha256 hex digest of a file's decompressed content.
+
+    The digest does not change when a file is compressed.
+    """
+    digest = hashlib.sha256()
+    with open_binary(file) as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_folder(problem_root_folder: Union[str, Path]) -> Path:
+    """Return the data folder of a problem.
+
+    Args:
+        problem_root_folder (Union[str, Path]): root problem folder
+
+    Returns:
+        Path: Path object of the data folder
+    """
+    return Path(problem_root_folder).joinpath('data')
+
+
+def find_input_files(problem_root_folder: Union[str, Path]) -> List[Path]:
+    """Find all the input files of a problem, sorted by name.
+
+    Compressed inputs are included; a plain input wins over a compressed
+    one of the same case.
+
+    Args:
+        problem_root_folder (Union[str, Path]): root problem folder
+
+    Returns:
+        List[Path]: sorted list of .in files
+    """
+    folder = data_folder(problem_root_folder)
+    in_files = {}
+    for suffix in reversed(('',) + COMPRESSIONS):
+        if suffix == '.zst' and not has_zstandard():
+            continue
+        for in_file in folder.glob(f'*.in{suffix}'):
+            in_files[case_name(in_file)] = in_file
+    return sorted(in_files.values(), key=lambda f: case_file(f).name)
+
+
+def answer_file(in_file: Union[str, Path]) -> Optional[Path]:
+    """Find the answer file (.ans or .out) for the given input file.
+
+    Args:
+        in_file (Union[str, Path]): input file
+
+    Returns:
+        Optional[Path]: answer file or None if there is none
+    """
+    for ext in ('.ans', '.out'):
+        ans_file = answer_path(in_file, ext)
+        for suffix in ('',) + COMPRESSIONS:
+            candidate = Path(f'{ans_file}{suffix}')
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def answer_path(in_file: Union[str, Path], ext: str = '.ans') -> Path:
+    """Return the plain answer file to write for an input file."""
+    return case_file(in_file).with_suffix(ext)
+
+
+def resolve_case(problem_root_folder: Union[str, Path], case: str) -> Path:
+    """Resolve a test case name to its input file.
+
+    A case can be given as a path to an input file or as a file name
+    (with or without the .in or compressed extension) inside the data
+    folder.
+
+    Args:
+        problem_root_folder (Union[str, Path]): root problem folder
+        case (str): case name or path
+
+    Returns:
+        Path: the input file of the case
+    """
+    folder = data_folder(problem_root_folder)
+    names = [case] + [f'{case}.in{suffix}' for suffix in ('',) + COMPRESSIONS]
+    candidates = [Path(name) for name in names]
+    candidates += [folder.joinpath(name) for name in names]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"Error: test case {case} not found in {folder}.")
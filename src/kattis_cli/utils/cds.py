@@ -0,0 +1,100 @@
+"""Cut JVM startup with an application class-data sharing (AppCDS) archive.
+
+Loading and verifying classes is most of the runtime of a Java or Kotlin
+solution on small cases. After the first successful compile, the program
+runs once with ``-XX:ArchiveClassesAtExit`` to dump the classes it loads
+into ``app.jsa`` in its build folder; later runs map the archive with
+``-XX:SharedArchiveFile``. The build folder is keyed by the sources, so
+the archive is rebuilt whenever the class files change. A JVM that can't
+use an archive ignores it, so semantics never change.
+"""
+
+from typing import Any, Dict, List, Optional
+import os
+import shlex
+import tempfile
+from pathlib import Path
+
+from kattis_cli.utils import run_program
+
+ARCHIVE = 'app.jsa'
+# JVM options are passed as is to java and with -J to kotlin
+LAUNCHERS = {'java': '', 'kotlin': '-J'}
+# CDS warnings go to stdout, where they would fail the answer
+QUIET = '-Xlog:cds*=off'
+
+
+def launcher(execute: str) -> Optional[str]:
+    """Return the JVM launcher of an execute command, if any."""
+    command = shlex.split(execute)
+    if command and os.path.basename(command[0]) in LAUNCHERS:
+        return os.path.basename(command[0])
+    return None
+
+
+def with_jvm_flags(execute: str, flags: List[str]) -> str:
+    """Return the execute command passing flags to the JVM."""
+    # split as text: the {mainfile} placeholder must stay unquoted
+    command = execute.split(None, 1)
+    prefix = LAUNCHERS[os.path.basename(command[0])]
+    return ' '.join(command[:1] + [shlex.quote(prefix + flag)
+                                   for flag in flags] + command[1:])
+
+
+def build_archive(lang_config: Dict[Any, Any], main_src_file: str,
+                  build_folder: str, in_file: str,
+                  timeout: float = 10) -> Optional[Path]:
+    """Return the archive of a build, dumping it on a training run.
+
+    Args:
+        lang_config (Dict[Any, Any]): language config
+        main_src_file (str): main file or main class
+        build_folder (str): build folder of the compiled program
+        in_file (str): input of the training run
+        timeout (float): seconds after which the training run is killed
+
+    Returns:
+        Optional[Path]: the archive, or None when the JVM didn't dump one
+    """
+    archive = Path(build_folder, ARCHIVE)
+    if archive.is_file():
+        return archive
+    fd, tmp_archive = tempfile.mkstemp(suffix='.jsa', dir=build_folder)
+    os.close(fd)
+    os.remove(tmp_archive)
+    config_dump = dict(lang_config)
+    config_dump['execute'] = with_jvm_flags(
+        lang_config['execute'],
+        [f'-XX:ArchiveClassesAtExit={tmp_archive}', QUIET])
+    command = run_program.build_run_command(config_dump, main_src_file)
+    try:
+        # the verdict doesn't matter, only the classes loaded
+        run_program.execute(command, in_file, build_folder, timeout)
+    except OSError:
+        return None
+    if not os.path.isfile(tmp_archive) or not os.path.getsize(tmp_archive):
+        Path(tmp_archive).unlink(missing_ok=True)
+        return None
+    os.replace(tmp_archive, archive)
+    return archive
+
+
+def inject(lang_config: Dict[Any, Any], main_src_file: str,
+           build_folder: Optional[str], in_file: str) -> Dict[Any, Any]:
+    """Return the language config running with the build's archive.
+
+    The config is returned unchanged for programs that don't run on the
+    JVM or weren't built, when ``cds = false`` is set in the language
+    config, or when the JVM can't dump an archive.
+    """
+    if not build_folder or not lang_config.get('cds', True) or \
+            launcher(lang_config['execute']) is None:
+        return lang_config
+    archive = build_archive(lang_config, main_src_file, build_folder,
+                            in_file)
+    if archive is None:
+        return lang_config
+    config_cds = dict(lang_config)
+    config_cds['execute'] = with_jvm_flags(
+        lang_config['execute'], [f'-XX:SharedArchiveFile={archive}', QUIET])
+    return config_cds
@@ -0,0 +1,147 @@
+"""Extract input constraints such as ``1 ≤ n ≤ 10^5`` from statements.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from fractions import Fraction
+import re
+
+# larger exponents are typos, and their powers too slow to compute
+MAX_EXPONENT = 1000
+
+_TEX_REPLACEMENTS = [
+    (r'\\leq?(?![a-zA-Z])|≤|\\leqslant', '<='),
+    (r'\\geq?(?![a-zA-Z])|≥|\\geqslant', '>='),
+    (r'\\lt(?![a-zA-Z])', '<'),
+    (r'\\gt(?![a-zA-Z])', '>'),
+    (r'\\cdot(?![a-zA-Z])|\\times(?![a-zA-Z])|×|·', '*'),
+    (r'\\[,;:! ]|~|\\thinspace|\\mathrm|\\text', ''),
+    (r'[{}$]', ''),
+]
+
+_NUMBER = r'-?\d+(?:\.\d+)?(?:\*\d+)?(?:\^-?\d+)?'
+_NAMES = r'[A-Za-z]\w*(?:\s*,\s*[A-Za-z]\w*)*'
+_RANGE = re.compile(
+    rf'^({_NUMBER})(<=?)({_NAMES})(<=?)({_NUMBER})$')
+
+
+def normalize(tex: str) -> str:
+    """Normalize TeX/Unicode math to plain ``<=``/``<`` comparisons.
+
+    Thousands separators (``100\\,000``, ``100{,}000``) are removed and
+    ``>``/``>=`` chains are flipped.
+    """
+    text = tex
+    for pattern, replacement in _TEX_REPLACEMENTS:
+        text = re.sub(pattern, replacement, text)
+    text = re.sub(r'(?<=\d)\s+(?=\d{3}\b)', '', text)
+    text = re.sub(r'(?<=\d),(?=\d{3}\b)', '', text)
+    text = re.sub(r'\s+', '', text)
+    if '>' in text and '<' not in text:
+        parts = re.split(r'(>=?)', text)
+        parts = [p.replace('>', '<') for p in reversed(parts)]
+        text = ''.join(parts)
+    return text
+
+
+def evaluate(number: str) -> Optional[int]:
+    """Evaluate numbers such as 10^5, 2*10^5 or 1000000.
+
+    The value is computed exactly, so 999999999999999999 stays itself.
+
+    Returns:
+        Optional[int]: the integer value or None for non-integers and
+            absurdly large exponents
+    """
+    value = Fraction(1)
+    for factor in number.split('*'):
+        base, _, exponent = factor.partition('^')
+        power = int(exponent) if exponent else 1
+        if abs(power) > MAX_EXPONENT:
+            return None
+        try:
+            value *= Fraction(base) ** power
+        except ZeroDivisionError:
+            return None
+    if value.denominator != 1:
+        return None
+    return value.numerator
+
+
+def parse_constraint(tex: str) -> List[Tuple[str, Optional[int],
+                                             Optional[int]]]:
+    """Parse a range such as ``1 \\leq n, m \\leq 10^5``.
+
+    Only two-sided ranges with numeric bounds are recognized; one-sided
+    comparisons in statements are mostly conditions, not constraints.
+
+    Args:
+        tex (str): math expression of the statement
+
+    Returns:
+        List[Tuple[str, Optional[int], Optional[int]]]: (name, min, max)
+            per variable; a bound is None when it is not an integer
+    """
+    match = _RANGE.match(normalize(tex))
+    if not match:
+        return []
+    low, high = evaluate(match.group(1)), evaluate(match.group(5))
+    if low is not None and match.group(2) == '<':
+        low += 1
+    if high is not None and match.group(4) == '<':
+        high -= 1
+    return [(name.strip(), low, high) for name in match.group(3).split(',')]
+
+
+def merge(constraints: Dict[str, Dict[str, int]],
+          name: str, low: Optional[int], high: Optional[int]) -> None:
+    """Merge a constraint, keeping the widest range of a variable.
+
+    Subtasks state narrower ranges than the full problem, so the widest
+    range is the one all inputs satisfy.
+    """
+    bounds = constraints.setdefault(name, {})
+    if low is not None:
+        bounds['min'] = min(bounds.get('min', low), low)
+    if high is not None:
+        bounds['max'] = max(bounds.get('max', high), high)
+    if not bounds:
+        del constraints[name]
+
+
+def extract_constraints(soup: Any) -> Dict[str, Dict[str, int]]:
+    """Extract input constraints from a problem statement.
+
+    Looks at the TeX math of the statement body and at plain-text
+    ``≤`` comparisons.
+
+    Args:
+        soup (Any): BeautifulSoup of the problem page
+
+    Returns:
+        Dict[str, Dict[str, int]]: variable -> {'min': .., 'max': ..}
+    """
+    body = soup.find('div', {'class': 'problembody'}) or soup
+    tex_class = {'class': 'tex2jax_process'}
+    expressions = [span.get_text() for span in
+                   body.find_all('span', tex_class)]
+    plain_text = ' '.join(text for text in body.find_all(string=True)
+                          if not text.find_parent('span', tex_class))
+    for sentence in re.split(r'[.;:\n]|,\s+(?=\D)', plain_text):
+        if '≤' in sentence or '≥' in sentence:
+            expressions.append(sentence)
+    constraints: Dict[str, Dict[str, int]] = {}
+    for expression in expressions:
+        for name, low, high in parse_constraint(expression):
+            merge(constraints, name, low, high)
+    return constraints
+
+
+def max_size(metadata: Dict[Any, Any], name: str = 'n') -> Optional[int]:
+    """Return the maximum of a constraint from problem metadata.
+
+    The name is matched case-insensitively.
+    """
+    for key, bounds in (metadata.get('constraints') or {}).items():
+        if str(key).lower() == name.lower() and 'max' in bounds:
+            return int(bounds['max'])
+    return None
@@ -253,71 +253,115 @@ def valid_extension(file: str) -> bool:
 
 
 # flake8: noqa: C901
-def update_args(problemid: str,
-                loc_language: str,
-                mainclass: str,
-                files: List[str]) -> Any:
-    """Check if problemid, language, mainclass, and program files are valid.
+def resolve_args(problemid: str,
+                 loc_language: str,
+                 mainclass: str,
+                 files: List[str],
+                 cur_folder: Path) -> Any:
+    """Resolve problemid, language, mainclass, and program files.
+
+    Works like :func:`update_args` for the problem at cur_folder, but
+    raises instead of exiting, so that many problems can be resolved.
 
     Args:
         problemid (str): problemid
         loc_language (str): programming language provided by user
         mainclass (str): main class
-        files (List[str]): List of files
+        files (List[str]): List of files; default the coding files of
+            cur_folder
+        cur_folder (Path): folder in the problem
 
     Returns:
-        Tuple[str]: Update problemid, kattis_language, mainclass, and files
-    """
+        Tuple[str]: Update problemid, kattis_language, mainclass, files,
+            root folder and language config
 
-    console = Console()
+    Raises:
+        ValueError: when no files, problemid or language can be found
+    """
     if not files:
-        files = get_coding_files(Path.cwd())
-    # check if problemid is given
-    # if not problemid:
-    cur_folder = Path.cwd()
-    root_folder = Path.cwd()
+        files = coding_files(cur_folder)
+        if not files:
+            raise ValueError(f'No source file(s) found in {cur_folder}!')
+    root_folder = cur_folder
     if not problemid:
         for f in files:
             try:
                 root_folder = find_problem_root_folder(
                     cur_folder, f.lower())
-                # if not problemid:
                 problemid = root_folder.name
                 break
             except FileNotFoundError:
-                # print(ex)
                 pass
     if not problemid:
         try:
             root_folder = find_problem_root_folder(
                 cur_folder, '*.yaml')
             problemid = root_folder.name
-        except FileNotFoundError:
-            console.print(f'''No problemid specified and I failed to guess
-problemid and root problem folder from filename(s) and cwd: {cur_folder}.''',
-                          style='bold red')
-            sys.exit(1)
+        except FileNotFoundError as ex:
+            raise ValueError(f'''No problemid specified and I failed to guess
+problemid and root problem folder from filename(s) and cwd: {cur_folder}.'''
+                             ) from ex
     # check if language
     if not loc_language:
         _, ext = os.path.splitext(os.path.basename(files[0]))
         # Guess language from files
         loc_language = guess_language(ext, files)
         if not loc_language:
-            console.print(f'''\
+            raise ValueError(f'''\
 No language specified, and I failed to guess language from
 filename extension "{ext}"''')
-            sys.exit(1)
-    # check if valid language
-    validate_language(loc_language)
+    if loc_language not in LOCAL_TO_KATTIS:
+        raise ValueError(f'Invalid language: "{loc_language}"')
     lang_config = config.parse_config(loc_language)
     kat_language = LOCAL_TO_KATTIS[loc_language]
     if not mainclass:
         mainclass = guess_mainclass(
             problemid, kat_language, files, lang_config)
-    # print(f'Returning...{problemid=} {language=} {mainclass=} {files=}')
     return problemid, loc_language, mainclass, files, root_folder, lang_config
 
 
+def update_args(problemid: str,
+                loc_language: str,
+                mainclass: str,
+                files: List[str]) -> Any:
+    """Check if problemid, language, mainclass, and program files are valid.
+
+    Args:
+        problemid (str): problemid
+        loc_language (str): programming language provided by user
+        mainclass (str): main class
+        files (List[str]): List of files
+
+    Returns:
+        Tuple[str]: Update problemid, kattis_language, mainclass, and files
+    """
+
+    console = Console()
+    if not files:
+        files = get_coding_files(Path.cwd())
+    # check if valid language
+    if loc_language:
+        validate_language(loc_language)
+    try:
+        return resolve_args(problemid, loc_language, mainclass, files,
+                            Path.cwd())
+    except ValueError as ex:
+        console.print(str(ex), style='bold red')
+        sys.exit(1)
+
+
+def coding_files(base_path: Path) -> List[str]:
+    """Get the coding files of a folder, or of its src folder.
+
+    Returns:
+        List[str]: List of coding files; empty if there are none.
+    """
+    if Path(base_path / "src").is_dir():
+        base_path = base_path / "src"
+    return [str(f) for f in base_path.rglob(
+        '*') if f.is_file() and valid_extension(str(f))]
+
+
 def get_coding_files(base_path: Path) -> List[str]:
     """Get coding files from current directory.
 
@@ -326,14 +370,26 @@ def get_coding_files(base_path: Path) -> List[str]:
     """
     if not base_path:
         base_path = Path.cwd()
-    if Path(base_path / "src").is_dir():
-        base_path = base_path / "src"
     console = Console()
-    files = [str(f) for f in base_path.rglob(
-        '*') if f.is_file() and valid_extension(str(f))]
+    files = coding_files(base_path)
     if not files:
+        if Path(base_path / "src").is_dir():
+            base_path = base_path / "src"
         console.print(
             f'No source file(s) found in {base_path}!',
             style='bold red')
         exit(1)
     return files
+
+
+def find_main_source(files: List[str], mainclass: str) -> str:
+    """Find the source file of the main file/class.
+
+    Args:
+        files (List[str]): List of program files
+        mainclass (str): main file or main class
+
+    Returns:
+        str: source file ending with mainclass or mainclass itself
+    """
+    return next((f for f in files if f.endswith(mainclass)), mainclass)
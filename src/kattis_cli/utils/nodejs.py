@@ -0,0 +1,79 @@
+"""Faster Node.js runs: on-disk compile cache and cached syntax checks.
+
+Node starts every run by parsing and compiling the solution with V8; on
+suites of many small cases that is most of the runtime. Node 22.1 and
+later keep V8's compiled code on disk when ``$NODE_COMPILE_CACHE`` names
+a folder, so Node programs run by kattis-cli get ``<cache>/node`` in
+their environment unless the variable is already set (older Node
+versions ignore it). The variable is passed per run, never set in this
+process, so runs on a ``--tmpfs`` cache and on the disk cache each use
+their own folder.
+
+``node -c`` only checks the first file it is given; the syntax check of
+the ``node -c`` compile command checks every file, and runs through the
+build cache, so only sources whose hash changed are checked again.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+import os
+import shlex
+import subprocess
+from pathlib import Path
+
+CHECK_FLAGS = ('-c', '--check')
+
+
+def is_node(lang_config: Dict[Any, Any]) -> bool:
+    """Return True if the language runs with Node.js."""
+    command = shlex.split(lang_config.get('execute', ''))
+    return bool(command) and os.path.basename(command[0]) == 'node'
+
+
+def is_syntax_check(lang_config: Dict[Any, Any]) -> bool:
+    """Return True if the compile command is Node's syntax check."""
+    command = shlex.split(lang_config.get('compile', ''))
+    return len(command) == 2 and os.path.basename(command[0]) == 'node' \
+        and command[1] in CHECK_FLAGS
+
+
+def compile_cache_env(cache: Path) -> Dict[str, str]:
+    """Return the environment that gives Node runs the cache's compile cache.
+
+    Args:
+        cache (Path): cache folder
+
+    Returns:
+        Dict[str, str]: extra environment variables (none when the user
+            set ``$NODE_COMPILE_CACHE``)
+    """
+    if 'NODE_COMPILE_CACHE' in os.environ:
+        return {}
+    folder = cache.joinpath('node')
+    folder.mkdir(parents=True, exist_ok=True)
+    return {'NODE_COMPILE_CACHE': str(folder)}
+
+
+def check_syntax(lang_config: Dict[Any, Any], files: List[str],
+                 cwd: str) -> Tuple[int, str, str]:
+    """Check the syntax of every JavaScript file in parallel.
+
+    Returns:
+        Tuple[int, str, str]: exit code, output and errors of the files
+    """
+    node = shlex.split(lang_config['compile'])[0]
+
+    def _check(file: str) -> Tuple[int, str, str]:
+        process = subprocess.run([node, '--check', file],
+                                 capture_output=True, text=True, cwd=cwd,
+                                 check=False)
+        return process.returncode, process.stdout, process.stderr
+
+    sources = [file for file in files
+               if file.endswith(('.js', '.mjs', '.cjs'))]
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        results = list(executor.map(_check, sources))
+    codes = [code for code, _, _ in results if code != 0]
+    return (codes[0] if codes else 0,
+            ''.join(output for _, output, _ in results),
+            ''.join(error for _, _, error in results))
@@ -0,0 +1,135 @@
+"""Compile multi-file C/C++ programs one translation unit at a time.
+
+Every source file is compiled to an object file in parallel, and the
+objects are cached under ``<cache>/objects`` by a key of the compiler
+version, the compile flags and the preprocessed source. A header change
+therefore only recompiles the files including it, and an edit of one
+file only recompiles that file before everything is linked again.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from kattis_cli.utils import pch
+
+SOURCE_SUFFIXES = ('.c', '.cc', '.cpp', '.cxx', '.c++')
+
+
+def translation_units(files: List[str]) -> List[str]:
+    """Return the files that compile to objects (not headers)."""
+    return [file for file in files
+            if os.path.splitext(file)[1].lower() in SOURCE_SUFFIXES]
+
+
+def object_key(flags: List[str], source: str) -> Optional[str]:
+    """Return the cache key of the object of a source file.
+
+    The key covers the compiler version, the flags and the preprocessed
+    source, whose line markers also keep debug information exact.
+
+    Returns:
+        Optional[str]: the key, or None when preprocessing fails
+    """
+    try:
+        result = subprocess.run(flags + ['-E', source],
+                                capture_output=True, check=False)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    digest = hashlib.sha256(pch.compiler_version(flags[0]).encode('utf-8'))
+    digest.update(shlex.join(flags[1:]).encode('utf-8'))
+    digest.update(result.stdout)
+    return digest.hexdigest()[:32]
+
+
+def compile_object(lang_config: Dict[Any, Any], source: str,
+                   cache: Path, seed: Optional[Path] = None
+                   ) -> Tuple[int, str, str, Optional[str]]:
+    """Compile one source file into the object cache.
+
+    An object missing in the cache is linked in from the ``seed`` cache
+    when it is there, not compiled again.
+
+    Returns:
+        Tuple[int, str, str, Optional[str]]: exit code, output, error and
+            the object file (None when compilation failed)
+    """
+    compile_command = pch.inject(lang_config, [source], cache)['compile']
+    command = shlex.split(compile_command)
+    flags = command[:1] + pch.header_flags(compile_command)
+    objects = cache.joinpath('objects')
+    key = object_key(flags, source)
+    if key is not None and objects.joinpath(f'{key}.o').is_file():
+        return 0, '', '', str(objects.joinpath(f'{key}.o'))
+    objects.mkdir(parents=True, exist_ok=True)
+    seeded = seed.joinpath('objects', f'{key}.o') if seed and key else None
+    if seeded is not None and seeded.is_file():
+        fd, tmp_object = tempfile.mkstemp(suffix='.o', dir=objects)
+        os.close(fd)
+        os.remove(tmp_object)
+        try:
+            os.link(seeded, tmp_object)
+        except OSError:
+            # the seed cache is on another file system
+            shutil.copy2(seeded, tmp_object)
+        os.replace(tmp_object, objects.joinpath(f'{key}.o'))
+        return 0, '', '', str(objects.joinpath(f'{key}.o'))
+    fd, tmp_object = tempfile.mkstemp(suffix='.o', dir=objects)
+    os.close(fd)
+    process = subprocess.run(flags + ['-c', source, '-o', tmp_object],
+                             capture_output=True, check=False)
+    output = process.stdout.decode('utf-8')
+    error = process.stderr.decode('utf-8')
+    if process.returncode != 0 or key is None:
+        os.remove(tmp_object)
+        return process.returncode or 1, output, error, None
+    object_file = objects.joinpath(f'{key}.o')
+    os.replace(tmp_object, object_file)
+    return 0, output, error, str(object_file)
+
+
+def compile_and_link(lang_config: Dict[Any, Any], files: List[str],
+                     cwd: str, cache: Path,
+                     jobs: int = 0,
+                     seed: Optional[Path] = None) -> Tuple[int, str, str]:
+    """Compile translation units in parallel and link them in cwd.
+
+    The link command is the configured compile command with the objects
+    in place of the sources, so it produces the same program.
+
+    Args:
+        lang_config (Dict[Any, Any]): language config
+        files (List[str]): absolute source and header files
+        cwd (str): build folder receiving the program
+        cache (Path): kattis-cli cache folder
+        jobs (int): parallel compiles (default: number of cores)
+        seed (Optional[Path]): cache to link missing objects from
+
+    Returns:
+        Tuple[int, str, str]: exit code, output and error
+    """
+    jobs = jobs or os.cpu_count() or 1
+    sources = translation_units(files)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(
+            lambda source: compile_object(lang_config, source, cache, seed),
+            sources))
+    output = ''.join(result[1] for result in results)
+    error = ''.join(result[2] for result in results)
+    failed = [result[0] for result in results if result[3] is None]
+    if failed:
+        return failed[0], output, error
+    command = shlex.split(lang_config['compile'])
+    command += [str(result[3]) for result in results]
+    process = subprocess.run(command, capture_output=True, cwd=cwd,
+                             check=False)
+    return (process.returncode, output + process.stdout.decode('utf-8'),
+            error + process.stderr.decode('utf-8'))
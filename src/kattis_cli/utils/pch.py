@@ -0,0 +1,144 @@
+"""Cache a precompiled <bits/stdc++.h> for C++ solutions compiled by GCC.
+
+Parsing <bits/stdc++.h> takes most of the compile time of a typical
+solution. A precompiled header (PCH) is built once per compiler version
+and flag set into ``<cache>/pch/<key>/bits/stdc++.h.gch``, and ``-I`` of
+that folder is injected into compile commands of sources including the
+header. GCC looks for ``.gch`` files before headers in every include
+folder and silently falls back to the real header when a PCH does not
+match the flags, so a stale or unusable PCH never breaks a build; the key
+still changes with the compiler and the flags, so a matching one is
+built.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import hashlib
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+HEADER = 'bits/stdc++.h'
+_INCLUDE = re.compile(r'^\s*#\s*include\s*<bits/stdc\+\+\.h>', re.MULTILINE)
+
+
+def is_gcc(compile_command: str) -> bool:
+    """Return True if the compile command runs GCC's C++ compiler."""
+    command = shlex.split(compile_command)
+    return bool(command) and os.path.basename(command[0]).startswith('g++')
+
+
+def uses_header(files: List[str]) -> bool:
+    """Return True if a source file includes <bits/stdc++.h>."""
+    for file in files:
+        try:
+            with open(file, 'r', encoding='utf-8', errors='ignore') as f:
+                if _INCLUDE.search(f.read()):
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+@lru_cache(maxsize=None)
+def compiler_version(compiler: str) -> str:
+    """Return the resolved path and version banner of a compiler."""
+    try:
+        banner = subprocess.run([compiler, '--version'],
+                                capture_output=True, text=True,
+                                check=False).stdout
+    except OSError:
+        banner = ''
+    return f'{shutil.which(compiler)}\n{banner}'
+
+
+def header_flags(compile_command: str) -> List[str]:
+    """Return the flags of a compile command that affect the header.
+
+    Linker flags are dropped; everything else must match for GCC to use
+    the PCH.
+    """
+    flags = []
+    tokens = iter(shlex.split(compile_command)[1:])
+    for token in tokens:
+        if token == '-o':
+            next(tokens, None)
+        elif token == '-static' or token.startswith(('-l', '-L', '-Wl,')):
+            continue
+        else:
+            flags.append(token)
+    return flags
+
+
+def pch_key(compile_command: str) -> str:
+    """Return the cache key of the PCH: compiler version and flags."""
+    compiler = shlex.split(compile_command)[0]
+    digest = hashlib.sha256(compiler_version(compiler).encode('utf-8'))
+    digest.update(shlex.join(header_flags(compile_command)).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def pch_folder(compile_command: str, cache: Path) -> Optional[Path]:
+    """Return the include folder holding the PCH, building it if needed.
+
+    Args:
+        compile_command (str): compile command of the solution
+        cache (Path): kattis-cli cache folder
+
+    Returns:
+        Optional[Path]: include folder, or None if the PCH can't be built
+    """
+    folders = cache.joinpath('pch')
+    folder = folders.joinpath(pch_key(compile_command))
+    if folder.joinpath(f'{HEADER}.gch').is_file():
+        return folder
+    folders.mkdir(parents=True, exist_ok=True)
+    # build privately and publish atomically, like builds
+    tmp_folder = Path(tempfile.mkdtemp(prefix=f'{folder.name}.',
+                                       dir=folders))
+    stub = tmp_folder.joinpath('stdc++.h')
+    stub.write_text(f'#include <{HEADER}>\n', encoding='utf-8')
+    gch = tmp_folder.joinpath(f'{HEADER}.gch')
+    gch.parent.mkdir()
+    command = shlex.split(compile_command)[:1] + \
+        header_flags(compile_command) + \
+        ['-x', 'c++-header', str(stub), '-o', str(gch)]
+    try:
+        built = subprocess.run(command, capture_output=True,
+                               check=False).returncode == 0
+    except OSError:
+        built = False
+    if built:
+        stub.unlink()
+        try:
+            os.rename(tmp_folder, folder)
+        except OSError:
+            pass
+    shutil.rmtree(tmp_folder, ignore_errors=True)
+    return folder if built else None
+
+
+def inject(lang_config: Dict[Any, Any], files: List[str],
+           cache: Path) -> Dict[Any, Any]:
+    """Return the language config compiling with the cached PCH.
+
+    The config is returned unchanged for other compilers, for sources
+    without <bits/stdc++.h>, when ``pch = false`` is set in the language
+    config, or when the PCH can't be built.
+    """
+    compile_command = lang_config['compile']
+    if not lang_config.get('pch', True) or not is_gcc(compile_command) \
+            or not uses_header(files):
+        return lang_config
+    folder = pch_folder(compile_command, cache)
+    if folder is None:
+        return lang_config
+    command = shlex.split(compile_command)
+    command[1:1] = ['-I', str(folder)]
+    config_pch = dict(lang_config)
+    config_pch['compile'] = shlex.join(command)
+    return config_pch
@@ -0,0 +1,104 @@
+"""Python runtimes: CPython, PyPy and byte-compiled solutions.
+
+Kattis can run Python 3 solutions with PyPy, whose JIT often turns a
+time limit exceeded into an accepted solution. The execute command of a
+Python language config can be switched to PyPy, and Python sources are
+byte-compiled by the interpreter that runs them into a cached build
+folder, so runs skip parsing and compiling the sources.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import shlex
+import shutil
+import subprocess
+
+RUNTIMES = {'cpython': 'python3', 'pypy': 'pypy3'}
+
+_BYTE_COMPILE = '''import py_compile, sys
+for source, target in zip(sys.argv[1::2], sys.argv[2::2]):
+    py_compile.compile(source, cfile=target, doraise=True)
+'''
+
+
+def interpreter(lang_config: Dict[Any, Any]) -> Optional[str]:
+    """Return the Python interpreter of an execute command, if any."""
+    command = shlex.split(lang_config.get('execute', ''))
+    if command and os.path.basename(command[0]).startswith(
+            ('python', 'pypy')):
+        return command[0]
+    return None
+
+
+def find_runtime(runtime: str) -> Optional[str]:
+    """Return the path of a runtime's interpreter, if it is installed."""
+    return shutil.which(RUNTIMES[runtime])
+
+
+def with_runtime(lang_config: Dict[Any, Any],
+                 runtime: str) -> Dict[Any, Any]:
+    """Return the language config running with another interpreter."""
+    # split as text: the {mainfile} placeholder must stay unquoted
+    arguments = lang_config['execute'].split(None, 1)[1:]
+    config_runtime = dict(lang_config)
+    config_runtime['execute'] = ' '.join([RUNTIMES[runtime]] + arguments)
+    return config_runtime
+
+
+@lru_cache(maxsize=None)
+def version(python: str) -> str:
+    """Return the resolved path and version of an interpreter.
+
+    Bytecode is specific to the implementation and version, so it is
+    part of the build key.
+    """
+    try:
+        banner = subprocess.run(
+            [python, '-c', 'import sys; print(sys.version)'],
+            capture_output=True, text=True, check=False).stdout
+    except OSError:
+        banner = ''
+    return f'{shutil.which(python)}\n{banner}'
+
+
+def pyc_name(file: str, files: List[str]) -> str:
+    """Return the path of the bytecode file of a source file.
+
+    The path is relative to the build folder and keeps the layout of the
+    sources below their common folder, so packages and subfolders still
+    import and equal basenames don't clash.
+
+    Args:
+        file (str): source file
+        files (List[str]): source files of the program
+    """
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f))
+                               for f in [file] + files
+                               if f == file or f.endswith('.py')])
+    relative = os.path.relpath(os.path.abspath(file), root)
+    return os.path.splitext(relative)[0] + '.pyc'
+
+
+def byte_compile(python: str, files: List[str],
+                 cwd: str) -> Tuple[int, str, str]:
+    """Byte-compile the sources into cwd, keeping their layout.
+
+    The bytecode files take the place of the sources: the interpreter
+    runs the main one and imports the others from where the sources
+    would be (see :func:`pyc_name`).
+
+    Returns:
+        Tuple[int, str, str]: exit code, output and error
+    """
+    args = []
+    for file in files:
+        if file.endswith('.py'):
+            args += [file, os.path.join(cwd, pyc_name(file, files))]
+    try:
+        process = subprocess.run([python, '-c', _BYTE_COMPILE] + args,
+                                 capture_output=True, text=True, cwd=cwd,
+                                 check=False)
+    except OSError as ex:
+        return 1, '', str(ex)
+    return process.returncode, process.stdout, process.stderr
@@ -1,9 +1,22 @@
 """Run the program with the given input file and return the output.
 """
 
+import hashlib
+import os
 import shlex
+import shutil
+import signal
 import subprocess
-from typing import Tuple, List, Dict, Any
+import sys
+import threading
+import time
+from functools import lru_cache
+from typing import IO, Tuple, List, Dict, Any, Optional
+
+from kattis_cli.utils import cases
+
+# exit code reported for programs killed after their timeout
+TIMEOUT_CODE = 124
 
 
 def build_compile_command(
@@ -22,12 +35,17 @@ def build_run_command(
 
 
 def compile_program(
-        lang_config: Dict[Any, Any], files: List[str]) -> Tuple[int, str, str]:
+        lang_config: Dict[Any, Any],
+        files: List[str],
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None) -> Tuple[int, str, str]:
     """Compile Program.
 
     Args:
         lang_config (Dict[Any, Any]): language config
         files (List[str]): List of files
+        cwd (Optional[str]): folder to compile in; default current folder
+        env (Optional[Dict[str, str]]): extra environment variables
     """
     command = build_compile_command(lang_config, files)
     # print(f'{command=}')
@@ -38,7 +56,9 @@ def compile_program(
     # Use Popen to execute the command
     process = subprocess.Popen(command,
                                stdout=subprocess.PIPE,
-                               stderr=subprocess.PIPE)
+                               stderr=subprocess.PIPE,
+                               cwd=cwd,
+                               env={**os.environ, **env} if env else None)
 
     # Wait for the process to finish and get the output and errors
     stdout, stderr = process.communicate()
@@ -51,13 +71,15 @@ def compile_program(
 
 def run(lang_config: Dict[Any, Any],
         mainclass: str,
-        input_file: str) -> Tuple[int, str, str]:
+        input_file: str,
+        cwd: Optional[str] = None) -> Tuple[int, str, str]:
     """Run the program with the given input file and return the output.
 
     Args:
         lang_config (str): programming language config
         mainclass (str): main file
         input_file (str): input file
+        cwd (Optional[str]): folder to run in; default current folder
 
     Returns:
         Tuple[str, str]: program output and error
@@ -65,34 +87,423 @@ def run(lang_config: Dict[Any, Any],
 
     program = build_run_command(lang_config, mainclass)
     # print(f'{program=}')
-    code, ans, error = execute(program, input_file)
+    code, ans, error = execute(program, input_file, cwd)
     return code, ans, error
 
 
-def execute(command: List[str], in_file: str) -> Tuple[int, str, str]:
+def run_usage(lang_config: Dict[Any, Any],
+              mainclass: str,
+              input_file: str,
+              cwd: Optional[str] = None,
+              env: Optional[Dict[str, str]] = None
+              ) -> Tuple[int, str, str, float, Optional[int]]:
+    """Run the program like :func:`run` and measure its time and memory.
+
+    Args:
+        env (Optional[Dict[str, str]]): extra environment variables
+
+    Returns:
+        Tuple[int, str, str, float, Optional[int]]: exit code, output,
+            error, seconds and peak memory in KiB (None when it can't be
+            measured)
+    """
+    program = build_run_command(lang_config, mainclass)
+    return measure_usage(program, input_file, cwd, None, env)
+
+
+def execute(command: List[str],
+            in_file: str,
+            cwd: Optional[str] = None,
+            timeout: Optional[float] = None,
+            env: Optional[Dict[str, str]] = None) -> Tuple[int, str, str]:
     """Execute the command with the given input file and return the output.
 
     Args:
         files (List[str]): List of files
     """
-    # print(f'{command=}')
+    code, output, error, _ = measure(command, in_file, cwd, timeout, env)
+    return code, output, error
 
-    # Set the g++ command and its arguments in a list
-    # command = [compiler, '-std=c++11', '-o', 'output_program', 'cold.cpp']
-    # command = [python3, 'main.py']
 
+@lru_cache(maxsize=None)
+def _which(program: str, path: Optional[str]) -> Optional[str]:
+    """Search PATH once per program instead of once per run."""
+    return shutil.which(program, path=path)
+
+
+def resolve_executable(program: str, cwd: Optional[str] = None,
+                       env: Optional[Dict[str, str]] = None) -> str:
+    """Return the absolute path of the program a command runs.
+
+    Relative paths are resolved against cwd and names are searched on
+    the PATH of env; unknown programs are returned as is so that Popen
+    reports them.
+    """
+    if os.sep in program:
+        return os.path.abspath(os.path.join(cwd or os.curdir, program))
+    path = (env or {}).get('PATH', os.environ.get('PATH'))
+    return _which(program, path) or program
+
+
+def _feed(in_file: str, fd: int) -> None:
+    """Stream the decompressed input file into a pipe and close it."""
+    try:
+        with cases.open_binary(in_file) as source, \
+                open(fd, 'wb', buffering=1 << 16) as pipe:
+            shutil.copyfileobj(source, pipe, 1 << 16)
+    except BrokenPipeError:
+        # the program exited without reading all of its input
+        pass
+
+
+def _open_input(
+        in_file: str) -> Tuple[int, Optional[threading.Thread], int]:
+    """Open the fd a program reads its input from.
+
+    Compressed files are decompressed into a pipe by a feeder thread,
+    to be started once the program is spawned.
+
+    Returns:
+        Tuple[int, Optional[threading.Thread], int]: fd for the
+            program's stdin, the feeder and the fd it writes to (-1
+            without a feeder)
+    """
+    if cases.is_compressed(in_file):
+        read_fd, write_fd = os.pipe()
+        return read_fd, threading.Thread(
+            target=_feed, args=(in_file, write_fd), daemon=True), write_fd
+    # the child reads its own copy of the fd; ours is closed once spawned
+    return os.open(in_file, os.O_RDONLY), None, -1
+
+
+def measure(command: List[str],
+            in_file: str,
+            cwd: Optional[str] = None,
+            timeout: Optional[float] = None,
+            env: Optional[Dict[str, str]] = None
+            ) -> Tuple[int, str, str, float]:
+    """Execute the command and measure its wall-clock time.
+
+    Args:
+        command (List[str]): command to execute
+        in_file (str): file fed to the program's stdin; compressed files
+            are decompressed into a pipe while the program runs
+        cwd (Optional[str]): folder to run in; default current folder
+        timeout (Optional[float]): seconds after which the program is
+            killed; the exit code is then TIMEOUT_CODE
+        env (Optional[Dict[str, str]]): extra environment variables
+
+    Returns:
+        Tuple[int, str, str, float]: exit code, output, error and seconds
+    """
     # Use Popen to execute the command
-    filein = open(in_file, 'r', encoding='utf-8')
+    read_fd, feeder, write_fd = _open_input(in_file)
 
-    process = subprocess.Popen(command,
-                               stdout=subprocess.PIPE,
-                               stderr=subprocess.PIPE,
-                               stdin=filein)
+    start = time.perf_counter()
+    try:
+        # without preexec_fn, CPython spawns with vfork on Linux, which
+        # measured faster than posix_spawn (close_fds=False); the
+        # resolved executable saves the child probing every PATH entry
+        process = subprocess.Popen(command,
+                                   executable=resolve_executable(
+                                       command[0], cwd, env),
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE,
+                                   stdin=read_fd,
+                                   cwd=cwd,
+                                   env={**os.environ, **env} if env
+                                   else None)
+    except OSError:
+        if feeder is not None:
+            os.close(write_fd)
+        raise
+    finally:
+        os.close(read_fd)
+    if feeder is not None:
+        feeder.start()
 
     # Wait for the process to finish and get the output and errors
-    stdout, stderr = process.communicate()
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+        code = process.returncode
+    except subprocess.TimeoutExpired:
+        process.kill()
+        stdout, stderr = process.communicate()
+        code = TIMEOUT_CODE
+        stderr += f'Time limit of {timeout} s exceeded.'.encode('utf-8')
+    elapsed = time.perf_counter() - start
+    if feeder is not None:
+        feeder.join()
 
     # Print the output and errors
     output = stdout.decode('utf-8')
     error = stderr.decode('utf-8')
-    return process.returncode, output, error
+    return code, output, error, elapsed
+
+
+# Spawns the program, waits for it and writes its exit code, wall-clock
+# and CPU seconds and peak memory to the report fd. Linux counts the
+# memory of the process that calls exec in the program's peak memory, so
+# the program is spawned by this small interpreter rather than by the
+# caller, whose own memory would otherwise be the smallest peak reported.
+_LAUNCHER = """
+import os, signal, sys, time
+report = int(sys.argv[1])
+os.set_inheritable(report, False)
+# the program handles Ctrl-C; the launcher waits to report how it ended
+signal.signal(signal.SIGINT, signal.SIG_IGN)
+start = time.perf_counter()
+pid = os.posix_spawn(sys.argv[2], sys.argv[3:], os.environ,
+                     setsigdef=(signal.SIGINT,))
+_, status, usage = os.wait4(pid, 0)
+os.write(report, ('%d %r %r %d' % (
+    os.waitstatus_to_exitcode(status), time.perf_counter() - start,
+    usage.ru_utime + usage.ru_stime, usage.ru_maxrss)).encode())
+"""
+
+
+def stream(command: List[str],
+           in_file: Optional[str] = None,
+           cwd: Optional[str] = None,
+           env: Optional[Dict[str, str]] = None
+           ) -> Tuple[int, float, Optional[float], Optional[int]]:
+    """Execute the command with its output streamed to the terminal.
+
+    Unlike :func:`measure`, stdout and stderr are not captured, so the
+    program's output appears as it is written. Where ``os.wait4`` is
+    available, the program is reaped by a launcher that reports its
+    resource usage.
+
+    Args:
+        command (List[str]): command to execute
+        in_file (Optional[str]): file fed to the program's stdin;
+            default the terminal
+        cwd (Optional[str]): folder to run in; default current folder
+        env (Optional[Dict[str, str]]): extra environment variables
+
+    Returns:
+        Tuple[int, float, Optional[float], Optional[int]]: exit code,
+            wall-clock seconds, CPU seconds and peak memory in KiB; CPU
+            and memory are None without ``os.wait4``
+
+    Raises:
+        FileNotFoundError: when the program does not exist
+    """
+    executable = resolve_executable(command[0], cwd, env)
+    if not os.access(executable, os.X_OK):
+        raise FileNotFoundError(f'No such program: {command[0]}')
+    measured = hasattr(os, 'wait4') and hasattr(os, 'posix_spawn')
+    report_fd = write_report = -1
+    if measured:
+        report_fd, write_report = os.pipe()
+        command = [sys.executable, '-I', '-S', '-c', _LAUNCHER,
+                   str(write_report), executable] + command
+    feeder = None
+    read_fd: Optional[int] = None
+    if in_file is not None:
+        read_fd, feeder, write_fd = _open_input(in_file)
+
+    start = time.perf_counter()
+    try:
+        process = subprocess.Popen(command,
+                                   executable=command[0] if measured
+                                   else executable,
+                                   stdin=read_fd,
+                                   cwd=cwd,
+                                   pass_fds=(write_report,) if measured
+                                   else (),
+                                   env={**os.environ, **env} if env
+                                   else None)
+    except OSError:
+        if feeder is not None:
+            os.close(write_fd)
+        if measured:
+            os.close(report_fd)
+        raise
+    finally:
+        if read_fd is not None:
+            os.close(read_fd)
+        if measured:
+            os.close(write_report)
+    if feeder is not None:
+        feeder.start()
+
+    while True:
+        try:
+            code = process.wait()
+            break
+        except KeyboardInterrupt:
+            # the program got the interrupt too; report how it ended
+            continue
+    elapsed = time.perf_counter() - start
+    if feeder is not None:
+        feeder.join()
+    if not measured:
+        return code, elapsed, None, None
+    with open(report_fd, 'rb') as report:
+        fields = report.read().split()
+    if len(fields) != 4:
+        # the launcher failed before the program ran
+        return code, elapsed, None, None
+    maxrss = int(fields[3])
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    memory = maxrss // 1024 if sys.platform == 'darwin' else maxrss
+    return int(fields[0]), float(fields[1]), float(fields[2]), memory
+
+
+def measure_usage(command: List[str],
+                  in_file: str,
+                  cwd: Optional[str] = None,
+                  timeout: Optional[float] = None,
+                  env: Optional[Dict[str, str]] = None
+                  ) -> Tuple[int, str, str, float, Optional[int]]:
+    """Execute the command like :func:`measure` and report its memory.
+
+    Where ``os.wait4`` is available, the program is reaped by the
+    launcher of :func:`stream`, which reports its peak memory; elsewhere
+    this is :func:`measure` with no memory.
+
+    Returns:
+        Tuple[int, str, str, float, Optional[int]]: exit code, output,
+            error, seconds and peak memory in KiB
+
+    Raises:
+        FileNotFoundError: when the program does not exist
+    """
+    if not (hasattr(os, 'wait4') and hasattr(os, 'posix_spawn')):
+        return (*measure(command, in_file, cwd, timeout, env), None)
+    executable = resolve_executable(command[0], cwd, env)
+    if not os.access(executable, os.X_OK):
+        raise FileNotFoundError(f'No such program: {command[0]}')
+    report_fd, write_report = os.pipe()
+    read_fd, feeder, write_fd = _open_input(in_file)
+    start = time.perf_counter()
+    try:
+        # in its own session, a timeout kills the program with the
+        # launcher
+        process = subprocess.Popen([sys.executable, '-I', '-S', '-c',
+                                    _LAUNCHER, str(write_report),
+                                    executable] + command,
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE,
+                                   stdin=read_fd,
+                                   cwd=cwd,
+                                   pass_fds=(write_report,),
+                                   start_new_session=timeout is not None,
+                                   env={**os.environ, **env} if env
+                                   else None)
+    except OSError:
+        if feeder is not None:
+            os.close(write_fd)
+        os.close(report_fd)
+        raise
+    finally:
+        os.close(read_fd)
+        os.close(write_report)
+    if feeder is not None:
+        feeder.start()
+
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+        code = process.returncode
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        stdout, stderr = process.communicate()
+        code = TIMEOUT_CODE
+        stderr += f'Time limit of {timeout} s exceeded.'.encode('utf-8')
+    elapsed = time.perf_counter() - start
+    if feeder is not None:
+        feeder.join()
+    with open(report_fd, 'rb') as report:
+        fields = report.read().split()
+    memory = None
+    if len(fields) == 4 and code != TIMEOUT_CODE:
+        code, elapsed = int(fields[0]), float(fields[1])
+        maxrss = int(fields[3])
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        memory = maxrss // 1024 if sys.platform == 'darwin' else maxrss
+    return (code, stdout.decode('utf-8'), stderr.decode('utf-8'), elapsed,
+            memory)
+
+
+def _drain(pipe: IO[bytes], chunks: List[bytes]) -> None:
+    """Read a pipe to its end into a list of chunks."""
+    for chunk in iter(lambda: pipe.read(1 << 16), b''):
+        chunks.append(chunk)
+
+
+def hash_output(command: List[str],
+                in_file: str,
+                cwd: Optional[str] = None,
+                timeout: Optional[float] = None,
+                env: Optional[Dict[str, str]] = None
+                ) -> Tuple[int, str, int, str, float]:
+    """Execute the command and hash its output as it is written.
+
+    Unlike :func:`measure`, the output is never held in memory, so
+    programs printing gigabytes can be checked against a digest.
+
+    Args:
+        command (List[str]): command to execute
+        in_file (str): file fed to the program's stdin
+        cwd (Optional[str]): folder to run in; default current folder
+        timeout (Optional[float]): seconds after which the program is
+            killed; the exit code is then TIMEOUT_CODE
+        env (Optional[Dict[str, str]]): extra environment variables
+
+    Returns:
+        Tuple[int, str, int, str, float]: exit code, sha256 hex digest
+            and size in bytes of the output, error and seconds
+    """
+    read_fd, feeder, write_fd = _open_input(in_file)
+    start = time.perf_counter()
+    try:
+        process = subprocess.Popen(command,
+                                   executable=resolve_executable(
+                                       command[0], cwd, env),
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE,
+                                   stdin=read_fd,
+                                   cwd=cwd,
+                                   env={**os.environ, **env} if env
+                                   else None)
+    except OSError:
+        if feeder is not None:
+            os.close(write_fd)
+        raise
+    finally:
+        os.close(read_fd)
+    if feeder is not None:
+        feeder.start()
+    stdout, stderr = process.stdout, process.stderr
+    assert stdout is not None and stderr is not None
+
+    errors: List[bytes] = []
+    drainer = threading.Thread(target=_drain,
+                               args=(stderr, errors), daemon=True)
+    drainer.start()
+    killer = None
+    if timeout is not None:
+        killer = threading.Timer(timeout, process.kill)
+        killer.start()
+    digest = hashlib.sha256()
+    size = 0
+    with stdout:
+        for chunk in iter(lambda: stdout.read(1 << 16), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    code = process.wait()
+    elapsed = time.perf_counter() - start
+    drainer.join()
+    stderr.close()
+    if feeder is not None:
+        feeder.join()
+    error = b''.join(errors).decode('utf-8', errors='replace')
+    if killer is not None:
+        # the timer's event is set once it killed the program
+        timed_out = killer.finished.is_set()
+        killer.cancel()
+        if timed_out and code == -signal.SIGKILL:
+            code = TIMEOUT_CODE
+            error += f'Time limit of {timeout} s exceeded.'
+    return code, digest.hexdigest(), size, error, elapsed
@@ -0,0 +1,170 @@
+"""Persistent caches and compile daemons of slow-compiling toolchains.
+
+A language section of .kattis-cli.toml may have a ``profile`` table
+telling how its compiler keeps state between builds::
+
+    [rust.profile]
+    flags = "-C incremental={state}"
+
+    [scala.profile]
+    stop = "fsc -shutdown"
+    idle = 1800
+
+``flags`` are added to the compile command and ``env`` is a table of
+environment variables of the compiler. ``start`` is a command starting a
+daemon in the background before the first compile and ``stop`` shuts it
+down; a daemon is stopped by the first build after ``idle`` seconds
+(default 1800) without compiles. ``{state}`` expands to the toolchain's
+own folder under the kattis-cli state folder, so caches survive the build
+cache being cleared.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+import json
+import os
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+IDLE = 1800
+DAEMON_FILE = 'daemon.json'
+LAST_USED_FILE = 'last-used'
+
+# builds run in parallel threads; only one may start a daemon
+_lock = threading.Lock()
+
+
+def state_folder() -> Path:
+    """Return the kattis-cli state folder.
+
+    Honors $XDG_STATE_HOME and defaults to ~/.local/state/kattis-cli.
+    """
+    base = os.environ.get('XDG_STATE_HOME') or \
+        str(Path.home().joinpath('.local', 'state'))
+    return Path(base).joinpath('kattis-cli')
+
+
+def toolchain_folder(lang_config: Dict[Any, Any]) -> Path:
+    """Return the state folder of the language's compiler."""
+    compiler = shlex.split(lang_config['compile'])[0]
+    return state_folder().joinpath('toolchains', os.path.basename(compiler))
+
+
+def apply_profile(lang_config: Dict[Any, Any], folder: Path
+                  ) -> Tuple[Dict[Any, Any], Dict[str, str]]:
+    """Return the config compiling with the profile's flags and its env."""
+    profile = lang_config['profile']
+    env = {str(name): str(value).replace('{state}', str(folder))
+           for name, value in dict(profile.get('env', {})).items()}
+    config_profile = dict(lang_config)
+    flags = str(profile.get('flags', ''))
+    if flags:
+        config_profile['compile'] = ' '.join([
+            lang_config['compile'],
+            flags.replace('{state}', shlex.quote(str(folder)))])
+    return config_profile, env
+
+
+def is_running(folder: Path) -> bool:
+    """Return True if the toolchain's daemon has been started."""
+    daemon = folder.joinpath(DAEMON_FILE)
+    if not daemon.is_file():
+        return False
+    pid = json.loads(daemon.read_text(encoding='utf-8')).get('pid')
+    if pid is None:
+        return True
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def start_daemon(profile: Dict[Any, Any], folder: Path,
+                 env: Dict[str, str]) -> None:
+    """Start the daemon of a profile and record how to stop it.
+
+    Profiles with only a stop command belong to compilers that start
+    their daemon themselves; they are recorded to be stopped when idle.
+    """
+    pid = None
+    if profile.get('start'):
+        command = str(profile['start']).replace(
+            '{state}', shlex.quote(str(folder)))
+        pid = subprocess.Popen(shlex.split(command), cwd=folder,
+                               stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL,
+                               start_new_session=True,
+                               env={**os.environ, **env}).pid
+    stop = str(profile.get('stop', '')).replace(
+        '{state}', shlex.quote(str(folder)))
+    folder.joinpath(DAEMON_FILE).write_text(json.dumps({
+        'pid': pid, 'stop': stop, 'env': env,
+        'idle': int(profile.get('idle', IDLE))}), encoding='utf-8')
+
+
+def stop_daemon(folder: Path) -> None:
+    """Stop the daemon of a toolchain folder, if one was started."""
+    daemon = folder.joinpath(DAEMON_FILE)
+    if not daemon.is_file():
+        return
+    record = json.loads(daemon.read_text(encoding='utf-8'))
+    daemon.unlink()
+    if record['stop']:
+        try:
+            subprocess.run(shlex.split(record['stop']), cwd=folder,
+                           capture_output=True, check=False,
+                           env={**os.environ, **record['env']})
+        except OSError:
+            pass
+    elif record['pid'] is not None:
+        try:
+            os.killpg(record['pid'], signal.SIGTERM)
+        except OSError:
+            pass
+
+
+def reap_idle(now: Optional[float] = None) -> None:
+    """Stop the daemons that have not compiled for their idle time."""
+    now = time.time() if now is None else now
+    for daemon in state_folder().joinpath('toolchains').glob(
+            f'*/{DAEMON_FILE}'):
+        folder = daemon.parent
+        try:
+            idle = json.loads(daemon.read_text(encoding='utf-8'))['idle']
+            last_used = folder.joinpath(LAST_USED_FILE).stat().st_mtime
+        except (OSError, ValueError, KeyError):
+            continue
+        if now - last_used > idle:
+            stop_daemon(folder)
+
+
+def prepare(lang_config: Dict[Any, Any]
+            ) -> Tuple[Dict[Any, Any], Optional[Dict[str, str]]]:
+    """Get the toolchain of a language ready to compile.
+
+    Idle daemons are stopped, the language's daemon is started on first
+    use and its last use is recorded.
+
+    Returns:
+        Tuple[Dict[Any, Any], Optional[Dict[str, str]]]: config to compile
+            with and extra environment variables of the compiler (None
+            for languages without a profile)
+    """
+    reap_idle()
+    if not lang_config.get('profile') or not lang_config['compile']:
+        return lang_config, None
+    folder = toolchain_folder(lang_config)
+    folder.mkdir(parents=True, exist_ok=True)
+    config_profile, env = apply_profile(lang_config, folder)
+    profile = lang_config['profile']
+    with _lock:
+        if (profile.get('start') or profile.get('stop')) and \
+                not is_running(folder):
+            start_daemon(profile, folder, env)
+        folder.joinpath(LAST_USED_FILE).touch()
+    return config_profile, env
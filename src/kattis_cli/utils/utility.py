@@ -2,10 +2,48 @@
 
 from pathlib import Path
 import os
+import re
 from math import inf
-from typing import Union
+from itertools import zip_longest
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
 import yaml
 
+from kattis_cli.utils import cases
+
+
+def is_problem_root(path: Path, filename: str = '*.yaml') -> bool:
+    """Check whether a folder is a problem's root folder.
+
+    A folder is a root if a file matching filename has the folder's
+    name, or if it is a yaml file with a problemid.
+
+    Args:
+        path (Path): Path object of directory path
+        filename (str): filename to search for
+            including wildcard pattern
+
+    Returns:
+        bool: True if path is a problem root folder, False otherwise
+    """
+    if filename.startswith('/'):
+        filename = Path(filename).name
+    for file in path.glob(filename):
+        name, ext = os.path.splitext(file.name)
+        folder_name = path.parts[-1]
+        # print(f'{name} {folder_name=} {name=} {ext=}')
+        if name == folder_name:
+            return True
+        # read yaml file; broken ones do not make a problem
+        if ext == '.yaml':
+            try:
+                with open(file, 'r', encoding='utf-8') as f:
+                    data = yaml.safe_load(f)
+            except (OSError, UnicodeDecodeError, yaml.YAMLError):
+                continue
+            if isinstance(data, dict) and 'problemid' in data:
+                return True
+    return False
+
 
 def find_problem_root_folder(
     cur_dir_path: Union[str, Path],
@@ -22,47 +60,80 @@ def find_problem_root_folder(
     Returns:
         Path: Path object of the root problem folder
     """
-
-    def _check_file_match_folder(path: Path, filename: str) -> bool:
-        """ Check folder is same name as the filename given
-        filename including wildcard.
-
-        Args:
-            path (Path): Path object of directory path
-            filename (str): filename to search for
-                including wildcard pattern
-        Returns:
-            bool: True if path exists, False otherwise
-        """
-        if filename.startswith('/'):
-            filename = Path(filename).name
-        for file in path.glob(filename):
-            name, ext = os.path.splitext(file.name)
-            folder_name = path.parts[-1]
-            # print(f'{name} {folder_name=} {name=} {ext=}')
-            if name == folder_name:
-                return True
-            # read yaml file
-            if ext == '.yaml':
-                with open(file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    if 'problemid' in data:
-                        return True
-        return False
-
     # print(f'{cur_dir_path=} {filename=}')
     if not filename:
         filename = '.yaml'
     cur_path = Path(cur_dir_path)
-    if _check_file_match_folder(cur_path, filename):
+    if is_problem_root(cur_path, filename):
         return cur_path
     for parent in cur_path.parents:
         # print('parent', parent, file=sys.stderr)
-        if _check_file_match_folder(parent, filename):
+        if is_problem_root(parent, filename):
             return parent
     raise FileNotFoundError("Error: Problem root folder not found.")
 
 
+def strip_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Stream the lines of ``text.strip().split('\\n')``.
+
+    Leading and trailing whitespace of the whole text is dropped without
+    holding more than the trailing blank lines in memory.
+
+    Args:
+        lines (Iterable[str]): lines of the text, with or without '\\n'
+
+    Yields:
+        str: stripped lines
+    """
+    started = False
+    last = ''
+    blank = []
+    for line in lines:
+        if line.endswith('\n'):
+            line = line[:-1]
+        if not line.strip():
+            if started:
+                blank.append(line)
+            continue
+        if started:
+            yield last
+            yield from blank
+            blank = []
+        else:
+            started = True
+            line = line.lstrip()
+        last = line
+    yield last.rstrip()
+
+
+def compare_lines(expected: Iterable[str], actual: Iterable[str],
+                  places: float = inf) -> bool:
+    """Compare expected and actual lines, numerically if places is given.
+
+    Args:
+        expected (Iterable[str]): expected lines
+        actual (Iterable[str]): actual lines
+        places (float): decimal places for approximation;
+        default inf for string comparison
+
+    Returns:
+        bool: True if all lines are equal, False otherwise
+    """
+    for ex_ans, ans in zip_longest(expected, actual):
+        if ex_ans is None or ans is None:
+            return False
+        if places == inf:
+            if ex_ans != ans:
+                return False
+            continue
+        try:
+            if abs(float(ex_ans) - float(ans)) > 10**(-places):
+                return False
+        except ValueError:
+            return False
+    return True
+
+
 def check_answer(expected: str, ans: str, places: float = inf) -> bool:
     """Compare two numeric strings with given precision.
 
@@ -75,22 +146,56 @@ def check_answer(expected: str, ans: str, places: float = inf) -> bool:
     Returns:
         bool: True if the two values are equal, False otherwise
     """
-    expect_ans = expected.strip().split('\n')
-    actual_ans = ans.strip().split('\n')
-    if len(expect_ans) != len(actual_ans):
-        return False
+    return compare_lines(strip_lines(expected.split('\n')),
+                         ans.strip().split('\n'), places)
 
-    if places == inf:
-        if expect_ans == actual_ans:
-            return True
-        else:
-            return False
-    try:
-        for i, ex_ans in enumerate(expect_ans):
-            flt_expected = float(ex_ans)
-            flt_ans = float(actual_ans[i])
-            if abs(flt_expected - flt_ans) > 10**(-places):
-                return False
-        return True
-    except ValueError:
-        return False
+
+def check_answer_file(ans_file: Union[str, Path], ans: str,
+                      places: float = inf) -> bool:
+    """Compare an output with a (possibly compressed) answer file.
+
+    The answer is decompressed and compared line by line as it is read.
+
+    Args:
+        ans_file (Union[str, Path]): plain or compressed answer file
+        ans (str): actual result
+        places (float): decimal places for approximation
+
+    Returns:
+        bool: True if the output matches the answer, False otherwise
+    """
+    return compare_lines(strip_lines(cases.iter_lines(ans_file)),
+                         ans.strip().split('\n'), places)
+
+
+def parse_cpu_limit(cpu_limit: Any) -> Optional[float]:
+    """Parse the CPU time limit from problem metadata in seconds.
+
+    Args:
+        cpu_limit (Any): limit such as '1 second' or '2.5 seconds'
+
+    Returns:
+        Optional[float]: seconds or None if the limit is unknown
+    """
+    match = re.search(r'\d+(\.\d+)?', str(cpu_limit))
+    if not match:
+        return None
+    return float(match.group())
+
+
+def load_metadata(problem_root_folder: Union[str, Path],
+                  problemid: str) -> Dict[Any, Any]:
+    """Load the <problemid>.yaml metadata from a problem root folder.
+
+    Args:
+        problem_root_folder (Union[str, Path]): root problem folder
+        problemid (str): problem id
+
+    Returns:
+        Dict[Any, Any]: metadata or an empty dict when there is none
+    """
+    yaml_file = Path(problem_root_folder).joinpath(f'{problemid}.yaml')
+    if not yaml_file.is_file():
+        return {}
+    with open(yaml_file, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
@@ -0,0 +1,116 @@
+"""Run from a workspace in memory (tmpfs).
+
+On network-mounted home folders and Docker bind mounts, writing builds
+and reading test data is slow. Every run gets a workspace on
+``$XDG_RUNTIME_DIR`` or ``/dev/shm``: the data files of the problem are
+staged into it (hard-linked when possible, else copied), and builds go
+to a cache in it, which is passed to the build functions. The cache
+takes the builds and objects the run needs from the cache on disk, and
+the ones compiled in memory are copied back when the run ends. The
+workspace is removed afterwards, so memory is only used while it runs.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from kattis_cli.utils import build_cache, cases
+
+# cache entries worth keeping: finished builds and objects
+_KEEP = {'builds': re.compile(r'^[0-9a-f]{32}$'),
+         'objects': re.compile(r'^[0-9a-f]{32}\.o$')}
+
+
+def tmpfs_root() -> Optional[Path]:
+    """Return the workspace folder of the user in memory, if any."""
+    for candidate in (os.environ.get('XDG_RUNTIME_DIR'), '/dev/shm'):
+        if candidate and os.path.isdir(candidate) and \
+                os.access(candidate, os.W_OK):
+            return Path(candidate).joinpath(f'kattis-cli-{os.getuid()}')
+    return None
+
+
+def stage_problem(problem_root_folder: str, root: Path) -> Path:
+    """Mirror the problem's metadata and data files into the workspace.
+
+    Returns:
+        Path: the staged problem root folder
+    """
+    source = Path(problem_root_folder).resolve()
+    staged = root.joinpath(source.name)
+    data = cases.data_folder(staged)
+    data.mkdir(parents=True, exist_ok=True)
+    files = [(file, staged.joinpath(file.name))
+             for file in source.glob('*.yaml')]
+    if cases.data_folder(source).is_dir():
+        files += [(file, data.joinpath(file.name))
+                  for file in cases.data_folder(source).iterdir()
+                  if file.is_file()]
+    for file, target in files:
+        # tmpfs is another file system than the problem folder
+        build_cache.link_or_copy(str(file), str(target))
+    return staged
+
+
+def sync_cache(source: Path, target: Path) -> List[Path]:
+    """Link or copy the finished builds and objects missing in target.
+
+    Returns:
+        List[Path]: entries added to the target cache
+    """
+    copied = []
+    for folder, pattern in _KEEP.items():
+        if not source.joinpath(folder).is_dir():
+            continue
+        for entry in source.joinpath(folder).iterdir():
+            entry_target = target.joinpath(folder, entry.name)
+            if not pattern.match(entry.name) or entry_target.exists():
+                continue
+            entry_target.parent.mkdir(parents=True, exist_ok=True)
+            partial = entry_target.with_name(f'.{entry.name}.partial')
+            if entry.is_dir():
+                shutil.rmtree(partial, ignore_errors=True)
+                shutil.copytree(entry, partial, symlinks=True,
+                                copy_function=build_cache.link_or_copy)
+            else:
+                partial.unlink(missing_ok=True)
+                build_cache.link_or_copy(str(entry), str(partial))
+            os.replace(partial, entry_target)
+            copied.append(entry_target)
+    return copied
+
+
+@contextmanager
+def workspace(problem_root_folder: str
+              ) -> Iterator[Tuple[str, Optional[Path]]]:
+    """Run with the problem's data and the build cache in memory.
+
+    Falls back to the problem folder and the cache on disk when no tmpfs
+    is available.
+
+    Yields:
+        Tuple[str, Optional[Path]]: the problem root folder to read the
+            cases from and the cache folder to build in (None: the cache
+            on disk)
+    """
+    root = tmpfs_root()
+    if root is None:
+        yield problem_root_folder, None
+        return
+    root.mkdir(parents=True, exist_ok=True)
+    # concurrent runs get their own workspace
+    run = Path(tempfile.mkdtemp(prefix='run-', dir=root))
+    cache = run.joinpath('cache')
+    try:
+        staged = stage_problem(problem_root_folder, run)
+        try:
+            yield str(staged), cache
+        finally:
+            # builds taken from disk are there already
+            sync_cache(cache, build_cache.cache_folder())
+    finally:
+        shutil.rmtree(run, ignore_errors=True)
@@ -0,0 +1,62 @@
+"""Test the answers module.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from kattis_cli import answers
+
+REFERENCE = """\
+print(int(input()) * 2)
+"""
+
+
+@pytest.fixture
+def problem(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Create a problem folder with inputs and a reference solution."""
+    if not Path.home().joinpath('.kattis-cli.toml').exists():
+        shutil.copyfile(
+            './src/kattis_cli/.kattis-cli.toml',
+            Path.home().joinpath('.kattis-cli.toml'))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('double')
+    data = root.joinpath('data')
+    data.mkdir(parents=True)
+    data.joinpath('1.in').write_text('1\n')
+    data.joinpath('2.in').write_text('2\n')
+    data.joinpath('sample.in').write_text('5\n')
+    data.joinpath('sample.ans').write_text('hand written\n')
+    root.joinpath('ref.py').write_text(REFERENCE)
+    return root
+
+
+def test_generate_answers(problem: Path) -> None:
+    """Missing answers are generated and recorded in the manifest."""
+    data = problem.joinpath('data')
+    reference = str(problem.joinpath('ref.py'))
+    written = answers.generate_answers(str(problem), reference)
+    assert sorted(Path(f).name for f in written) == ['1.ans', '2.ans']
+    assert data.joinpath('2.ans').read_text() == '4\n'
+    assert data.joinpath('sample.ans').read_text() == 'hand written\n'
+    manifest = answers.load_manifest(data)
+    assert sorted(manifest['inputs']) == ['1.in', '2.in']
+    # nothing changed: nothing is recomputed
+    assert answers.generate_answers(str(problem), reference) == []
+
+
+def test_generate_answers_recomputes_changes(problem: Path) -> None:
+    """Changed inputs and a changed reference trigger recomputation."""
+    data = problem.joinpath('data')
+    reference = problem.joinpath('ref.py')
+    answers.generate_answers(str(problem), str(reference))
+    data.joinpath('1.in').write_text('10\n')
+    written = answers.generate_answers(str(problem), str(reference))
+    assert [Path(f).name for f in written] == ['1.ans']
+    assert data.joinpath('1.ans').read_text() == '20\n'
+    reference.write_text('print(int(input()) * 3)\n')
+    written = answers.generate_answers(str(problem), str(reference))
+    assert sorted(Path(f).name for f in written) == ['1.ans', '2.ans']
+    assert data.joinpath('2.ans').read_text() == '6\n'
+    assert data.joinpath('sample.ans').read_text() == 'hand written\n'
@@ -0,0 +1,103 @@
+"""Test the build_cache module.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from kattis_cli.utils import build_cache, run_program
+
+HELLO_C = '#include <stdio.h>\nint main() { puts("hello"); return 0; }\n'
+
+
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Keep the build cache inside the test's temporary folder."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    return tmp_path
+
+
+def test_compile_cached_reuses_build(tmp_path: Path) -> None:
+    """The second build of unchanged sources reuses the build folder."""
+    source = tmp_path.joinpath('hello.c')
+    source.write_text(HELLO_C)
+    lang_config = {'compile': 'gcc -O2', 'execute': './a.out'}
+    code, _, _, folder = build_cache.compile_cached(
+        lang_config, [str(source)])
+    assert code == 0 and folder
+    assert Path(folder, 'a.out').exists()
+    Path(folder, 'a.out').unlink()
+    # a cache hit does not compile again
+    code, _, _, folder2 = build_cache.compile_cached(
+        lang_config, [str(source)])
+    assert folder2 == folder
+    assert not Path(folder, 'a.out').exists()
+
+
+def test_build_key_changes_with_source(tmp_path: Path) -> None:
+    """The key depends on the sources and the compile command."""
+    source = tmp_path.joinpath('hello.c')
+    source.write_text(HELLO_C)
+    lang_config = {'compile': 'gcc -O2', 'execute': './a.out'}
+    key = build_cache.build_key(lang_config, [str(source)])
+    assert key != build_cache.build_key({'compile': 'gcc -O3'},
+                                        [str(source)])
+    source.write_text(HELLO_C.replace('hello', 'world'))
+    assert key != build_cache.build_key(lang_config, [str(source)])
+
+
+def test_build_program_runs_from_build_folder(tmp_path: Path) -> None:
+    """Built programs run from their own build folder."""
+    source = tmp_path.joinpath('hello.c')
+    source.write_text(HELLO_C)
+    lang_config = {'compile': 'gcc', 'execute': './a.out'}
+    command, folder = build_cache.build_program(
+        lang_config, [str(source)], 'hello.c')
+    code, output, _ = run_program.execute(command, str(source), folder)
+    assert code == 0
+    assert output == 'hello\n'
+
+
+def test_build_program_error(tmp_path: Path) -> None:
+    """Compile errors are raised as BuildError."""
+    source = tmp_path.joinpath('broken.c')
+    source.write_text('int main() { return }\n')
+    with pytest.raises(build_cache.BuildError):
+        build_cache.build_program({'compile': 'gcc', 'execute': './a.out'},
+                                  [str(source)], 'broken.c')
+
+
+def test_missing_compiler(tmp_path: Path) -> None:
+    """A missing compiler is a BuildError and leaves no partial build."""
+    source = tmp_path.joinpath('hello.c')
+    source.write_text(HELLO_C)
+    lang_config = {'compile': 'no-such-cc -O2', 'execute': './a.out'}
+    with pytest.raises(build_cache.BuildError):
+        build_cache.build_program(lang_config, [str(source)], 'hello.c')
+    builds = build_cache.cache_folder().joinpath('builds')
+    assert list(builds.iterdir()) == []
+
+
+def test_with_flags() -> None:
+    """Variant flags replace the optimization level and -static."""
+    assert build_cache.with_flags('g++ -g -O2 -static', '-O3 -march=native') \
+        == 'g++ -O3 -march=native -g -static'
+    assert build_cache.with_flags('g++ -O2', '-funroll-loops') == \
+        'g++ -funroll-loops -O2'
+    assert build_cache.with_flags('g++ -O2 -static', '-fsanitize=address') \
+        == 'g++ -fsanitize=address -O2'
+
+
+def test_variants_are_cached_side_by_side(tmp_path: Path) -> None:
+    """Building a variant does not evict the release build."""
+    source = tmp_path.joinpath('hello.c')
+    source.write_text(HELLO_C)
+    lang_config = {'compile': 'gcc -O2', 'execute': './a.out'}
+    _, release = build_cache.build_program(lang_config, [str(source)], '')
+    debug_config = build_cache.variant_config(lang_config, 'debug')
+    _, debug = build_cache.build_program(debug_config, [str(source)], '')
+    assert release != debug
+    assert Path(release, 'a.out').exists() and Path(debug, 'a.out').exists()
+    with pytest.raises(build_cache.BuildError):
+        build_cache.variant_config(
+            {'compile': '', 'execute': 'python3 {mainfile}'}, 'sanitize')
@@ -0,0 +1,56 @@
+"""Test the cases module.
+"""
+
+from pathlib import Path
+import gzip
+import lzma
+
+import pytest
+
+from kattis_cli.utils import cases
+
+
+def test_find_input_files_and_answers(tmp_path: Path) -> None:
+    """Input files are sorted and paired with .ans or .out files."""
+    data = tmp_path.joinpath('data')
+    data.mkdir()
+    for name in ('2.in', '1.in', '1.ans', '2.out'):
+        data.joinpath(name).write_text('1\n')
+    in_files = cases.find_input_files(tmp_path)
+    assert [f.name for f in in_files] == ['1.in', '2.in']
+    assert cases.answer_file(in_files[0]) == data.joinpath('1.ans')
+    assert cases.answer_file(in_files[1]) == data.joinpath('2.out')
+
+
+def test_resolve_case(tmp_path: Path) -> None:
+    """Cases resolve by name, file name or path."""
+    data = tmp_path.joinpath('data')
+    data.mkdir()
+    in_file = data.joinpath('sample.in')
+    in_file.write_text('1\n')
+    assert cases.resolve_case(tmp_path, 'sample') == in_file
+    assert cases.resolve_case(tmp_path, 'sample.in') == in_file
+    assert cases.resolve_case(tmp_path, str(in_file)) == in_file
+    with pytest.raises(FileNotFoundError):
+        cases.resolve_case(tmp_path, 'missing')
+
+
+def test_compressed_cases(tmp_path: Path) -> None:
+    """Compressed inputs and answers are found and streamed."""
+    data = tmp_path.joinpath('data')
+    data.mkdir()
+    with gzip.open(data.joinpath('big.in.gz'), 'wt') as f:
+        f.write('3\n1 2 3\n')
+    with lzma.open(data.joinpath('big.ans.xz'), 'wt') as f:
+        f.write('6\n')
+    data.joinpath('1.in').write_text('1\n')
+    data.joinpath('1.in.gz').write_bytes(gzip.compress(b'stale\n'))
+    in_files = cases.find_input_files(tmp_path)
+    assert [f.name for f in in_files] == ['1.in', 'big.in.gz']
+    assert cases.case_name(in_files[1]) == 'big'
+    assert cases.answer_file(in_files[1]) == data.joinpath('big.ans.xz')
+    assert cases.answer_path(in_files[1]) == data.joinpath('big.ans')
+    assert cases.read_text(in_files[1]) == '3\n1 2 3\n'
+    assert list(cases.iter_lines(data.joinpath('big.ans.xz'))) == ['6\n']
+    assert cases.resolve_case(tmp_path, 'big') == data.joinpath('big.in.gz')
+    assert cases.preview(in_files[1], 4) == '3\n1 \n...'
@@ -0,0 +1,77 @@
+"""Test the cds module.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from kattis_cli.utils import cds, run_program
+
+# stands in for the JVM: dumps an "archive" and reports the one it maps
+FAKE_JAVA = f'''#!{sys.executable}
+import sys
+for arg in sys.argv[1:]:
+    if arg.startswith('-XX:ArchiveClassesAtExit='):
+        open(arg.split('=', 1)[1], 'w').write('classes')
+    if arg.startswith('-XX:SharedArchiveFile='):
+        print('shared', file=sys.stderr)
+print(sys.stdin.read().strip())
+'''
+
+JAVA_CONFIG = {'compile': 'javac -d .', 'execute': 'java -cp . {mainfile}'}
+
+
+@pytest.fixture
+def fake_java(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Put a fake java launcher first on the PATH."""
+    bin_folder = tmp_path.joinpath('bin')
+    bin_folder.mkdir()
+    java = bin_folder.joinpath('java')
+    java.write_text(FAKE_JAVA)
+    java.chmod(0o755)
+    monkeypatch.setenv('PATH', f'{bin_folder}:/usr/bin')
+    build_folder = tmp_path.joinpath('build')
+    build_folder.mkdir()
+    tmp_path.joinpath('1.in').write_text('42\n')
+    return build_folder
+
+
+def test_with_jvm_flags() -> None:
+    """Flags go right after the launcher, with -J for kotlin."""
+    assert cds.with_jvm_flags('java -cp . Main', ['-Xshare:auto']) == \
+        'java -Xshare:auto -cp . Main'
+    assert cds.with_jvm_flags('kotlin -cp . MainKt', ['-Xshare:auto']) == \
+        'kotlin -J-Xshare:auto -cp . MainKt'
+    assert cds.launcher('java -cp . Main') == 'java'
+    assert cds.launcher('./a.out') is None
+
+
+def test_inject_dumps_and_maps_archive(fake_java: Path) -> None:
+    """The first run dumps the archive; later runs map it."""
+    in_file = str(fake_java.parent.joinpath('1.in'))
+    config_cds = cds.inject(JAVA_CONFIG, 'Main', str(fake_java), in_file)
+    archive = fake_java.joinpath(cds.ARCHIVE)
+    assert archive.read_text() == 'classes'
+    assert f'-XX:SharedArchiveFile={archive}' in config_cds['execute']
+    command = run_program.build_run_command(config_cds, 'Main')
+    code, output, error = run_program.execute(command, in_file,
+                                              str(fake_java))
+    assert code == 0
+    assert output == '42\n'
+    assert error == 'shared\n'
+    # the archive is reused, not dumped again
+    archive.write_text('kept')
+    cds.inject(JAVA_CONFIG, 'Main', str(fake_java), in_file)
+    assert archive.read_text() == 'kept'
+
+
+def test_inject_leaves_other_programs(fake_java: Path) -> None:
+    """Native programs, unbuilt programs and cds = false are unchanged."""
+    in_file = str(fake_java.parent.joinpath('1.in'))
+    native = {'compile': 'g++', 'execute': './a.out'}
+    assert cds.inject(native, 'a.cpp', str(fake_java), in_file) is native
+    assert cds.inject(JAVA_CONFIG, 'Main', None, in_file) is JAVA_CONFIG
+    disabled = dict(JAVA_CONFIG, cds=False)
+    assert cds.inject(disabled, 'Main', str(fake_java), in_file) is disabled
+    assert not fake_java.joinpath(cds.ARCHIVE).exists()
@@ -0,0 +1,84 @@
+"""Test the compare module.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from kattis_cli import compare
+
+
+@pytest.fixture
+def problem(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Create a problem folder with two cases and three solutions."""
+    if not Path.home().joinpath('.kattis-cli.toml').exists():
+        shutil.copyfile(
+            './src/kattis_cli/.kattis-cli.toml',
+            Path.home().joinpath('.kattis-cli.toml'))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('double')
+    data = root.joinpath('data')
+    data.mkdir(parents=True)
+    data.joinpath('1.in').write_text('1\n')
+    data.joinpath('1.ans').write_text('2\n')
+    data.joinpath('2.in').write_text('-3\n')
+    root.joinpath('fast.py').write_text('print(int(input()) * 2)\n')
+    root.joinpath('wrong.py').write_text('print(abs(int(input())) * 2)\n')
+    root.joinpath('double.cpp').write_text(
+        '#include <cstdio>\n'
+        'int main() { int n; scanf("%d", &n); printf("%d\\n", 2 * n); }\n')
+    return root
+
+
+def test_compare(problem: Path) -> None:
+    """Verdicts are graded per solution and disagreements are found."""
+    solutions = [str(problem.joinpath(name))
+                 for name in ('fast.py', 'double.cpp', 'wrong.py')]
+    results = compare.compare(str(problem), solutions)
+    assert list(results) == ['1.in', '2.in']
+    assert [run[0] for run in results['1.in']] == ['AC', 'AC', 'AC']
+    assert [run[0] for run in results['2.in']] == ['OK', 'OK', 'OK']
+    assert [run[3] for run in results['2.in']] == ['-6\n', '-6\n', '6\n']
+    assert not compare.disagree(results['1.in'])
+    assert compare.disagree(results['2.in'])
+
+
+def test_grade_and_speedup() -> None:
+    """Crashes and timeouts are graded before answers."""
+    assert compare.grade(1, '', None) == 'RTE'
+    assert compare.grade(124, '', None) == 'TLE'
+    assert compare.speedup(2.0, 0.5) == '×4.0'
+    assert compare.speedup(2.0, 0) == ''
+
+
+def test_compare_runtimes(problem: Path, monkeypatch: pytest.MonkeyPatch,
+                          tmp_path: Path) -> None:
+    """A Python solution is compared under CPython and PyPy."""
+    bin_folder = tmp_path.joinpath('bin')
+    bin_folder.mkdir()
+    # any CPython stands in for pypy3
+    bin_folder.joinpath('pypy3').symlink_to(shutil.which('python3') or '')
+    monkeypatch.setenv('PATH', f'{bin_folder}:{os.environ["PATH"]}')
+    lang_config = {'compile': '', 'execute': 'python3 {mainfile}'}
+    files = [str(problem.joinpath('fast.py'))]
+    results = compare.compare_runtimes(str(problem), files, 'fast.py',
+                                       lang_config, ['cpython', 'pypy'])
+    assert [run[0] for run in results['1.in']] == ['AC', 'AC']
+    assert not compare.disagree(results['2.in'])
+
+
+def test_compare_runtimes_missing(problem: Path,
+                                  monkeypatch: pytest.MonkeyPatch,
+                                  tmp_path: Path) -> None:
+    """A missing interpreter is reported instead of crashing the runs."""
+    bin_folder = tmp_path.joinpath('bin')
+    bin_folder.mkdir()
+    bin_folder.joinpath('python3').symlink_to(shutil.which('python3') or '')
+    monkeypatch.setenv('PATH', str(bin_folder))
+    lang_config = {'compile': '', 'execute': 'python3 {mainfile}'}
+    files = [str(problem.joinpath('fast.py'))]
+    with pytest.raises(SystemExit):
+        compare.compare_runtimes(str(problem), files, 'fast.py',
+                                 lang_config, ['cpython', 'pypy'])
@@ -0,0 +1,70 @@
+"""Test the complexity module.
+"""
+
+import math
+import os
+import shutil
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+import kattis_cli.main as main
+from kattis_cli import complexity
+
+GENERATOR = """\
+import sys
+n = int(sys.argv[1])
+print(n)
+print(' '.join(['1'] * n))
+"""
+
+
+def test_geometric_sizes() -> None:
+    """Sizes grow geometrically without duplicates."""
+    assert complexity.geometric_sizes(1000, 2, 4) == [1000, 2000, 4000, 8000]
+    assert complexity.geometric_sizes(1, 1.2, 3) == [1]
+
+
+def test_min_n_is_positive() -> None:
+    """kattis complexity rejects sizes below 1 before running anything."""
+    result = CliRunner().invoke(main.main, ['complexity', '-g', 'gen.py',
+                                            '--min-n', '0'])
+    assert result.exit_code == 2
+    assert '--min-n' in result.output
+
+
+def test_fit_models_quadratic() -> None:
+    """Quadratic timings are fitted best by the O(n²) model."""
+    sizes = [1000, 2000, 4000, 8000, 16000]
+    times = [0.02 + 1e-9 * n * n for n in sizes]
+    fits = complexity.fit_models(sizes, times)
+    name, a, b, error = fits[0]
+    assert name == 'O(n²)'
+    assert math.isclose(a, 0.02, rel_tol=1e-6)
+    assert error < 1e-6
+    assert math.isclose(complexity.predict(name, a, b, 100000), 10.02)
+
+
+def test_fit_models_n_log_n() -> None:
+    """n log n timings are fitted best by the O(n log n) model."""
+    sizes = [1000, 4000, 16000, 64000, 256000]
+    times = [0.05 + 1e-7 * n * math.log2(n) for n in sizes]
+    assert complexity.fit_models(sizes, times)[0][0] == 'O(n log n)'
+
+
+def test_estimate_python(tmp_path: Path) -> None:
+    """A Python solution is timed on generated inputs."""
+    if not Path.home().joinpath('.kattis-cli.toml').exists():
+        shutil.copyfile(
+            './src/kattis_cli/.kattis-cli.toml',
+            Path.home().joinpath('.kattis-cli.toml'))
+    generator = tmp_path.joinpath('gen.py')
+    generator.write_text(GENERATOR)
+    main_program = os.path.join('tests', 'cold', 'python3', 'cold.py')
+    lang_config = {'compile': '', 'execute': f'{sys.executable} {{mainfile}}'}
+    fits = complexity.estimate('cold', 'cold.py',
+                               os.path.join('tests', 'cold'),
+                               [main_program], lang_config, str(generator),
+                               [10, 20, 40], max_n=1000, repeat=1)
+    assert len(fits) == len(complexity.MODELS)
@@ -0,0 +1,39 @@
+"""Test the compress module.
+"""
+
+from pathlib import Path
+
+from kattis_cli import compress
+from kattis_cli.utils import cases, utility
+
+
+def test_compress_data(tmp_path: Path) -> None:
+    """Large data files are compressed, samples stay plain."""
+    data = tmp_path.joinpath('data')
+    data.mkdir()
+    big = ''.join(f'{i}\n' for i in range(10000))
+    data.joinpath('big.in').write_text(big)
+    data.joinpath('big.ans').write_text(big)
+    data.joinpath('sample.in').write_text('1\n')
+    written = compress.compress_data(str(tmp_path), 'xz', min_size=1000)
+    assert sorted(Path(f).name for f in written) == ['big.ans.xz',
+                                                     'big.in.xz']
+    assert not data.joinpath('big.in').exists()
+    assert sorted(f.name for f in data.iterdir()) == [
+        'big.ans.xz', 'big.in.xz', 'sample.in']
+    in_files = cases.find_input_files(tmp_path)
+    assert [f.name for f in in_files] == ['big.in.xz', 'sample.in']
+    assert cases.read_text(in_files[0]) == big
+    assert utility.check_answer_file(cases.answer_file(in_files[0]), big)
+    # nothing left to compress
+    assert compress.compress_data(str(tmp_path), 'gz', min_size=1000) == []
+
+
+def test_compress_data_keep(tmp_path: Path) -> None:
+    """Originals are kept on request and take precedence."""
+    data = tmp_path.joinpath('data')
+    data.mkdir()
+    data.joinpath('1.in').write_text('1\n')
+    compress.compress_data(str(tmp_path), 'gz', min_size=0, keep=True)
+    assert data.joinpath('1.in.gz').is_file()
+    assert cases.find_input_files(tmp_path) == [data.joinpath('1.in')]
@@ -0,0 +1,62 @@
+"""Test the constraints module.
+"""
+
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from kattis_cli.utils import constraints
+
+
+def test_parse_constraint() -> None:
+    """TeX and Unicode ranges are parsed into integer bounds."""
+    assert constraints.parse_constraint(
+        r'$1 \leq n \leq 10^5$') == [('n', 1, 100000)]
+    assert constraints.parse_constraint(
+        r'1 \le n, m \le 2 \cdot 10^{5}') == [('n', 1, 200000),
+                                              ('m', 1, 200000)]
+    assert constraints.parse_constraint(
+        r'0 \leq a_i < 100\,000') == [('a_i', 0, 99999)]
+    assert constraints.parse_constraint('1 ≤ N ≤ 1 000 000') == [
+        ('N', 1, 1000000)]
+    assert constraints.parse_constraint(
+        r'10^9 \geq x \geq -10^9') == [('x', -10 ** 9, 10 ** 9)]
+
+
+def test_evaluate_is_exact() -> None:
+    """Bounds are integers, not rounded floats; odd powers are None."""
+    assert constraints.evaluate('999999999999999999') == 999999999999999999
+    assert constraints.evaluate('2*10^18') == 2 * 10 ** 18
+    assert constraints.evaluate('1.5*10^5') == 150000
+    assert constraints.evaluate('10^400') == 10 ** 400
+    assert constraints.evaluate('10^-1') is None
+    assert constraints.evaluate('0^-1') is None
+    assert constraints.evaluate('10^100000') is None
+
+
+def test_parse_constraint_ignores_other_math() -> None:
+    """Conditions and formulas are not constraints."""
+    assert not constraints.parse_constraint(r'i < 0')
+    assert not constraints.parse_constraint(r'a + b \leq c')
+    assert constraints.parse_constraint(
+        r'0 \leq x \leq 0.5') == [('x', 0, None)]
+
+
+def test_merge_keeps_widest_range() -> None:
+    """Subtask ranges do not narrow the range of the full problem."""
+    found: dict = {}
+    constraints.merge(found, 'n', 1, 100)
+    constraints.merge(found, 'n', 1, 10 ** 5)
+    constraints.merge(found, 'n', 1, 1000)
+    assert found == {'n': {'min': 1, 'max': 10 ** 5}}
+
+
+def test_extract_constraints() -> None:
+    """Constraints are extracted from a downloaded problem statement."""
+    html = Path('tests', 'prinsesse.html').read_text(encoding='utf-8')
+    found = constraints.extract_constraints(
+        BeautifulSoup(html, 'html.parser'))
+    assert found['M'] == {'min': 1, 'max': 1000}
+    assert found['N'] == {'min': 0, 'max': 1000}
+    assert constraints.max_size({'constraints': found}, 'n') == 1000
+    assert constraints.max_size({}, 'n') is None
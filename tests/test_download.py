@@ -116,6 +116,8 @@ class TestDownload(unittest.TestCase):
         self.assertEqual(metadata['submissions'], 0)
         self.assertEqual(metadata['difficulty'], '4.0 Medium')
         self.assertEqual(metadata['accepted'], 0)
+        self.assertEqual(metadata['constraints'],
+                         {'N': {'min': 2, 'max': 10 ** 18}})
 
     def test_parse_metadata_success2(self) -> None:
         """Test download_problem.
@@ -137,3 +139,5 @@ class TestDownload(unittest.TestCase):
             metadata['difficulty'],
             '1.8\n                                                - 7.2 Hard')
         self.assertEqual(metadata['accepted'], 0)
+        self.assertEqual(metadata['constraints']['N'],
+                         {'min': 0, 'max': 1000})
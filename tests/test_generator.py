@@ -0,0 +1,118 @@
+"""Test the generator module.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from kattis_cli import generator
+
+SPEC = """\
+name: max
+seed: 7
+vars:
+  n: 1000
+  m: 3000
+lines:
+  - values: [n, m]
+  - array: n
+    low: -10^9
+    high: 10^9
+    distinct: true
+    sorted: true
+  - permutation: n
+  - tree: n
+    weight_high: 10
+  - graph: n
+    edges: m
+    connected: true
+  - string: n
+    alphabet: ab
+"""
+
+
+def test_parse_value() -> None:
+    """Counts accept integers, powers, floats and variable names."""
+    assert generator.parse_value(5, {}) == 5
+    assert generator.parse_value('10^5', {}) == 100000
+    assert generator.parse_value('-10^9', {}) == -10 ** 9
+    assert generator.parse_value('1e9', {}) == 10 ** 9
+    assert generator.parse_value('n', {'n': 3}) == 3
+    with pytest.raises(generator.SpecError):
+        generator.parse_value('n+1', {})
+
+
+def test_generate_spec(tmp_path: Path) -> None:
+    """Every line item of the spec is generated as specified."""
+    pytest.importorskip('numpy')
+    spec = tmp_path.joinpath('max.yaml')
+    spec.write_text(SPEC)
+    outputs = generator.generate(str(tmp_path), str(spec))
+    assert outputs == [str(tmp_path.joinpath('data', 'max-7.in'))]
+    lines = Path(outputs[0]).read_text().splitlines()
+    assert lines[0] == '1000 3000'
+    array = [int(v) for v in lines[1].split()]
+    assert array == sorted(set(array)) and len(array) == 1000
+    assert sorted(int(v) for v in lines[2].split()) == list(range(1, 1001))
+    tree = [tuple(map(int, line.split())) for line in lines[3:1002]]
+    assert all(len(edge) == 3 and 1 <= edge[2] <= 10 for edge in tree)
+    graph = [tuple(map(int, line.split())) for line in lines[1002:4002]]
+    assert len({(min(u, v), max(u, v)) for u, v in graph}) == 3000
+    assert all(u != v for u, v in graph)
+    assert set(lines[4002]) <= {'a', 'b'} and len(lines[4002]) == 1000
+    assert len(lines) == 4003
+
+
+def test_generate_is_cached_and_reproducible(tmp_path: Path) -> None:
+    """The same spec and seed reuse the cached file."""
+    pytest.importorskip('numpy')
+    spec = tmp_path.joinpath('small.yaml')
+    spec.write_text('lines:\n  - array: 5\n')
+    first = Path(generator.generate(str(tmp_path), str(spec), seed=3)[0])
+    content = first.read_text()
+    mtime = first.stat().st_mtime_ns
+    generator.generate(str(tmp_path), str(spec), seed=3)
+    assert first.stat().st_mtime_ns == mtime
+    generator.generate(str(tmp_path), str(spec), seed=3, force=True)
+    assert first.read_text() == content
+
+
+def test_generate_seed_zero(tmp_path: Path) -> None:
+    """Seed 0 is a seed, not a request for the spec's seed."""
+    pytest.importorskip('numpy')
+    spec = tmp_path.joinpath('small.yaml')
+    spec.write_text('seed: 7\nlines:\n  - array: 5\n')
+    assert Path(generator.generate(str(tmp_path), str(spec), seed=0)[0]) \
+        .name == 'small-0.in'
+    assert Path(generator.generate(str(tmp_path), str(spec))[0]).name == \
+        'small-7.in'
+
+
+def test_generate_constraint_variables(tmp_path: Path) -> None:
+    """Constraints of the problem metadata are predefined variables."""
+    pytest.importorskip('numpy')
+    tmp_path.joinpath(f'{tmp_path.name}.yaml').write_text(
+        'constraints:\n  N:\n    min: 1\n    max: 20\n')
+    spec = tmp_path.joinpath('max.yaml')
+    spec.write_text('lines:\n  - values: [max_N, min_N]\n'
+                    '  - array: max_N\n')
+    lines = Path(generator.generate(str(tmp_path), str(spec))[0]) \
+        .read_text().splitlines()
+    assert lines[0] == '20 1'
+    assert len(lines[1].split()) == 20
+
+
+@pytest.mark.parametrize('line', [
+    '  - array: 5\n    low: 10\n    high: 1\n',
+    '  - string: 5\n    alphabet: "αβ"\n',
+    '  - array: -1\n',
+    '  - array: 5\n    high: 10^19\n',
+])
+def test_generate_invalid_spec(tmp_path: Path, line: str) -> None:
+    """Invalid ranges, counts and alphabets are spec errors."""
+    pytest.importorskip('numpy')
+    spec = tmp_path.joinpath('bad.yaml')
+    spec.write_text('lines:\n' + line, encoding='utf-8')
+    with pytest.raises(SystemExit):
+        generator.generate(str(tmp_path), str(spec))
+    assert not tmp_path.joinpath('data', 'bad-1.in').exists()
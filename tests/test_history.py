@@ -0,0 +1,86 @@
+"""Test the history module.
+"""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from rich.console import Console
+from rich.prompt import Confirm
+
+from kattis_cli import history
+from kattis_cli.solution_tester import SolutionTester
+from kattis_cli.utils import run_program
+
+
+@pytest.fixture
+def runs(tmp_path: Path) -> history.RunHistory:
+    """Create a history database in tmp."""
+    return history.RunHistory(tmp_path.joinpath('history.sqlite3'),
+                              Console(width=200))
+
+
+def test_best_times(runs: history.RunHistory, tmp_path: Path) -> None:
+    """Only passing results of older runs of the solution count."""
+    source = tmp_path.joinpath('sol.py')
+    source.write_text('print(1)\n')
+    files = [str(source)]
+    first = runs.record('prob', 'sol.py', 'python3', files,
+                        [('1', 'AC', 0.5, None), ('2', 'WA', 0.1, None)])
+    second = runs.record('prob', 'sol.py', 'python3', files,
+                         [('1', 'AC', 0.4, None), ('2', 'AC', 0.3, 2048)])
+    runs.record('prob', 'other.py', 'python3', files,
+                [('1', 'AC', 0.01, None)])
+    assert second > first
+    assert runs.best_times('prob', 'sol.py', second) == {'1': 0.5}
+    assert runs.best_times('prob', 'sol.py') == {'1': 0.4, '2': 0.3}
+    latest = [row[0] for row in runs.runs('prob', limit=2)]
+    assert latest == [second, second + 1]
+    assert [row[5] for row in runs.case_runs('prob', '2')] == [0.1, 0.3]
+
+
+def test_over_budget() -> None:
+    """Cases fail over their limit or when slower than the best run."""
+    results = [('1', 'AC', 0.13, None), ('2', 'AC', 0.6, None),
+               ('3', 'AC', 0.105, None), ('4', 'AC', 0.005, None)]
+    best = {'1': 0.1, '3': 0.1, '4': 0.001}
+    assert history.over_budget(results, best, {}) == {
+        '1': '0.130 s is 30% slower than the best 0.100 s'}
+    budget = {'regression': 0.5, 'seconds': 1, 'cases': {2: 0.5}}
+    assert history.over_budget(results, best, budget) == {
+        '2': '0.600 s > budget of 0.5 s'}
+
+
+def test_sparkline() -> None:
+    """Values are scaled between the lowest and the highest block."""
+    assert history.sparkline([1.0, 2.0, 3.0]) == '▁▄█'
+    assert history.sparkline([2.0, 2.0]) == '▁▁'
+
+
+def test_test_budget(monkeypatch: pytest.MonkeyPatch,
+                     tmp_path: Path) -> None:
+    """kattis test --budget fails when a case regressed."""
+    monkeypatch.setenv('XDG_STATE_HOME', str(tmp_path.joinpath('state')))
+    root = tmp_path.joinpath('prob')
+    root.joinpath('data').mkdir(parents=True)
+    root.joinpath('data', '1.in').write_text('1\n')
+    root.joinpath('data', '1.ans').write_text('2\n')
+    lang_config = {'compile': '', 'execute': 'python3 {mainfile}'}
+    seconds = [0.2]
+
+    def fake_run(lc: Any, mc: Any, infile: str, cwd: Any = None,
+                 env: Any = None) -> tuple:
+        return (0, '2\n', '', seconds[0], 4096)
+
+    monkeypatch.setattr(run_program, 'run_usage', fake_run)
+    monkeypatch.setattr('time.sleep', lambda _: None)
+    monkeypatch.setattr(Confirm, 'ask', lambda *a, **k: False)
+    tester = SolutionTester()
+    tester.test_samples('prob', 'python3', 'main.py', str(root),
+                        ['main.py'], lang_config, budget=True)
+    seconds[0] = 0.3
+    with pytest.raises(SystemExit):
+        tester.test_samples('prob', 'python3', 'main.py', str(root),
+                            ['main.py'], lang_config, budget=True)
+    # the slow run was recorded; the best run stays the baseline
+    assert history.RunHistory().best_times('prob', 'main.py') == {'1': 0.2}
@@ -0,0 +1,155 @@
+"""Test the lint module.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from click.testing import CliRunner
+
+import kattis_cli.main as main
+from kattis_cli import lint
+from kattis_cli.solution_tester import SolutionTester
+
+SLOW_PY = '''import sys
+n = int(input())
+out = ''
+for i in range(n):
+    x = int(input())
+    print(x)
+    out += str(x)
+    # print(x) in a comment is fine
+print(out)
+queue = [1, 2]
+queue.pop(0)
+'''
+
+SLOW_CPP = '''#include <bits/stdc++.h>
+using namespace std;
+int total(vector<int> v) {
+    int s = 0;
+    for (int x : v) s += x;
+    return s;
+}
+int main() {
+    int n; cin >> n;
+    for (int i = 0; i < n; i++)
+    {
+        cout << i << endl;
+    }
+    for (int i = 0; i < n; i++)
+        cout << i << endl;
+    cout << n << endl;
+}
+'''
+
+FAST_CPP = '''#include <bits/stdc++.h>
+using namespace std;
+int main() {
+    ios::sync_with_stdio(false);
+    int n; cin >> n;
+    for (int i = 0; i < n; i++) cout << i << '\\n';
+    cout << n << endl;
+}
+'''
+
+SLOW_JAVA = '''import java.util.*;
+public class Slow {
+    public static void main(String[] args) {
+        Scanner in = new Scanner(System.in);
+        int n = in.nextInt();
+        String s = "";
+        for (int i = 0; i < n; i++) {
+            System.out.println(i);
+            s += "x";
+        }
+    }
+}
+'''
+
+
+def rules_at(findings: List[lint.Finding]) -> List[tuple]:
+    """Return the line numbers and rules of findings."""
+    return [(number, rule) for _, number, rule, _, _ in findings]
+
+
+def test_python_rules(tmp_path: Path) -> None:
+    """Loop-only rules fire inside loops only, with line numbers."""
+    source = tmp_path.joinpath('slow.py')
+    source.write_text(SLOW_PY)
+    findings = lint.Linter().lint_file(str(source), 'python3')
+    assert rules_at(findings) == [
+        (5, 'input-in-loop'), (6, 'print-in-loop'),
+        (7, 'str-concat-in-loop'), (11, 'pop-front')]
+
+
+def test_cpp_rules(tmp_path: Path) -> None:
+    """Unsynchronized iostreams and endl in loops are flagged."""
+    source = tmp_path.joinpath('slow.cpp')
+    source.write_text(SLOW_CPP)
+    findings = lint.Linter().lint_file(str(source), 'cpp')
+    assert rules_at(findings) == [
+        (3, 'container-by-value'), (9, 'iostream-sync'),
+        (12, 'endl-in-loop'), (15, 'endl-in-loop')]
+    source.write_text(FAST_CPP)
+    assert lint.Linter().lint_file(str(source), 'cpp') == []
+
+
+def test_java_rules(tmp_path: Path) -> None:
+    """Scanner, println and string concatenation in loops are flagged."""
+    source = tmp_path.joinpath('Slow.java')
+    source.write_text(SLOW_JAVA)
+    findings = lint.Linter().lint_file(str(source), 'java')
+    assert rules_at(findings) == [
+        (4, 'scanner'), (8, 'println-in-loop'),
+        (9, 'string-concat-in-loop')]
+
+
+def test_lint_main_file_first(tmp_path: Path) -> None:
+    """Only files of the language are linted, the main file first."""
+    main = tmp_path.joinpath('main.py')
+    main.write_text('for line in open(0):\n    print(line)\n')
+    helper = tmp_path.joinpath('helper.py')
+    helper.write_text('def f(q):\n    return q.pop(0)\n')
+    other = tmp_path.joinpath('notes.cpp')
+    other.write_text('int main() {}\n')
+    files = lint.language_files([str(helper), str(main), str(other)],
+                                'python3')
+    assert files == [str(helper), str(main)]
+    findings = lint.lint(files, 'python3', 'main.py')
+    assert [finding[0] for finding in findings] == [str(main), str(helper)]
+
+
+def test_lint_mainclass(monkeypatch: pytest.MonkeyPatch,
+                        tmp_path: Path) -> None:
+    """kattis lint -m reports the given main file first."""
+    tmp_path.joinpath('prob.yaml').write_text('title: prob\n')
+    for name in ('prob.py', 'other.py'):
+        tmp_path.joinpath(name).write_text('print(1)\n')
+    mainfiles: List[str] = []
+    monkeypatch.setattr(lint, 'lint', lambda files, language, mainfile:
+                        mainfiles.append(mainfile) or [])
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    for args in (['-m', 'other.py'], []):
+        result = runner.invoke(main.main, ['lint', *args, '-p', 'prob',
+                                           'prob.py', 'other.py'])
+        assert result.exit_code == 0, result.output
+    assert [os.path.basename(f) for f in mainfiles] == ['other.py',
+                                                        'prob.py']
+
+
+def test_lint_when_near_limit(monkeypatch: pytest.MonkeyPatch,
+                              tmp_path: Path) -> None:
+    """kattis test lints the solution when a case is near the limit."""
+    tmp_path.joinpath('prob.yaml').write_text("cpu_limit: 1 second\n")
+    calls: List[Any] = []
+    monkeypatch.setattr(lint, 'lint', lambda *args: calls.append(args))
+    tester = SolutionTester()
+    tester.lint_if_slow('prob', 'python3', str(tmp_path), ['main.py'],
+                        'main.py', 0.2)
+    assert not calls
+    tester.lint_if_slow('prob', 'python3', str(tmp_path), ['main.py'],
+                        'main.py', 0.8)
+    assert calls == [(['main.py'], 'python3', 'main.py')]
@@ -0,0 +1,73 @@
+"""Test the nodejs module.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from kattis_cli.utils import build_cache, nodejs, run_program
+
+NODE_CONFIG = {'compile': 'node -c', 'execute': 'node {mainfile}'}
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None,
+                                reason='needs node')
+
+
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Keep the caches inside the test's temporary folder."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    # restored after the test, whether or not it was set
+    monkeypatch.setenv('NODE_COMPILE_CACHE', '')
+    monkeypatch.delenv('NODE_COMPILE_CACHE')
+    return tmp_path
+
+
+def test_is_syntax_check() -> None:
+    """Only a bare node -c compile command is replaced."""
+    assert nodejs.is_node(NODE_CONFIG)
+    assert nodejs.is_syntax_check(NODE_CONFIG)
+    assert nodejs.is_syntax_check({'compile': 'node --check'})
+    assert not nodejs.is_syntax_check({'compile': 'tsc --outDir .'})
+    assert not nodejs.is_node({'execute': 'python3 {mainfile}'})
+
+
+def test_syntax_check_covers_every_file(tmp_path: Path) -> None:
+    """An error in any file fails the check, unlike node -c."""
+    main = tmp_path.joinpath('main.js')
+    main.write_text('console.log(require("./util.js").x);\n')
+    util = tmp_path.joinpath('util.js')
+    util.write_text('module.exports = { x: (;\n')
+    files = [str(main), str(util)]
+    code, _, error, folder = build_cache.compile_cached(NODE_CONFIG, files)
+    assert code != 0 and folder is None
+    assert 'util.js' in error
+    util.write_text('module.exports = { x: 42 };\n')
+    code, _, _, folder = build_cache.compile_cached(NODE_CONFIG, files)
+    assert code == 0 and folder
+    # checked once: the build folder marks the sources as checked
+    assert build_cache.compile_cached(NODE_CONFIG, files)[3] == folder
+
+
+def test_compile_cache_enabled(monkeypatch: pytest.MonkeyPatch,
+                               tmp_path: Path) -> None:
+    """Node programs run with the compile cache of their build's cache."""
+    main = tmp_path.joinpath('main.js')
+    main.write_text('console.log(process.env.NODE_COMPILE_CACHE);\n')
+    in_file = str(tmp_path.joinpath('1.in'))
+    tmp_path.joinpath('1.in').write_text('')
+    for cache in (build_cache.cache_folder(), tmp_path.joinpath('tmpfs')):
+        command, folder = build_cache.build_program(
+            NODE_CONFIG, [str(main)], 'main.js', cache)
+        env = build_cache.run_env(command, cache)
+        _, output, _ = run_program.execute(command, in_file, folder, None,
+                                           env)
+        assert output == f"{cache.joinpath('node')}\n"
+    # the variable is never set for the whole process
+    assert 'NODE_COMPILE_CACHE' not in os.environ
+    assert build_cache.run_env(['python3', 'main.py']) is None
+    # a compile cache chosen by the user is kept
+    monkeypatch.setenv('NODE_COMPILE_CACHE', str(tmp_path))
+    assert build_cache.run_env(command) is None
@@ -0,0 +1,93 @@
+"""Test the objects module.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from kattis_cli.utils import build_cache, objects, run_program
+
+MAIN_CPP = '#include <iostream>\n#include "util.h"\n' \
+    'int main() { std::cout << answer(20) << "\\n"; }\n'
+UTIL_H = '#pragma once\nint answer(int);\n'
+UTIL_CPP = '#include "util.h"\nint answer(int n) { return n + 1; }\n'
+
+
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Keep the build cache inside the test's temporary folder."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    return tmp_path
+
+
+def write_project(folder: Path) -> list:
+    """Write a two translation unit C++ project."""
+    folder.joinpath('main.cpp').write_text(MAIN_CPP)
+    folder.joinpath('util.h').write_text(UTIL_H)
+    folder.joinpath('util.cpp').write_text(UTIL_CPP)
+    return [str(folder.joinpath(name))
+            for name in ('main.cpp', 'util.h', 'util.cpp')]
+
+
+def object_files() -> set:
+    """Return the cached object files."""
+    return set(build_cache.cache_folder().joinpath('objects').glob('*.o'))
+
+
+def test_translation_units() -> None:
+    """Headers are not compiled on their own."""
+    files = ['a/main.cpp', 'a/util.h', 'a/util.cc', 'b/x.c', 'b/y.hpp']
+    assert objects.translation_units(files) == \
+        ['a/main.cpp', 'a/util.cc', 'b/x.c']
+
+
+def test_compile_cached_links_objects(tmp_path: Path) -> None:
+    """Every translation unit becomes a cached object of the program."""
+    files = write_project(tmp_path)
+    lang_config = {'compile': 'g++ -O2', 'execute': './a.out'}
+    command, folder = build_cache.build_program(lang_config, files,
+                                                'main.cpp')
+    assert len(object_files()) == 2
+    code, output, _ = run_program.execute(command, files[0], folder)
+    assert code == 0
+    assert output == '21\n'
+
+
+def test_edit_recompiles_only_changed_unit(tmp_path: Path) -> None:
+    """Editing one file compiles one object; the others are reused."""
+    files = write_project(tmp_path)
+    lang_config = {'compile': 'g++ -O2', 'execute': './a.out'}
+    build_cache.build_program(lang_config, files, 'main.cpp')
+    before = object_files()
+    tmp_path.joinpath('util.cpp').write_text(
+        UTIL_CPP.replace('n + 1', 'n + 2'))
+    command, folder = build_cache.build_program(lang_config, files,
+                                                'main.cpp')
+    after = object_files()
+    assert len(after - before) == 1
+    assert len(before & after) == 2
+    _, output, _ = run_program.execute(command, files[0], folder)
+    assert output == '22\n'
+
+
+def test_header_change_recompiles_includers(tmp_path: Path) -> None:
+    """The key covers included headers through preprocessing."""
+    files = write_project(tmp_path)
+    flags = ['g++', '-O2']
+    key = objects.object_key(flags, files[2])
+    assert key == objects.object_key(flags, files[2])
+    assert key != objects.object_key(['g++', '-O3'], files[2])
+    tmp_path.joinpath('util.h').write_text(UTIL_H + 'int other();\n')
+    assert key != objects.object_key(flags, files[2])
+
+
+def test_compile_error_is_reported(tmp_path: Path) -> None:
+    """A failing translation unit fails the build with its error."""
+    files = write_project(tmp_path)
+    tmp_path.joinpath('util.cpp').write_text('int answer(int n) { oops }\n')
+    code, _, error, folder = build_cache.compile_cached(
+        {'compile': 'g++', 'execute': './a.out'}, files)
+    assert code != 0
+    assert folder is None
+    assert 'oops' in error
+    assert len(object_files()) == 1
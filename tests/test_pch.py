@@ -0,0 +1,45 @@
+"""Test the pch module.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from kattis_cli.utils import build_cache, pch
+
+SOLUTION = """\
+#include <bits/stdc++.h>
+int main() { std::vector<int> v{1, 2}; std::cout << v.size() << '\\n'; }
+"""
+
+
+def test_header_flags_and_key() -> None:
+    """Linker flags don't matter, compile flags change the key."""
+    command = 'g++ -g -O2 -std=gnu++23 -static -lrt -Wl,--whole-archive'
+    assert pch.header_flags(command) == ['-g', '-O2', '-std=gnu++23']
+    assert pch.pch_key(command) == pch.pch_key('g++ -g -O2 -std=gnu++23')
+    assert pch.pch_key(command) != pch.pch_key('g++ -g -O3 -std=gnu++23')
+
+
+def test_inject(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """The PCH is built once and injected only where it applies."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    source = tmp_path.joinpath('sol.cpp')
+    source.write_text(SOLUTION)
+    plain = tmp_path.joinpath('plain.cpp')
+    plain.write_text('int main() {}\n')
+    lang_config = {'compile': 'g++ -O2 -static', 'execute': './a.out'}
+    cache = build_cache.cache_folder()
+    assert pch.inject(lang_config, [str(plain)], cache) == lang_config
+    assert pch.inject({**lang_config, 'pch': False}, [str(source)],
+                      cache)['compile'] == lang_config['compile']
+
+    config_pch = pch.inject(lang_config, [str(source)], cache)
+    folder = cache.joinpath('pch', pch.pch_key(lang_config['compile']))
+    assert config_pch['compile'] == f'g++ -I {folder} -O2 -static'
+    assert folder.joinpath('bits', 'stdc++.h.gch').is_file()
+    assert len(list(cache.joinpath('pch').iterdir())) == 1
+
+    command, build_folder = build_cache.build_program(
+        lang_config, [str(source)], 'sol.cpp')
+    assert build_folder and Path(build_folder, 'a.out').is_file()
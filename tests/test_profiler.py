@@ -0,0 +1,98 @@
+"""Test the profiler module.
+"""
+
+import gzip
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from kattis_cli import profiler
+
+PERF_SCRIPT = """\
+a.out 1234 100.000001:     250000 cycles:u:
+            401136 solve+0x26 (/tmp/a.out)
+            401200 main+0x10 (/tmp/a.out)
+
+a.out 1234 100.000002:     250000 cycles:u:
+            401136 solve+0x2a (/tmp/a.out)
+            401200 main+0x10 (/tmp/a.out)
+
+a.out 1234 100.000003:     250000 cycles:u:
+            401200 main+0x14 (/tmp/a.out)
+"""
+
+JFR_SAMPLES = """\
+jdk.ExecutionSample {
+  startTime = 10:21:49.052 (2024-01-01)
+  sampledThread = "main" (javaThreadId = 1)
+  state = "STATE_RUNNABLE"
+  stackTrace = [
+    Cold.answer(int[]) line: 12
+    Cold.main(String[]) line: 5
+  ]
+}
+"""
+
+
+def test_collapse_perf_script() -> None:
+    """Frames are folded root first and offsets are dropped."""
+    stacks = profiler.collapse_perf_script(PERF_SCRIPT)
+    assert stacks == {'main;solve': 2, 'main': 1}
+
+
+def test_collapse_jfr_samples() -> None:
+    """JFR stack traces are folded root first without line numbers."""
+    stacks = profiler.collapse_jfr_samples(JFR_SAMPLES)
+    assert stacks == {'Cold.main(String[]);Cold.answer(int[])': 1}
+
+
+def test_top_functions() -> None:
+    """Functions are ranked by self time with inclusive percentages."""
+    ranked = profiler.top_functions({'main;solve': 3, 'main': 1})
+    assert ranked[0] == ('solve', 75.0, 75.0)
+    assert ranked[1] == ('main', 25.0, 100.0)
+
+
+def test_parse_and_write_collapsed(tmp_path: Path) -> None:
+    """Collapsed stacks round trip through the file format."""
+    stacks = {'main;solve': 3, 'main': 1}
+    output = tmp_path.joinpath('out', 'cold.folded')
+    profiler.write_collapsed(stacks, output)
+    text = output.read_text(encoding='utf-8')
+    assert profiler.parse_collapsed(text) == stacks
+
+
+def test_profile_python_cprofile(monkeypatch: pytest.MonkeyPatch,
+                                 tmp_path: Path) -> None:
+    """A Python solution is profiled with cProfile."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root_folder = os.path.join('tests', 'cold')
+    main_program = os.path.join(root_folder, 'python3', 'cold.py')
+    lang_config = {'compile': '', 'execute': 'python3 {mainfile}'}
+    output = tmp_path.joinpath('cold.folded')
+    stacks = profiler.profile('python3', 'cold.py', root_folder,
+                              [main_program], lang_config, '1',
+                              output=str(output))
+    assert output.exists()
+    assert any('solve (cold.py' in stack for stack in stacks)
+
+
+def test_profile_default_output(monkeypatch: pytest.MonkeyPatch,
+                                tmp_path: Path) -> None:
+    """Compressed cases are saved as profile/<case>.folded."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('sums')
+    root.joinpath('data').mkdir(parents=True)
+    with gzip.open(root.joinpath('data', 'big.in.gz'), 'wt') as f:
+        f.write('1 2 3\n')
+    solution = root.joinpath('sums.py')
+    solution.write_text('def solve(line):\n'
+                        '    return sum(map(int, line.split()))\n\n\n'
+                        'print(solve(input()))\n')
+    lang_config = {'compile': '', 'execute': f'{sys.executable} {{mainfile}}'}
+    stacks = profiler.profile('python3', 'sums.py', str(root),
+                              [str(solution)], lang_config, 'big')
+    assert any('solve (sums.py' in stack for stack in stacks)
+    assert root.joinpath('profile', 'big.folded').is_file()
@@ -0,0 +1,89 @@
+"""Test the pyruntime module.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from kattis_cli.utils import build_cache, pyruntime, run_program
+
+PYTHON_CONFIG = {'compile': '', 'execute': 'python3 {mainfile}'}
+
+
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Keep the build cache inside the test's temporary folder."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    return tmp_path
+
+
+def test_with_runtime() -> None:
+    """The interpreter of the execute command is swapped."""
+    assert pyruntime.interpreter(PYTHON_CONFIG) == 'python3'
+    config_pypy = pyruntime.with_runtime(PYTHON_CONFIG, 'pypy')
+    assert config_pypy['execute'] == 'pypy3 {mainfile}'
+    assert pyruntime.interpreter(config_pypy) == 'pypy3'
+    assert pyruntime.interpreter({'execute': './a.out'}) is None
+
+
+def test_byte_compiled_program_runs(tmp_path: Path) -> None:
+    """Sources are byte-compiled once and the bytecode imports modules."""
+    tmp_path.joinpath('main.py').write_text(
+        'from helper import twice\nprint(twice(int(input())))\n')
+    tmp_path.joinpath('helper.py').write_text(
+        'def twice(n):\n    return 2 * n\n')
+    tmp_path.joinpath('1.in').write_text('21\n')
+    files = [str(tmp_path.joinpath(name))
+             for name in ('main.py', 'helper.py')]
+    command, folder = build_cache.build_program(PYTHON_CONFIG, files,
+                                                'main.py')
+    assert folder
+    assert command == ['python3', str(Path(folder, 'main.pyc'))]
+    assert Path(folder, 'helper.pyc').is_file()
+    code, output, _ = run_program.execute(
+        command, str(tmp_path.joinpath('1.in')), folder)
+    assert code == 0
+    assert output == '42\n'
+    # unchanged sources reuse the bytecode
+    assert build_cache.compile_cached(PYTHON_CONFIG, files)[3] == folder
+
+
+def test_byte_compiled_layout(tmp_path: Path) -> None:
+    """Bytecode keeps the layout of the sources below their folder."""
+    for name, text in (
+            ('main.py', 'from pkg import util\nfrom sub import util as u\n'
+                        'print(util.f(int(input())), u.f())\n'),
+            ('pkg/__init__.py', ''),
+            ('pkg/util.py', 'def f(n):\n    return n + 1\n'),
+            ('sub/util.py', 'def f():\n    return "sub"\n')):
+        tmp_path.joinpath(name).parent.mkdir(exist_ok=True)
+        tmp_path.joinpath(name).write_text(text)
+    tmp_path.joinpath('1.in').write_text('41\n')
+    files = [str(tmp_path.joinpath(name)) for name in
+             ('pkg/util.py', 'main.py', 'sub/util.py', 'pkg/__init__.py')]
+    command, folder = build_cache.build_program(PYTHON_CONFIG, files,
+                                                'main.py')
+    assert folder
+    assert command == ['python3', str(Path(folder, 'main.pyc'))]
+    assert Path(folder, 'pkg', 'util.pyc').is_file()
+    assert Path(folder, 'sub', 'util.pyc').is_file()
+    code, output, error = run_program.execute(
+        command, str(tmp_path.joinpath('1.in')), folder)
+    assert code == 0, error
+    assert output == '42 sub\n'
+    util = pyruntime.pyc_name(files[0], files)
+    assert util == os.path.join('pkg', 'util.pyc')
+
+
+def test_syntax_error_runs_from_source(tmp_path: Path) -> None:
+    """Sources that don't compile run as is and report the error."""
+    source = tmp_path.joinpath('main.py')
+    source.write_text('print(\n')
+    code, _, _, folder = build_cache.compile_cached(PYTHON_CONFIG,
+                                                    [str(source)])
+    assert code == 0
+    assert folder is None
+    command = build_cache.run_command(PYTHON_CONFIG, str(source), folder,
+                                      [str(source)])
+    assert command == ['python3', str(source)]
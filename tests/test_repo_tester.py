@@ -0,0 +1,133 @@
+"""Test the repo_tester module.
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from kattis_cli import repo_tester
+
+ECHO = 'print(input())\n'
+
+
+def make_problem(repo: Path, name: str, solution: str = ECHO,
+                 answer: str = '1\n') -> Path:
+    """Create a python problem with one case."""
+    root = repo.joinpath(name)
+    data = root.joinpath('data')
+    data.mkdir(parents=True)
+    root.joinpath(f'{name}.yaml').write_text(f'title: {name}\n')
+    data.joinpath('1.in').write_text('1\n')
+    data.joinpath('1.ans').write_text(answer)
+    if solution:
+        root.joinpath(f'{name}.py').write_text(solution)
+    return root
+
+
+@pytest.fixture
+def repo(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Create a repository with a passing, a failing and a broken problem."""
+    if not Path.home().joinpath('.kattis-cli.toml').exists():
+        shutil.copyfile(
+            './src/kattis_cli/.kattis-cli.toml',
+            Path.home().joinpath('.kattis-cli.toml'))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    repo = tmp_path.joinpath('repo')
+    make_problem(repo, 'good')
+    make_problem(repo.joinpath('week2'), 'wrong', answer='2\n')
+    make_problem(repo, 'empty', solution='')
+    return repo
+
+
+def test_find_problem_roots(repo: Path) -> None:
+    """Roots are found at any depth; hidden folders are skipped."""
+    make_problem(repo.joinpath('.git'), 'hidden')
+    roots = repo_tester.find_problem_roots(repo)
+    assert [root.name for root in roots] == ['empty', 'good', 'wrong']
+    # inside a problem the problem itself is tested
+    good = repo.joinpath('good')
+    assert repo_tester.find_problem_roots(good.joinpath('data')) == [good]
+
+
+def test_broken_yaml(repo: Path) -> None:
+    """Broken yaml files do not stop the search or make a problem."""
+    broken = repo.joinpath('notes')
+    broken.mkdir()
+    broken.joinpath('config.yaml').write_text('key: [unclosed\n')
+    repo.joinpath('good', 'extra.yaml').write_bytes(b'\xff\xfe: x\n')
+    roots = repo_tester.find_problem_roots(repo)
+    assert [root.name for root in roots] == ['empty', 'good', 'wrong']
+
+
+def test_test_all(repo: Path) -> None:
+    """Every problem gets a status; passing results are cached."""
+    results = repo_tester.test_all(str(repo), jobs=2)
+    assert list(results) == ['empty', 'good', 'week2/wrong']
+    assert results['good']['status'] == 'pass'
+    assert results['good']['language'] == 'python3'
+    assert results['week2/wrong']['status'] == 'fail'
+    assert results['week2/wrong']['failed'] == ['WA 1.in']
+    assert results['empty']['status'] == 'error'
+
+    again = repo_tester.test_all(str(repo), jobs=2)
+    assert again['good'].get('cached')
+    assert not again['week2/wrong'].get('cached')
+    assert not repo_tester.test_all(str(repo), cached=False)['good'].get(
+        'cached')
+
+    # a changed solution is tested again
+    repo.joinpath('good', 'good.py').write_text('print(int(input()))\n')
+    assert not repo_tester.test_all(str(repo))['good'].get('cached')
+
+
+def git(repo: Path, *args: str) -> None:
+    """Run a git command in the repository."""
+    subprocess.run(['git', '-c', 'user.name=test', '-c',
+                    'user.email=test@example.com', *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+def test_changed_since(repo: Path) -> None:
+    """Only problems with files changed since the ref are tested."""
+    git(repo, 'init', '-q')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-q', '-m', 'problems')
+    assert repo_tester.changed_problem_roots(repo, 'HEAD') == []
+    assert repo_tester.test_all(str(repo), changed_since='HEAD') == {}
+
+    # a changed answer, a new file and a file outside of any problem
+    repo.joinpath('week2', 'wrong', 'data', '1.ans').write_text('1\n')
+    repo.joinpath('empty', 'empty.py').write_text('')
+    repo.joinpath('README.md').write_text('notes\n')
+    assert repo_tester.changed_problem_roots(repo, 'HEAD') == [
+        repo.joinpath('empty').resolve(),
+        repo.joinpath('week2', 'wrong').resolve()]
+    assert repo_tester.changed_problem_roots(repo.joinpath('week2'),
+                                             'HEAD') == [
+        repo.joinpath('week2', 'wrong').resolve()]
+    results = repo_tester.test_all(str(repo), changed_since='HEAD')
+    assert list(results) == ['empty', 'week2/wrong']
+    assert results['week2/wrong']['status'] == 'pass'
+
+    with pytest.raises(SystemExit):
+        repo_tester.test_all(str(repo), changed_since='no-such-ref')
+
+    # problems are named the same through a symlink
+    link = repo.parent.joinpath('link')
+    link.symlink_to(repo)
+    assert list(repo_tester.test_all(str(link), changed_since='HEAD')) == [
+        'empty', 'week2/wrong']
+    assert list(repo_tester.test_all(str(link))) == [
+        'empty', 'good', 'week2/wrong']
+
+
+def test_summarize() -> None:
+    """Cases near the time limit make a passing problem slow."""
+    runs = [('1.in', 'AC', 0.1), ('2.in', 'AC', 0.9)]
+    result = repo_tester.summarize('p', 'python3', runs, 0.5)
+    assert result['status'] == 'slow'
+    assert result['slow'] == ['2.in']
+    assert repo_tester.summarize('p', 'python3', runs, None)['status'] == \
+        'pass'
@@ -2,8 +2,12 @@
 """
 
 from pathlib import Path
+import gzip
+import hashlib
 import os
 import shutil
+import sys
+import tempfile
 import unittest
 from kattis_cli.utils import run_program, config
 from kattis_cli.utils import languages
@@ -97,3 +101,106 @@ class TestRunProgram(unittest.TestCase):
             assert code == 0
             assert ans == output
         os.remove('a.out')
+
+    def test_execute_timeout(self) -> None:
+        """Programs running past their timeout are killed.
+        """
+        code, _, error = run_program.execute(
+            ['sleep', '5'], os.devnull, timeout=0.2)
+        assert code == run_program.TIMEOUT_CODE
+        assert 'Time limit' in error
+
+    def test_execute_compressed_input(self) -> None:
+        """Compressed inputs are decompressed into the program's stdin.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            in_file = os.path.join(tmp, 'big.in.gz')
+            lines = ''.join(f'{i}\n' for i in range(100000))
+            with gzip.open(in_file, 'wt', encoding='utf-8') as f:
+                f.write(lines)
+            code, ans, _ = run_program.execute(['wc', '-l'], in_file)
+            assert code == 0
+            assert ans.strip() == '100000'
+            # programs may exit before reading all of their input
+            code, ans, _ = run_program.execute(['head', '-n', '1'], in_file)
+            assert code == 0
+            assert ans == '0\n'
+
+    def test_execute_closes_input(self) -> None:
+        """Every case opens and closes its input; no fd is leaked.
+        """
+        before = len(os.listdir('/proc/self/fd'))
+        for _ in range(50):
+            code, _, _ = run_program.execute(['cat'], os.devnull)
+            assert code == 0
+        assert len(os.listdir('/proc/self/fd')) == before
+
+    def test_resolve_executable(self) -> None:
+        """Programs are resolved to absolute paths once.
+        """
+        assert run_program.resolve_executable('cat') == shutil.which('cat')
+        assert run_program.resolve_executable('./a.out', '/tmp') == \
+            '/tmp/a.out'
+        assert run_program.resolve_executable('no-such-program') == \
+            'no-such-program'
+        with self.assertRaises(FileNotFoundError):
+            run_program.execute(['no-such-program'], os.devnull)
+
+    def test_stream_usage(self) -> None:
+        """Streamed runs report the program's own time and memory.
+        """
+        allocate = 'x = bytearray(64 << 20); x[::4096] = b"1" * (16 << 10)'
+        code, elapsed, cpu, memory = run_program.stream(
+            [sys.executable, '-c', allocate], os.devnull)
+        assert code == 0
+        assert cpu is not None and 0 < cpu <= elapsed + 0.05
+        assert memory is not None and 64 << 10 < memory < 128 << 10
+        # the caller's memory is not part of a small program's peak
+        ballast = bytearray(256 << 20)
+        ballast[::4096] = b'1' * (64 << 10)
+        code, _, _, memory = run_program.stream(['true'])
+        assert code == 0
+        assert memory is not None and memory < 128 << 10
+        code, _, _, _ = run_program.stream(['sh', '-c', 'kill -9 $$'])
+        assert code == -9
+
+    def test_stream_missing_program(self) -> None:
+        """Missing programs raise before anything is spawned.
+        """
+        before = len(os.listdir('/proc/self/fd'))
+        with self.assertRaises(FileNotFoundError):
+            run_program.stream(['no-such-program'], os.devnull)
+        run_program.stream(['true'], os.devnull)
+        assert len(os.listdir('/proc/self/fd')) == before
+
+    def test_measure_usage(self) -> None:
+        """Captured runs report the program's output and peak memory.
+        """
+        allocate = ('x = bytearray(64 << 20); x[::4096] = b"1" * (16 << 10); '
+                    'print(len(x))')
+        code, output, _, seconds, memory = run_program.measure_usage(
+            [sys.executable, '-c', allocate], os.devnull)
+        assert code == 0
+        assert output == f'{64 << 20}\n'
+        assert seconds > 0
+        assert memory is not None and 64 << 10 < memory < 128 << 10
+        code, _, error, _, memory = run_program.measure_usage(
+            ['sleep', '5'], os.devnull, timeout=0.2)
+        assert code == run_program.TIMEOUT_CODE
+        assert 'Time limit' in error and memory is None
+        with self.assertRaises(FileNotFoundError):
+            run_program.measure_usage(['no-such-program'], os.devnull)
+
+    def test_hash_output(self) -> None:
+        """Outputs are hashed as they are written, and runs time out.
+        """
+        script = 'import sys; sys.stdout.write("x" * (8 << 20))'
+        code, digest, size, _, _ = run_program.hash_output(
+            [sys.executable, '-c', script], os.devnull)
+        assert code == 0
+        assert size == 8 << 20
+        assert digest == hashlib.sha256(b'x' * (8 << 20)).hexdigest()
+        code, _, _, error, _ = run_program.hash_output(
+            ['sleep', '5'], os.devnull, timeout=0.2)
+        assert code == run_program.TIMEOUT_CODE
+        assert 'Time limit' in error
@@ -0,0 +1,65 @@
+"""Test the runner module.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from kattis_cli import runner
+from kattis_cli.utils import config
+
+ECHO_PY = 'import sys\nfor line in sys.stdin:\n    print(int(line) * 2)\n'
+
+
+@pytest.fixture
+def problem(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Create a problem with one case and cache its builds in tmp."""
+    if not Path.home().joinpath('.kattis-cli.toml').exists():
+        shutil.copyfile(
+            './src/kattis_cli/.kattis-cli.toml',
+            Path.home().joinpath('.kattis-cli.toml'))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('double')
+    root.joinpath('data').mkdir(parents=True)
+    root.joinpath('double.yaml').write_text('title: Double\n')
+    root.joinpath('data', '1.in').write_text('21\n')
+    root.joinpath('double.py').write_text(ECHO_PY)
+    return root
+
+
+def test_run_case(problem: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    """A test case name runs the program on the case's input."""
+    console = Console(stderr=True, width=200)
+    lang_config = config.parse_config('python3')
+    code = runner.SolutionRunner(console).run(
+        'double.py', str(problem), [str(problem.joinpath('double.py'))],
+        lang_config, '1')
+    assert code == 0
+    out, err = capfd.readouterr()
+    assert out == '42\n'
+    assert 'exit code 0' in err and 'MiB peak memory' in err
+
+
+def test_run_input_file(problem: Path, tmp_path: Path,
+                        capfd: pytest.CaptureFixture[str]) -> None:
+    """Any input file can be given, and a failing exit code is kept."""
+    custom = tmp_path.joinpath('custom.txt')
+    custom.write_text('1\nx\n')
+    lang_config = config.parse_config('python3')
+    code = runner.SolutionRunner(Console(stderr=True)).run(
+        'double.py', str(problem), [str(problem.joinpath('double.py'))],
+        lang_config, str(custom))
+    assert code == 1
+    out, err = capfd.readouterr()
+    assert out == '2\n'
+    assert 'ValueError' in err
+
+
+def test_format_usage() -> None:
+    """Usage without wait4 shows the wall-clock time only."""
+    assert runner.format_usage(0, 1.5, None, None) == \
+        'exit code 0, 1.500 s wall'
+    assert runner.format_usage(1, 0.25, 0.2, 2048) == \
+        'exit code 1, 0.250 s wall, 0.200 s cpu, 2.0 MiB peak memory'
@@ -0,0 +1,99 @@
+"""Test the shrink module.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from kattis_cli import shrink
+
+# crashes whenever the input contains the token 13
+SOLUTION = """\
+import sys
+data = sys.stdin.read().split()
+if '13' in data:
+    raise ValueError('unlucky')
+print(len(data))
+"""
+
+REFERENCE = """\
+import sys
+print(len(sys.stdin.read().split()))
+"""
+
+
+def test_split_tokens_round_trip() -> None:
+    """Tokens keep their whitespace so joining restores the text."""
+    text = '  3\n1 2  3\n'
+    tokens = shrink.split_tokens(text)
+    assert tokens == ['  ', '3\n', '1 ', '2  ', '3\n']
+    assert ''.join(tokens) == text
+
+
+def test_ddmin_finds_minimal_units() -> None:
+    """Delta debugging keeps only the units needed to fail."""
+    units = [f'{i}\n' for i in range(40)]
+
+    def evaluate(texts: List[str]) -> List[bool]:
+        return ['7\n' in t.split('\n') or '7' in t.split() for t in texts]
+
+    assert shrink.ddmin(units, evaluate) == ['7\n']
+
+
+@pytest.fixture
+def problem(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Create a problem folder with a large failing input."""
+    if not Path.home().joinpath('.kattis-cli.toml').exists():
+        shutil.copyfile(
+            './src/kattis_cli/.kattis-cli.toml',
+            Path.home().joinpath('.kattis-cli.toml'))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('unlucky')
+    root.joinpath('data').mkdir(parents=True)
+    lines = [' '.join(str(i * 10 + j) for j in range(10)) for i in range(5)]
+    root.joinpath('data', 'big.in').write_text('\n'.join(lines) + '\n')
+    root.joinpath('unlucky.py').write_text(SOLUTION)
+    root.joinpath('brute.py').write_text(REFERENCE)
+    return root
+
+
+def test_shrink_crash(problem: Path) -> None:
+    """Without a reference, crashing inputs are shrunk."""
+    lang_config = {'compile': '', 'execute': f'{sys.executable} {{mainfile}}'}
+    text = shrink.shrink('unlucky.py', str(problem),
+                         [str(problem.joinpath('unlucky.py'))],
+                         lang_config, 'big', jobs=4)
+    assert text.split() == ['13']
+    shrunk = problem.joinpath('data', 'big-shrunk.in')
+    assert shrunk.read_text() == text
+    assert not shrunk.with_suffix('.ans').exists()
+
+
+def test_shrink_with_reference(problem: Path) -> None:
+    """With a reference, the answer of the shrunk input is saved too."""
+    lang_config = {'compile': '', 'execute': f'{sys.executable} {{mainfile}}'}
+    output = problem.joinpath('small.in')
+    text = shrink.shrink('unlucky.py', str(problem),
+                         [str(problem.joinpath('unlucky.py'))],
+                         lang_config, 'big', str(problem / 'brute.py'),
+                         str(output), jobs=4)
+    assert text.split() == ['13']
+    assert output.with_suffix('.ans').read_text() == '1\n'
+
+
+def test_shrink_duplicate_lines(problem: Path) -> None:
+    """Equal candidates of repeated lines are shrunk in parallel."""
+    problem.joinpath('data', 'dup.in').write_text('x\n' + '1\n' * 8 + 'y\n')
+    problem.joinpath('xy.py').write_text(
+        'import sys\n'
+        'data = sys.stdin.read().split()\n'
+        "if 'x' in data and 'y' in data:\n"
+        '    raise ValueError(data)\n')
+    lang_config = {'compile': '', 'execute': f'{sys.executable} {{mainfile}}'}
+    text = shrink.shrink('xy.py', str(problem),
+                         [str(problem.joinpath('xy.py'))],
+                         lang_config, 'dup', jobs=8)
+    assert text.split() == ['x', 'y']
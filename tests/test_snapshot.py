@@ -0,0 +1,68 @@
+"""Test the snapshot module.
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from kattis_cli import snapshot
+from kattis_cli.utils import config
+
+SQUARES = 'n = int(input())\nprint("\\n".join(str(i * i) for i in range(n)))\n'
+
+
+@pytest.fixture
+def problem(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Create a problem with generated inputs that have no answers."""
+    if not Path.home().joinpath('.kattis-cli.toml').exists():
+        shutil.copyfile(
+            './src/kattis_cli/.kattis-cli.toml',
+            Path.home().joinpath('.kattis-cli.toml'))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('squares')
+    data = root.joinpath('data')
+    data.mkdir(parents=True)
+    root.joinpath('squares.yaml').write_text('title: Squares\n')
+    data.joinpath('1.in').write_text('3\n')
+    data.joinpath('big.in').write_text('200000\n')
+    data.joinpath('2.in').write_text('0\n')
+    root.joinpath('squares.py').write_text(SQUARES)
+    return root
+
+
+def run(problem: Path, action: str) -> object:
+    """Record or check the solution of the problem."""
+    files = [str(problem.joinpath('squares.py'))]
+    return getattr(snapshot, action)(str(problem), files, 'squares.py',
+                                     config.parse_config('python3'))
+
+
+def test_record_and_check(problem: Path) -> None:
+    """An unchanged solution passes; changed outputs are reported."""
+    recorded = run(problem, 'record')
+    assert isinstance(recorded, dict)
+    assert list(recorded) == ['1.in', '2.in', 'big.in']
+    saved = json.loads(problem.joinpath('snapshot.json').read_text())
+    assert saved['cases'] == recorded
+    assert saved['cases']['big.in']['bytes'] > 1 << 20
+    assert run(problem, 'check') == {}
+
+    # an optimization that breaks the last lines of large outputs
+    problem.joinpath('squares.py').write_text(
+        'n = int(input())\n'
+        'print("\\n".join(str(i * i) for i in range(min(n, 100000))))\n')
+    assert run(problem, 'check') == {'big.in': 'output changed'}
+
+
+def test_changes() -> None:
+    """Inputs, exit codes and cases that come and go are reported."""
+    case = {'input': 'a', 'code': 0, 'output': 'o', 'seconds': 1.0}
+    recorded = {'1.in': case, '2.in': case, '3.in': case}
+    current = {'1.in': dict(case, input='b'), '2.in': dict(case, code=1),
+               '4.in': case}
+    assert snapshot.changes(recorded, current) == {
+        '1.in': 'input changed', '2.in': 'exit code 0 → 1',
+        '3.in': 'missing case', '4.in': 'new case'}
+    assert snapshot.delta(2.0, 1.5) == '-0.500 s (-25%)'
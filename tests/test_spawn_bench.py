@@ -0,0 +1,12 @@
+"""Test the spawn_bench module.
+"""
+
+from kattis_cli import spawn_bench
+
+
+def test_spawn_bench_times_both_runners() -> None:
+    """Both runners are timed on every run."""
+    timings = spawn_bench.spawn_bench(['true'], runs=5)
+    assert list(timings) == [spawn_bench.BEFORE, spawn_bench.AFTER]
+    assert all(len(seconds) == 5 for seconds in timings.values())
+    assert all(s > 0 for seconds in timings.values() for s in seconds)
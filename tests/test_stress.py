@@ -0,0 +1,70 @@
+"""Test the stress module.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from kattis_cli import stress
+
+GENERATOR = """\
+import random, sys
+random.seed(int(sys.argv[1]))
+print(random.randint(0, 5))
+"""
+
+REFERENCE = """\
+print(int(input()) * 2)
+"""
+
+SOLUTION = """\
+n = int(input())
+print(n * 2 if n != 3 else 0)
+"""
+
+
+@pytest.fixture
+def problem(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Create a problem folder with a generator and a reference."""
+    if not Path.home().joinpath('.kattis-cli.toml').exists():
+        shutil.copyfile(
+            './src/kattis_cli/.kattis-cli.toml',
+            Path.home().joinpath('.kattis-cli.toml'))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('double')
+    root.mkdir()
+    root.joinpath('gen.py').write_text(GENERATOR)
+    root.joinpath('brute.py').write_text(REFERENCE)
+    root.joinpath('double.py').write_text(SOLUTION)
+    return root
+
+
+def test_stress_finds_mismatch(problem: Path) -> None:
+    """The first mismatching seed is saved as a new test case."""
+    lang_config = {'compile': '', 'execute': f'{sys.executable} {{mainfile}}'}
+    result = stress.stress('double.py', str(problem),
+                           [str(problem.joinpath('double.py'))],
+                           lang_config, str(problem.joinpath('gen.py')),
+                           str(problem.joinpath('brute.py')),
+                           seconds=0, iterations=50, jobs=4)
+    assert result is not None
+    seed, verdict, _, output, expected = result
+    assert verdict == 'WA'
+    assert output.strip() == '0' and expected.strip() == '6'
+    saved = problem.joinpath('data', f'stress-{seed}.in')
+    assert saved.read_text().strip() == '3'
+    assert saved.with_suffix('.ans').read_text().strip() == '6'
+
+
+def test_stress_no_mismatch(problem: Path) -> None:
+    """A correct solution passes the whole iteration budget."""
+    lang_config = {'compile': '', 'execute': f'{sys.executable} {{mainfile}}'}
+    result = stress.stress('brute.py', str(problem),
+                           [str(problem.joinpath('brute.py'))],
+                           lang_config, str(problem.joinpath('gen.py')),
+                           str(problem.joinpath('brute.py')),
+                           seconds=0, iterations=10, jobs=2)
+    assert result is None
+    assert not problem.joinpath('data').exists()
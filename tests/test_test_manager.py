@@ -16,6 +16,12 @@ from kattis_cli.utils import run_program, utility
 from rich.prompt import Confirm
 
 
+@pytest.fixture(autouse=True)
+def _state_home(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Keep the run history of the tests out of the user's state."""
+    monkeypatch.setenv('XDG_STATE_HOME', str(tmp_path.joinpath('state')))
+
+
 def _write_sample(
     tmp_path: Path,
     problem_root: str,
@@ -51,10 +57,11 @@ def test_testmanager_all_pass_triggers_submit(
     files = ["main.py"]
     lang_config = {"compile": "", "execute": "python3 {mainfile}"}
 
-    def fake_run(lc: Any, mc: Any, infile: str) -> tuple:
-        return (0, "output\n", "")
+    def fake_run(lc: Any, mc: Any, infile: str, cwd: Any = None,
+                 env: Any = None) -> tuple:
+        return (0, "output\n", "", 0.01, 1024)
 
-    monkeypatch.setattr(run_program, "run", fake_run)
+    monkeypatch.setattr(run_program, "run_usage", fake_run)
 
     def fake_check(expected: str, ans: str, accuracy: Any) -> bool:
         return expected.strip() == ans.strip()
@@ -107,10 +114,11 @@ def test_testmanager_failure_no_submit(
     files = ["main.py"]
     lang_config = {"compile": "", "execute": "python3 {mainfile}"}
 
-    def fake_run(lc: Any, mc: Any, infile: str) -> tuple:
-        return (0, "output\n", "")
+    def fake_run(lc: Any, mc: Any, infile: str, cwd: Any = None,
+                 env: Any = None) -> tuple:
+        return (0, "output\n", "", 0.01, 1024)
 
-    monkeypatch.setattr(run_program, "run", fake_run)
+    monkeypatch.setattr(run_program, "run_usage", fake_run)
 
     monkeypatch.setattr(utility, "check_answer",
                         lambda expected, ans, accuracy: False)
@@ -144,8 +152,9 @@ def test_testmanager_prints_run_command(
     problem_root = _write_sample(tmp_path, "prob", "input\n", "different\n")
     lang_config = {"compile": "", "execute": "python3 {mainfile}"}
 
-    def fake_run(lc: Any, mc: Any, infile: str) -> tuple:
-        return (0, "output\n", "")
+    def fake_run(lc: Any, mc: Any, infile: str, cwd: Any = None,
+                 env: Any = None) -> tuple:
+        return (0, "output\n", "", 0.01, 1024)
 
     class DummyLive:
         def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -157,7 +166,7 @@ def test_testmanager_prints_run_command(
         def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
             return False
 
-    monkeypatch.setattr(run_program, "run", fake_run)
+    monkeypatch.setattr(run_program, "run_usage", fake_run)
     monkeypatch.setattr(utility, "check_answer",
                         lambda expected, ans, accuracy: False)
     monkeypatch.setattr(solution_tester_module, "Live", DummyLive)
@@ -169,3 +178,77 @@ def test_testmanager_prints_run_command(
 
     captured = capsys.readouterr()
     assert "Run command: python3 main.py" in captured.out
+
+
+def test_history_records_memory(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Every case is recorded with its time and peak memory."""
+    problem_root = _write_sample(tmp_path, "prob", "input\n", "different\n")
+
+    def fake_run(lc: Any, mc: Any, infile: str, cwd: Any = None,
+                 env: Any = None) -> tuple:
+        return (0, "output\n", "", 0.25, 2048)
+
+    monkeypatch.setattr(run_program, "run_usage", fake_run)
+    recorded: dict = {}
+
+    def fake_record(*args: Any) -> int:
+        recorded["results"] = args[-1]
+        return 1
+
+    monkeypatch.setattr(solution_tester_module.history, "record",
+                        fake_record)
+    tm = SolutionTester(client=kattis_module)
+    tm.test_samples("prob", "python3", "main.py", problem_root, ["main.py"],
+                    {"compile": "", "execute": "python3 {mainfile}"})
+
+    assert recorded["results"] == [("sample1", "WA", 0.25, 2048)]
+
+
+def test_budget_rejects_variants(tmp_path: Path) -> None:
+    """Debug and sanitizer builds are not checked against the budget."""
+    problem_root = _write_sample(tmp_path, "prob", "1\n", "1\n")
+    tm = SolutionTester(client=kattis_module)
+    with pytest.raises(SystemExit):
+        tm.test_samples("prob", "cpp", "prob.cpp", problem_root,
+                        ["prob.cpp"], {"compile": "g++", "execute": "./a.out"},
+                        variant="debug", budget=True)
+
+
+def test_sanitize_variant_reports_errors(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """The sanitize build fails the case with an out-of-bounds write."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    problem_root = _write_sample(tmp_path, "prob", "1\n", "0\n")
+    (Path(problem_root) / "data" / "big.in").write_text("5\n")
+    source = Path(problem_root) / "prob.cpp"
+    source.write_text(
+        "#include <vector>\n#include <cstdio>\n"
+        "int main() { int n; scanf(\"%d\", &n); std::vector<int> v(3);\n"
+        "v[n] = 1; printf(\"%d\\n\", v[0]); }\n")
+    lang_config = {"compile": "g++ -O2 -static", "execute": "./a.out"}
+
+    tm = SolutionTester(client=kattis_module)
+    passed = tm.test_variant("prob.cpp", problem_root, [str(source)],
+                             lang_config, "sanitize")
+
+    assert passed == 1
+
+
+def test_runtime_report() -> None:
+    """Sanitizer reports keep the error line and the program's frames."""
+    error = (
+        "=================================================================\n"
+        "==1==ERROR: AddressSanitizer: heap-buffer-overflow on address 0x6\n"
+        "WRITE of size 4 at 0x6 thread T0\n"
+        "    #0 0x5 in main /tmp/a.cpp:2\n"
+        "    #1 0x7 in operator new ../libsanitizer/asan/asan_new.cpp:95\n")
+    report = solution_tester_module.runtime_report(error)
+    assert report.splitlines() == [
+        "ERROR: AddressSanitizer: heap-buffer-overflow on address 0x6",
+        "#0 0x5 in main /tmp/a.cpp:2"]
+    assert solution_tester_module.runtime_report("plain error") == ""
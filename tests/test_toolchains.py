@@ -0,0 +1,83 @@
+"""Test the toolchains module.
+"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from kattis_cli.utils import build_cache, toolchains
+
+HELLO_RS = 'fn main() { println!("hello"); }\n'
+
+
+@pytest.fixture(autouse=True)
+def state_home(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Keep the state and the build cache inside the temporary folder."""
+    monkeypatch.setenv('XDG_STATE_HOME', str(tmp_path.joinpath('state')))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    return tmp_path
+
+
+def test_apply_profile_expands_state() -> None:
+    """{state} expands to the compiler's own state folder."""
+    lang_config = {'compile': 'go build -o a.out',
+                   'profile': {'env': {'GOCACHE': '{state}/cache'},
+                               'flags': '-trimpath'}}
+    folder = toolchains.toolchain_folder(lang_config)
+    assert folder == toolchains.state_folder().joinpath('toolchains', 'go')
+    config_profile, env = toolchains.apply_profile(lang_config, folder)
+    assert config_profile['compile'] == 'go build -o a.out -trimpath'
+    assert env == {'GOCACHE': f'{folder}/cache'}
+    assert lang_config['compile'] == 'go build -o a.out'
+
+
+def test_prepare_without_profile() -> None:
+    """Languages without a profile compile as configured."""
+    lang_config = {'compile': 'g++ -O2', 'execute': './a.out'}
+    assert toolchains.prepare(lang_config) == (lang_config, None)
+
+
+def test_daemon_started_once_and_reaped_when_idle() -> None:
+    """A daemon starts on first use and is stopped after its idle time."""
+    lang_config = {'compile': 'fakec',
+                   'profile': {'start': 'sleep 60', 'idle': 10}}
+    toolchains.prepare(lang_config)
+    folder = toolchains.toolchain_folder(lang_config)
+    assert toolchains.is_running(folder)
+    record = folder.joinpath(toolchains.DAEMON_FILE).read_text()
+    toolchains.prepare(lang_config)
+    # reused, not started again
+    assert folder.joinpath(toolchains.DAEMON_FILE).read_text() == record
+    toolchains.reap_idle(time.time() + 5)
+    assert toolchains.is_running(folder)
+    toolchains.reap_idle(time.time() + 60)
+    assert not toolchains.is_running(folder)
+
+
+def test_stop_command_runs_when_idle() -> None:
+    """Compilers spawning their own daemon are shut down by stop."""
+    lang_config = {'compile': 'fakec',
+                   'profile': {'stop': 'touch {state}/stopped', 'idle': 0}}
+    toolchains.prepare(lang_config)
+    folder = toolchains.toolchain_folder(lang_config)
+    assert toolchains.is_running(folder)
+    toolchains.reap_idle(time.time() + 1)
+    assert folder.joinpath('stopped').is_file()
+    assert not toolchains.is_running(folder)
+
+
+@pytest.mark.skipif(shutil.which('rustc') is None, reason='needs rustc')
+def test_rust_incremental_cache(tmp_path: Path) -> None:
+    """The profile's flags keep rustc's incremental cache in the state."""
+    source = tmp_path.joinpath('hello.rs')
+    source.write_text(HELLO_RS)
+    lang_config = {'compile': 'rustc -o a.out', 'execute': './a.out',
+                   'profile': {'flags': '-C incremental={state}'}}
+    code, _, error, folder = build_cache.compile_cached(
+        lang_config, [str(source)])
+    assert code == 0, error
+    assert folder and os.path.isfile(os.path.join(folder, 'a.out'))
+    assert any(toolchains.toolchain_folder(lang_config).iterdir())
@@ -0,0 +1,50 @@
+"""Test the tune module.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from kattis_cli import tune
+
+SOLUTION = """\
+#include <cstdio>
+int main() {
+    long n, s = 0;
+    scanf("%ld", &n);
+    for (long i = 0; i < n; i++) s += i % 7;
+    printf("%ld\\n", s);
+}
+"""
+
+
+def test_kattis_note() -> None:
+    """Flags Kattis won't use are pointed out."""
+    assert tune.kattis_note(tune.BASELINE) == 'judge flags'
+    assert tune.kattis_note(tune.PGO) == 'not available'
+    assert tune.kattis_note('-O3') == '#pragma GCC optimize'
+    assert 'judge CPU' in tune.kattis_note('-O2 -march=native')
+
+
+def test_tune(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Variants, including PGO, are built, checked and timed."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('sum')
+    data = root.joinpath('data')
+    data.mkdir(parents=True)
+    data.joinpath('1.in').write_text('10\n')
+    data.joinpath('1.ans').write_text('24\n')
+    data.joinpath('2.in').write_text('1000000\n')
+    total = sum(i % 7 for i in range(10 ** 6))
+    data.joinpath('2.ans').write_text(f'{total}\n')
+    solution = root.joinpath('sum.cpp')
+    solution.write_text(SOLUTION)
+    lang_config = {'compile': 'g++ -O2', 'execute': './a.out'}
+    results = tune.tune('sum.cpp', str(root), [str(solution)], lang_config,
+                        ['-O3'], count=2, repeat=1)
+    assert sorted(flags for flags, _, _ in results) == \
+        sorted([tune.BASELINE, '-O3', tune.PGO])
+    assert all(verdict == 'AC' for _, _, verdict in results)
+    profiles = list(tmp_path.joinpath('cache', 'kattis-cli', 'pgo').iterdir())
+    assert len(profiles) == 1
+    assert list(profiles[0].rglob('*.gcda'))
@@ -1,7 +1,11 @@
 """Test the Unitlity module.
 """
 
-from kattis_cli.utils.utility import check_answer
+from pathlib import Path
+import gzip
+
+from kattis_cli.utils import utility
+from kattis_cli.utils.utility import check_answer, parse_cpu_limit
 
 
 def test_compare_floats_single_float() -> None:
@@ -62,3 +66,21 @@ def test_compare_strings_fail_2() -> None:
     expected = 'Hello, World!\nGoodbye, World!\n'
     ans = 'Hello, World!\nGood bye!\n'
     assert check_answer(expected, ans) is False
+
+
+def test_parse_cpu_limit() -> None:
+    """Test parse_cpu_limit function.
+    """
+    assert parse_cpu_limit('1 second') == 1.0
+    assert parse_cpu_limit('2.5 seconds') == 2.5
+    assert parse_cpu_limit('None') is None
+
+
+def test_check_answer_file(tmp_path: Path) -> None:
+    """Answers are compared while streaming a compressed answer file."""
+    ans_file = tmp_path.joinpath('1.ans.gz')
+    ans_file.write_bytes(gzip.compress(b'\n1.0\n2.5  \n\n'))
+    assert utility.check_answer_file(ans_file, '1.0\n2.5\n')
+    assert not utility.check_answer_file(ans_file, '1.0\n2.5\n3\n')
+    assert utility.check_answer_file(ans_file, '1.0000001\n2.5', 6)
+    assert not utility.check_answer_file(ans_file, '1.1\n2.5', 6)
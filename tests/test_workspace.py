@@ -0,0 +1,122 @@
+"""Test the workspace module.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from kattis_cli.utils import build_cache, cases, workspace
+
+HELLO_C = '#include <stdio.h>\nint main() { puts("hello"); return 0; }\n'
+
+
+@pytest.fixture
+def problem(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Create a problem, a runtime folder and a disk cache."""
+    run = tmp_path.joinpath('run')
+    run.mkdir()
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(run))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path.joinpath('cache')))
+    root = tmp_path.joinpath('hello')
+    data = root.joinpath('data')
+    data.mkdir(parents=True)
+    root.joinpath('hello.yaml').write_text('title: Hello\n')
+    data.joinpath('1.in').write_text('1\n')
+    data.joinpath('1.ans').write_text('hello\n')
+    data.joinpath('2.in').write_text('2\n')
+    root.joinpath('hello.c').write_text(HELLO_C)
+    return root
+
+
+def test_workspace_stages_data_in_memory(problem: Path,
+                                         tmp_path: Path) -> None:
+    """Cases are read from the workspace, which is removed afterwards."""
+    run = tmp_path.joinpath('run')
+    with workspace.workspace(str(problem)) as (staged, _):
+        assert staged.startswith(str(run))
+        assert [f.name for f in cases.find_input_files(staged)] == \
+            ['1.in', '2.in']
+        assert Path(staged, 'hello.yaml').is_file()
+        assert cases.answer_file(Path(staged, 'data', '1.in')) is not None
+    assert not Path(staged).exists()
+    assert not any(run.glob('*/run-*'))
+    problem.joinpath('data', '2.in').unlink()
+    with workspace.workspace(str(problem)) as (staged, _):
+        assert [f.name for f in cases.find_input_files(staged)] == ['1.in']
+
+
+def test_builds_synced_back(problem: Path, tmp_path: Path) -> None:
+    """Builds happen in memory and finished ones are kept on disk."""
+    lang_config = {'compile': 'gcc', 'execute': './a.out'}
+    source = str(problem.joinpath('hello.c'))
+    with workspace.workspace(str(problem)) as (_, cache):
+        # the environment of other threads and programs is untouched
+        assert os.environ['XDG_CACHE_HOME'] == str(tmp_path.joinpath('cache'))
+        assert cache is not None
+        _, _, _, folder = build_cache.compile_cached(lang_config, [source],
+                                                     cache)
+        assert folder and folder.startswith(str(tmp_path.joinpath('run')))
+    key = build_cache.build_key(lang_config, [source])
+    disk_build = build_cache.cache_folder().joinpath('builds', key)
+    assert disk_build.joinpath('a.out').is_file()
+    # the synced build is a cache hit without the workspace
+    assert build_cache.compile_cached(lang_config, [source])[3] == \
+        str(disk_build)
+
+
+def test_disk_builds_seeded(problem: Path,
+                            monkeypatch: pytest.MonkeyPatch) -> None:
+    """Only the builds a run needs are taken from the disk cache."""
+    lang_config = {'compile': 'gcc', 'execute': './a.out'}
+    source = str(problem.joinpath('hello.c'))
+    other = problem.joinpath('other.c')
+    other.write_text(HELLO_C.replace('hello', 'other'))
+    assert build_cache.compile_cached(lang_config, [source])[0] == 0
+    assert build_cache.compile_cached(lang_config, [str(other)])[0] == 0
+
+    def _compile(*args: object, **kwargs: object) -> None:
+        raise AssertionError('compiled again')
+
+    monkeypatch.setattr(build_cache.run_program, 'compile_program',
+                        _compile)
+    with workspace.workspace(str(problem)) as (_, cache):
+        assert cache is not None
+        code, _, _, folder = build_cache.compile_cached(lang_config,
+                                                        [source], cache)
+        assert code == 0 and folder
+        assert Path(folder).is_relative_to(cache)
+        assert Path(folder, 'a.out').is_file()
+        assert [build.name for build in cache.joinpath('builds').iterdir()
+                if not build.name.startswith('.')] == [Path(folder).name]
+
+
+def test_disk_objects_seeded(problem: Path) -> None:
+    """Unchanged translation units reuse their objects from disk."""
+    lang_config = {'compile': 'gcc', 'execute': './a.out'}
+    main = problem.joinpath('main.c')
+    main.write_text('int f(void);\nint main(void) { return f(); }\n')
+    util = problem.joinpath('util.c')
+    util.write_text('int f(void) { return 0; }\n')
+    files = [str(main), str(util)]
+    assert build_cache.compile_cached(lang_config, files)[0] == 0
+    disk_objects = set(build_cache.cache_folder().joinpath('objects')
+                       .glob('*.o'))
+    main.write_text('int f(void);\nint main(void) { return 1 + f(); }\n')
+    with workspace.workspace(str(problem)) as (_, cache):
+        assert cache is not None
+        assert build_cache.compile_cached(lang_config, files, cache)[0] == 0
+        objects = list(cache.joinpath('objects').glob('*.o'))
+        assert len(objects) == 2
+        # util.o is linked in from disk, main.o is compiled
+        assert sum(any(os.path.samefile(obj, disk) for disk in disk_objects)
+                   for obj in objects) == 1
+
+
+def test_without_tmpfs(problem: Path, monkeypatch: pytest.MonkeyPatch
+                       ) -> None:
+    """The problem folder is used when there is no tmpfs."""
+    monkeypatch.setattr(workspace, 'tmpfs_root', lambda: None)
+    with workspace.workspace(str(problem)) as (staged, cache):
+        assert staged == str(problem)
+        assert cache is None